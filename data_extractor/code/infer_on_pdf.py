@@ -8,6 +8,8 @@ import csv
 import time
 import traceback
 import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from s3_communication import S3Communication
 import pandas as pd
 
@@ -243,6 +245,35 @@ def set_xy_ml(project_name, raw_pdf_folder, working_folder, pdf_name, csv_name,
     return True 
 
 
+def run_branches_concurrently(branches):
+    """
+    Runs the given inference branches (e.g. RB and ML) concurrently in threads.
+    The branches share no state until join_output, hence the wall time is max(RB, ML) instead of RB + ML.
+    All branches are awaited, even if one of them fails. Afterwards the first exception (if any) is re-raised.
+    Hence, all branches run even if another one fails (e.g. ML still runs if RB fails).
+    :param branches: dict: Maps a branch name to a callable without arguments returning a boolean
+    :return: A boolean, indicating success of all branches
+    """
+    if len(branches) == 0:
+        return True
+    with ThreadPoolExecutor(max_workers=len(branches)) as executor:
+        futures = {name: executor.submit(branch) for name, branch in branches.items()}
+    end_to_end_response = True
+    first_exception = None
+    for name, future in futures.items():
+        exception = future.exception()
+        if exception is not None:
+            print(f'{name} solution failed. Reason: {repr(exception)}')
+            if first_exception is None:
+                first_exception = exception
+        elif not future.result():
+            print(f'{name} solution did not finish successfully.')
+            end_to_end_response = False
+    if first_exception is not None:
+        raise first_exception
+    return end_to_end_response
+
+
 def get_current_run_id():
     return int(time.time())
     
@@ -255,73 +286,117 @@ def try_int(val, default):
     return default
 
 
-def join_output(project_name, pdf_folder, rb_output_folder, ml_output_folder, output_folder, use_docker, work_dir_rb,
-                verbosity, port, ip, run_id, s3_usage, s3_settings):
-    print("Joining output . . . ")
+def join_output_single(project_name, pdf_folder, filename, rb_output_folder, ml_output_folder, output_folder,
+                       use_docker, work_dir_rb, verbosity, port, ip, run_id, s3_usage, s3_settings,
+                       s3_semaphore, xy_semaphore):
+    """
+    Joins the RB and ML output of a single pdf, uploads the joined csv to S3 (if required) and triggers the
+    detection of the x, y coordinates for the ML answers.
+    :param s3_semaphore: threading.Semaphore: Bounds the number of concurrent S3 uploads
+    :param xy_semaphore: threading.Semaphore: Bounds the number of concurrent set_xy_ml requests
+    :return: A boolean, indicating success
+    """
     # ML header:  ,pdf_name,kpi,kpi_id,answer,page,paragraph,source,score,no_ans_score,no_answer_score_plus_boost
     # RB header:  "KPI_ID","KPI_NAME","SRC_FILE","PAGE_NUM","ITEM_IDS","POS_X","POS_Y","RAW_TXT",
     # "YEAR","VALUE","SCORE","UNIT","MATCH_TYPE"
     output_header = ["METHOD", "PDF_NAME", "KPI_ID", "KPI_NAME", "KPI_DESC",
                      "ANSWER_RAW", "ANSWER", "PAGE", "PARAGRAPH", "PARAGRAPH_RELEVANCE_SCORE", "POS_X", "POS_Y",
                      "KPI_SOURCE", "SCORE", "NO_ANS_SCORE", "SCORE_PLUS_BOOST", "KPI_YEAR", "UNIT_RAW", "UNIT"]
-    for filename in os.listdir(pdf_folder):
-        print(filename)
-        with open(output_folder + r'/' + str(run_id) + r'_' + filename + r'.csv', 'w',
-                  encoding='UTF8', newline='') as f_out:
-            writer = csv.writer(f_out)
-            writer.writerow(output_header)
-            
-            rb_filename = rb_output_folder + r'/' + filename + '.csv'
-            ml_filename = ml_output_folder + r'/' + filename[:len(filename)-4] + '_predictions_kpi.csv'
-            # Read RB:
-            try:
-                with open(rb_filename, 'r') as f:
-                    csv_file = csv.DictReader(f)
-                    for row in csv_file:
-                        d = dict(row)
-                        # TODO: Use UNIT_RAW/UNIT, once implemented in RB solution
-                        data = ["RB", d["SRC_FILE"], d["KPI_ID"], d["KPI_NAME"], "", d["RAW_TXT"],
-                                d["VALUE"], d["PAGE_NUM"], "", "", d["POS_X"], d["POS_Y"],
-                                d["MATCH_TYPE"], d["SCORE"], "", "", d["YEAR"], d["UNIT"], d["UNIT"]]
-                        writer.writerow(data)
-            except IOError:
-                pass # RB not executed
-            # Read ML:
+    print(filename)
+    with open(output_folder + r'/' + str(run_id) + r'_' + filename + r'.csv', 'w',
+              encoding='UTF8', newline='') as f_out:
+        writer = csv.writer(f_out)
+        writer.writerow(output_header)
+        
+        rb_filename = rb_output_folder + r'/' + filename + '.csv'
+        ml_filename = ml_output_folder + r'/' + filename[:len(filename)-4] + '_predictions_kpi.csv'
+        # Read RB:
+        try:
+            with open(rb_filename, 'r') as f:
+                csv_file = csv.DictReader(f)
+                for row in csv_file:
+                    d = dict(row)
+                    # TODO: Use UNIT_RAW/UNIT, once implemented in RB solution
+                    data = ["RB", d["SRC_FILE"], d["KPI_ID"], d["KPI_NAME"], "", d["RAW_TXT"],
+                            d["VALUE"], d["PAGE_NUM"], "", "", d["POS_X"], d["POS_Y"],
+                            d["MATCH_TYPE"], d["SCORE"], "", "", d["YEAR"], d["UNIT"], d["UNIT"]]
+                    writer.writerow(data)
+        except IOError:
+            pass # RB not executed
+        # Read ML:
+        try:
+            with open(ml_filename, 'r') as f:
+                csv_file = csv.DictReader(f)
+                for row in csv_file:
+                    d = dict(row)
+                    data = ["ML", d["pdf_name"] + r".pdf", "", "", d["kpi"], d["answer"], d["answer"],
+                            str(try_int(d["page"], -2)+1), d["paragraph"], d["paragraph_relevance_score"], "", "",
+                            d["source"], d["score"], d["no_ans_score"], d["no_answer_score_plus_boost"], "", "", ""]
+                    writer.writerow(data)
+        except IOError:
+            pass # ML not executed
+    csv_name = str(run_id) + r'_' + filename + r'.csv'
+    if not os.path.exists(output_folder + r'/' + csv_name):
+        print(f'File {csv_name} not in the output and hence we are not able to detect x, '
+              f'y coordinates for the ML solution output.')
+        return False
+    if s3_usage:
+        project_prefix = s3_settings['prefix'] + "/" + project_name + '/data'
+        with s3_semaphore:
+            s3c_main = S3Communication(
+                    s3_endpoint_url=os.getenv(s3_settings['main_bucket']['s3_endpoint']),
+                    aws_access_key_id=os.getenv(s3_settings['main_bucket']['s3_access_key']),
+                    aws_secret_access_key=os.getenv(s3_settings['main_bucket']['s3_secret_key']),
+                    s3_bucket=os.getenv(s3_settings['main_bucket']['s3_bucket_name']),
+            )
+            s3c_main.upload_file_to_s3(filepath=output_folder + r'/' + csv_name,
+                                       s3_prefix=project_prefix + '/output/KPI_EXTRACTION/joined_ml_rb',
+                                       s3_key=csv_name)
+    with xy_semaphore:
+        return set_xy_ml(project_name=project_name, raw_pdf_folder=pdf_folder, working_folder=work_dir_rb,
+                         pdf_name=filename, csv_name=csv_name, output_folder=output_folder, verbosity=verbosity,
+                         use_docker=use_docker, port=port, ip=ip, s3_usage=s3_usage, s3_settings=s3_settings)
+
+
+def join_output(project_name, pdf_folder, rb_output_folder, ml_output_folder, output_folder, use_docker, work_dir_rb,
+                verbosity, port, ip, run_id, s3_usage, s3_settings, max_workers=4, max_xy_requests=4,
+                max_s3_uploads=4):
+    """
+    Joins the RB and ML output for all pdfs. Every pdf is handled by its own task in a thread pool, so the joined
+    csv of a pdf is written (and uploaded) as soon as it is ready, independent of the other pdfs.
+    :param max_workers: int: Number of pdfs processed concurrently
+    :param max_xy_requests: int: Maximum number of in-flight set_xy_ml requests (each of them re-parses a pdf).
+                                 Use 1 in S3 mode: rb_server.run_xy_ml clears its shared folders per request
+    :param max_s3_uploads: int: Maximum number of concurrent S3 uploads
+    :return: A boolean, indicating success for all pdfs
+    """
+    print("Joining output . . . ")
+    s3_semaphore = threading.Semaphore(max_s3_uploads)
+    xy_semaphore = threading.Semaphore(max_xy_requests)
+    failed_pdfs = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(join_output_single, project_name, pdf_folder, filename, rb_output_folder,
+                                   ml_output_folder, output_folder, use_docker, work_dir_rb, verbosity, port, ip,
+                                   run_id, s3_usage, s3_settings, s3_semaphore, xy_semaphore): filename
+                   for filename in os.listdir(pdf_folder)}
+        for future in as_completed(futures):
+            filename = futures[future]
             try:
-                with open(ml_filename, 'r') as f:
-                    csv_file = csv.DictReader(f)
-                    for row in csv_file:
-                        d = dict(row)
-                        data = ["ML", d["pdf_name"] + r".pdf", "", "", d["kpi"], d["answer"], d["answer"],
-                                str(try_int(d["page"], -2)+1), d["paragraph"], d["paragraph_relevance_score"], "", "",
-                                d["source"], d["score"], d["no_ans_score"], d["no_answer_score_plus_boost"], "", "", ""]
-                        writer.writerow(data)
-            except IOError:
-                pass # ML not executed
-        csv_name = str(run_id) + r'_' + filename + r'.csv'
-        if csv_name in os.listdir(output_folder):
-            if s3_usage:
-                project_prefix = s3_settings['prefix'] + "/" + project_name + '/data'
-                s3c_main = S3Communication(
-                        s3_endpoint_url=os.getenv(s3_settings['main_bucket']['s3_endpoint']),
-                        aws_access_key_id=os.getenv(s3_settings['main_bucket']['s3_access_key']),
-                        aws_secret_access_key=os.getenv(s3_settings['main_bucket']['s3_secret_key']),
-                        s3_bucket=os.getenv(s3_settings['main_bucket']['s3_bucket_name']),
-                )
-                s3c_main.upload_file_to_s3(filepath=output_folder + r'/' + csv_name,
-                                           s3_prefix=project_prefix + '/output/KPI_EXTRACTION/joined_ml_rb',
-                                           s3_key=csv_name)
-            set_xy_ml(project_name=project_name, raw_pdf_folder=pdf_folder, working_folder=work_dir_rb,
-                      pdf_name=filename, csv_name=csv_name, output_folder=output_folder, verbosity=verbosity,
-                      use_docker=use_docker, port=port, ip=ip, s3_usage=s3_usage, s3_settings=s3_settings)
-        else:
-            print(f'File {csv_name} not in the output and hence we are not able to detect x, '
-                  f'y coordinates for the ML solution output.')
+                if future.result():
+                    print(f'Joined output for {filename} is ready.')
+                else:
+                    failed_pdfs.append(filename)
+            except Exception as e:
+                print(f'Joining output for {filename} failed. Reason: {repr(e)}')
+                failed_pdfs.append(filename)
+    if len(failed_pdfs) > 0:
+        print(f'Joining output failed for {len(failed_pdfs)} pdf(s): {", ".join(sorted(failed_pdfs))}')
     if s3_usage:
         create_directory(pdf_folder)
         create_directory(rb_output_folder)
         create_directory(ml_output_folder)
         create_directory(output_folder)
+    return len(failed_pdfs) == 0
 
 
 def run_db_export(project_name, settings, run_id):
@@ -360,6 +435,12 @@ def main():
                         default=None,
                         help='Do you want to use S3? Type either Y or N.')
     
+    parser.add_argument('--max_xy_requests',
+                        type=int,
+                        default=None,
+                        help='Maximum number of concurrent requests for detecting the x, y coordinates of the ML '
+                             'answers (default: 1 with S3, since the RB server shares its folders, otherwise 4)')
+    
     args = parser.parse_args()
     project_name = args.project_name
     mode = args.mode
@@ -383,6 +464,13 @@ def main():
     else:
         s3_usage = s3_usage == 'Y'
     
+    max_xy_requests = args.max_xy_requests
+    if max_xy_requests is None:
+        max_xy_requests = 1 if s3_usage else 4
+    if max_xy_requests < 1:
+        print("Maximum number of concurrent xy requests must be at least 1")
+        return
+    
     project_data_dir = config_path.DATA_DIR + r'/' + project_name
     create_directory(project_data_dir)
     s3c_main = None 
@@ -496,34 +584,46 @@ def main():
             if os.path.exists(source_extraction):
                 link_extracted_files(source_extraction, source_pdf, destination_ml_extraction)
             
-        end_to_end_response = True
-        
-        if mode in ('RB', 'both'):
+        def download_branch_output(s3_prefix, destination):
+            # boto3 resources are not thread-safe, hence each branch uses its own connector
+            s3c_branch = S3Communication(
+                s3_endpoint_url=os.getenv(s3_settings['main_bucket']['s3_endpoint']),
+                aws_access_key_id=os.getenv(s3_settings['main_bucket']['s3_access_key']),
+                aws_secret_access_key=os.getenv(s3_settings['main_bucket']['s3_secret_key']),
+                s3_bucket=os.getenv(s3_settings['main_bucket']['s3_bucket_name']),
+            )
+            s3c_branch.download_files_in_prefix_to_dir(s3_prefix, destination)
+
+        def run_rb():
             print("Executing RB solution . . . ")
-            end_to_end_response = end_to_end_response and  \
-                run_router_rb(raw_pdf_folder=destination_pdf,
-                              working_folder=destination_rb_workdir,
-                              output_folder=destination_rb_infer,
-                              project_name=project_name,
-                              verbosity=rb_verbosity,
-                              use_docker=rb_use_docker,
-                              ip=rb_ip,
-                              port=rb_port,
-                              s3_usage=s3_usage,
-                              s3_settings=s3_settings)
+            rb_response = run_router_rb(raw_pdf_folder=destination_pdf,
+                                        working_folder=destination_rb_workdir,
+                                        output_folder=destination_rb_infer,
+                                        project_name=project_name,
+                                        verbosity=rb_verbosity,
+                                        use_docker=rb_use_docker,
+                                        ip=rb_ip,
+                                        port=rb_port,
+                                        s3_usage=s3_usage,
+                                        s3_settings=s3_settings)
             if s3_usage:
-                # Download inference output
-                s3c_main.download_files_in_prefix_to_dir(project_prefix + '/output/KPI_EXTRACTION/rb', 
-                                                         destination_rb_infer)
-        
-        if mode in ('ML', 'both'):
+                download_branch_output(project_prefix + '/output/KPI_EXTRACTION/rb', destination_rb_infer)
+            return rb_response
+
+        def run_ml():
             print("Executing ML solution . . . ")
-            end_to_end_response = end_to_end_response and \
-                                  run_router_ml(ext_port, infer_port, project_name, ext_ip, infer_ip)
+            ml_response = run_router_ml(ext_port, infer_port, project_name, ext_ip, infer_ip)
             if s3_usage:
-                # Download inference output
-                s3c_main.download_files_in_prefix_to_dir(project_prefix + '/output/KPI_EXTRACTION/ml/Text', 
-                                                         destination_ml_infer)
+                download_branch_output(project_prefix + '/output/KPI_EXTRACTION/ml/Text', destination_ml_infer)
+            return ml_response
+
+        # RB and ML run in separate containers and share no state until join_output
+        branches = {}
+        if mode in ('RB', 'both'):
+            branches['RB'] = run_rb
+        if mode in ('ML', 'both'):
+            branches['ML'] = run_ml
+        end_to_end_response = run_branches_concurrently(branches)
 
         if end_to_end_response:
             run_id = get_current_run_id()
@@ -532,19 +632,23 @@ def main():
                 s3c_main.download_files_in_prefix_to_dir(project_prefix + '/input/pdfs/inference', 
                                                          destination_pdf)
             
-            join_output(project_name=project_name,
-                        pdf_folder=destination_pdf,
-                        rb_output_folder=destination_rb_infer,
-                        ml_output_folder=destination_ml_infer,
-                        output_folder=destination_output,
-                        use_docker=rb_use_docker,
-                        work_dir_rb=destination_rb_workdir,
-                        verbosity=rb_verbosity,
-                        port=rb_port,
-                        ip=rb_ip,
-                        run_id=run_id,
-                        s3_usage=s3_usage,
-                        s3_settings=s3_settings)
+            join_response = join_output(project_name=project_name,
+                                        pdf_folder=destination_pdf,
+                                        rb_output_folder=destination_rb_infer,
+                                        ml_output_folder=destination_ml_infer,
+                                        output_folder=destination_output,
+                                        use_docker=rb_use_docker,
+                                        work_dir_rb=destination_rb_workdir,
+                                        verbosity=rb_verbosity,
+                                        port=rb_port,
+                                        ip=rb_ip,
+                                        run_id=run_id,
+                                        s3_usage=s3_usage,
+                                        s3_settings=s3_settings,
+                                        max_xy_requests=max_xy_requests)
+            if not join_response:
+                print("Joining output did not finish successfully for all pdfs (see above).")
+                end_to_end_response = False
             if enable_db_export:
                 print("Exporting output to database . . . ")
                 run_db_export(project_name, project_settings['data_export'], run_id)
@@ -19,7 +19,8 @@ from Format_Analyzer import *
 class AnalyzerCluster:
 
 
-	htmlcluster		= None
+	htmlcluster		= None # only set on first use (see get_htmlcluster)
+	cluster_mode	= None
 	htmlpage		= None
 	items			= None
 	default_year	= None
@@ -73,7 +74,7 @@ class AnalyzerCluster:
 			for i in range(len(idx_list)):
 				it = self.items[idx_list[i]]
 				txt = it.txt if not exclude_years else Format_Analyzer.exclude_all_years(it.txt)
-				print_verbose(7, '-------->Looking for '+str(matching_fun)+' in: "'+txt+'"')
+				print_verbose(7, lambda: '-------->Looking for '+str(matching_fun)+' in: "'+txt+'"')
 				if(matching_fun(txt)):
 					#whole string
 					print_verbose(7, '----------> FOUND!')
@@ -88,7 +89,7 @@ class AnalyzerCluster:
 					#each word
 					for j in range(len(it.words)):
 						wtxt =it.words[j].txt if not exclude_years else Format_Analyzer.exclude_all_years(it.words[j].txt)
-						print_verbose(7, '-------->Looking for '+str(matching_fun)+' in: "'+wtxt+'"')
+						print_verbose(7, lambda: '-------->Looking for '+str(matching_fun)+' in: "'+wtxt+'"')
 						if(matching_fun(wtxt)):
 							print_verbose(7, '----------> FOUND!')
 							cur_x, cur_y = it.words[j].rect.get_center()
@@ -109,7 +110,7 @@ class AnalyzerCluster:
 			
 	
 	
-		print_verbose(5, 'ANALYZING CLUSTER NODE ===>>> ' + cluster.flat_text)
+		print_verbose(5, lambda: 'ANALYZING CLUSTER NODE ===>>> ' + cluster.flat_text)
 		
 		txt = cluster.flat_text
 		
@@ -119,7 +120,7 @@ class AnalyzerCluster:
 		# get text
 		
 		txt_match, score = kpispecs.match_nodes([txt])
-		print_verbose(5, '---> txt base_score='+str(score))
+		print_verbose(5, lambda: '---> txt base_score='+str(score))
 		if(not txt_match):
 			print_verbose(5, '---> No match')
 			return None
@@ -128,8 +129,8 @@ class AnalyzerCluster:
 		txt_refined = get_txt_by_idx_list(idx_list_refined_txt)
 		
 		txt_match, score = kpispecs.match_nodes([txt_refined])
-		print_verbose(5, '------> After refinement: ' + txt_refined)
-		print_verbose(5, '------> txt score='+str(score))
+		print_verbose(5, lambda: '------> After refinement: ' + txt_refined)
+		print_verbose(5, lambda: '------> txt score='+str(score))
 		
 		
 		base_point_x, base_point_y = get_rect_by_idx_list(idx_list_refined_txt).get_center()
@@ -141,7 +142,7 @@ class AnalyzerCluster:
 			print_verbose(5, '---> Value missmatch')
 			return None # value missmatch
 			
-		print_verbose(5, '------> raw_value: '+str(raw_value))
+		print_verbose(5, lambda: '------> raw_value: '+str(raw_value))
 			
 		# get unit
 		txt_unit_matched = kpispecs.match_unit(txt)
@@ -157,7 +158,7 @@ class AnalyzerCluster:
 				print_verbose(5, '---> Unit not matched in individual item')
 				return None
 		
-		print_verbose(5, '------> unit_str: '+str(unit_str))
+		print_verbose(5, lambda: '------> unit_str: '+str(unit_str))
 
 		
 		# get year
@@ -167,7 +168,7 @@ class AnalyzerCluster:
 			year = Format_Analyzer.to_year(year_str)
 			
 			
-		print_verbose(5, '------> year_str: '+str(year_str))
+		print_verbose(5, lambda: '------> year_str: '+str(year_str))
 
 		
 		# get new idx list
@@ -180,10 +181,10 @@ class AnalyzerCluster:
 			
 		base_rect = Rect(9999999, 9999999, -1, -1)
 		for idx in base_new_idx_list:
-			print_verbose(7,'................----> base_item='+str(self.items[idx]))
+			print_verbose(7,lambda: '................----> base_item='+str(self.items[idx]))
 			base_rect.grow(self.items[idx].get_rect())
 		
-		print_verbose(5, '----> base_rect='+str(base_rect))
+		print_verbose(5, lambda: '----> base_rect='+str(base_rect))
 		
 		
 		new_idx_list_in_rect = self.htmlpage.find_items_within_rect_all_categories(base_rect)
@@ -191,10 +192,10 @@ class AnalyzerCluster:
 		
 		
 		final_txt = get_txt_by_idx_list(new_idx_list)
-		print_verbose(5, '------> Final text: "'+str(final_txt)+'"')
+		print_verbose(5, lambda: '------> Final text: "'+str(final_txt)+'"')
 		
 		txt_match, final_txt_score = kpispecs.match_nodes([final_txt])
-		print_verbose(5, '---> txt final_score='+str(final_txt_score))
+		print_verbose(5, lambda: '---> txt final_score='+str(final_txt_score))
 		if(not txt_match):
 			print_verbose(5, '---> No match')
 			return None		
@@ -228,7 +229,7 @@ class AnalyzerCluster:
 		kpi_measure.score	  = final_txt_score + anywhere_match_score 
 		kpi_measure.unit	  = unit_str
 		kpi_measure.match_type= 'AC.default'
-		print_verbose(5, '---> Match: ' + str(kpi_measure) + ': final_txt_score='+str(final_txt_score)+',anywhere_match_score='+str(anywhere_match_score))		
+		print_verbose(5, lambda: '---> Match: ' + str(kpi_measure) + ': final_txt_score='+str(final_txt_score)+',anywhere_match_score='+str(anywhere_match_score))		
 		
 		return kpi_measure
 
@@ -256,9 +257,15 @@ class AnalyzerCluster:
 		
 	
 
+	def get_htmlcluster(self):
+		if(self.htmlcluster is None):
+			self.htmlcluster = self.htmlpage.get_clusters(self.cluster_mode)
+		return self.htmlcluster
+	
+
 	def find_kpis(self, kpispecs):
 	
-		if(self.htmlcluster is None):
+		if(self.get_htmlcluster() is None):
 			return []
 	
 		res = self.find_kpis_rec(kpispecs, self.htmlcluster)
@@ -266,8 +273,9 @@ class AnalyzerCluster:
 		return res
 	
 
-	def __init__(self, htmlcluster, htmlpage, default_year):
-		self.htmlcluster	= htmlcluster
+	def __init__(self, cluster_mode, htmlpage, default_year):
+		self.htmlcluster	= None
+		self.cluster_mode	= cluster_mode
 		self.htmlpage		= htmlpage
 		self.items 			= htmlpage.items
 		self.default_year	= default_year
@@ -62,6 +62,10 @@ class AnalyzerDirectory:
 		for a in self.analyzer_page:
 			res.extend(a.find_kpis(kpispecs))
 			
+		return self.filter_kpis(res, kpispecs)
+		
+		
+	def filter_kpis(self, res, kpispecs): # res = all occurences of kpi on all pages
 		if(config.global_ignore_all_years):
 			res = KPIMeasure.remove_all_years(res)
 
@@ -81,8 +85,25 @@ class AnalyzerDirectory:
 	def find_multiple_kpis(self, kpispecs_lst):
 		res = []
 		
+		# all KPIs share one matcher, so that each text is matched only once against all description patterns.
+		# The matcher only belongs to this call, since the KPIs may be used again with other KPIs afterwards
+		desc_matcher = KPISpecs.DescRegExMatcher(kpispecs_lst)
+		old_desc_matchers = [k.desc_matcher for k in kpispecs_lst]
 		for k in kpispecs_lst:
-			res.extend(self.find_kpis(k))
+			k.desc_matcher = desc_matcher
+		
+		try:
+			# each page (and table) is traversed only once for all KPIs. res_per_page[p][k] = occurences of kpispecs_lst[k] on page p
+			res_per_page = [a.find_multiple_kpis(kpispecs_lst) for a in self.analyzer_page]
+		finally:
+			for k, m in zip(kpispecs_lst, old_desc_matchers):
+				k.desc_matcher = m
+		
+		for k in range(len(kpispecs_lst)):
+			cur_res = []
+			for page_res in res_per_page:
+				cur_res.extend(page_res[k])
+			res.extend(self.filter_kpis(cur_res, kpispecs_lst[k]))
 			
 
 		
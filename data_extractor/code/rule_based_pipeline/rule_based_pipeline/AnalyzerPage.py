@@ -30,22 +30,28 @@ class AnalyzerPage:
 				self.analyzer_table.append(AnalyzerTable(s, self.htmlpage, default_year))
 		
 		self.analyzer_cluster = []
-		#self.analyzer_cluster.append(AnalyzerCluster(htmlpage.clusters, htmlpage, default_year))
-		self.analyzer_cluster.append(AnalyzerCluster(htmlpage.clusters_text, htmlpage, default_year))
+		#self.analyzer_cluster.append(AnalyzerCluster(CLUSTER_DISTANCE_MODE_EUCLIDIAN, htmlpage, default_year))
+		self.analyzer_cluster.append(AnalyzerCluster(CLUSTER_DISTANCE_MODE_RAW_TEXT, htmlpage, default_year))
 		
 		
 		self.default_year = default_year
 	
 	def find_kpis(self, kpispecs):
 		# find all possible occurenes of kpi on that page
+		return self.find_multiple_kpis([kpispecs])[0]
 		
-		print_verbose(1, " ==>>>> FIND KPIS '" + kpispecs.kpi_name + "' ON PAGE: "+str(self.htmlpage.page_num) + " <<<<<=====")
+		
+	def find_multiple_kpis(self, kpispecs_lst):
+		# find all possible occurenes of each kpi on that page. Each table is traversed only once for all KPIs,
+		# so that everything that does not depend on the KPI is calculated only once.
+		# Returns a list with the occurences for each kpi in kpispecs_lst
+		
+		for kpispecs in kpispecs_lst:
+			print_verbose(1, lambda: " ==>>>> FIND KPIS '" + kpispecs.kpi_name + "' ON PAGE: "+str(self.htmlpage.page_num) + " <<<<<=====")
 		print_verbose(9, self.htmlpage)
 		
-		res = []
 		# 1. Tables
-		for a in self.analyzer_table:
-			res.extend(a.find_kpis(kpispecs))
+		res_per_table = [a.find_multiple_kpis(kpispecs_lst) for a in self.analyzer_table]
 		
 		# 2. Figures and Text (used for CDP reports)
 		#for a in self.analyzer_cluster:
@@ -54,16 +60,24 @@ class AnalyzerPage:
 		# 3. Regular text
 		# TODO
 		
-		# 4. Remove dups
-		res = KPIMeasure.remove_duplicates(res)
+		res_lst = []
+		for k in range(len(kpispecs_lst)):
+			res = []
+			for table_res in res_per_table:
+				res.extend(table_res[k])
 		
-		#5. Adjust coords
-		for k in res:
-			px, py = self.htmlpage.transform_coords(k.pos_x, k.pos_y)
-			k.pos_x = px
-			k.pos_y = py
+			# 4. Remove dups
+			res = KPIMeasure.remove_duplicates(res)
+			
+			#5. Adjust coords
+			for m in res:
+				px, py = self.htmlpage.transform_coords(m.pos_x, m.pos_y)
+				m.pos_x = px
+				m.pos_y = py
+				
+			res_lst.append(res)
 
 		
 		
-		return res
-		
\ No newline at end of file
+		return res_lst
+		
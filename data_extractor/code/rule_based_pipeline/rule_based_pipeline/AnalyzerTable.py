@@ -42,6 +42,9 @@ class AnalyzerTable:
 	
 	table_hierarchy	= None # for each ix, a refernece to the parent ix (or -1, if root)
 	year_rows		= None # all rows containing years, each will be a YearRow
+	search_cache	= None # results of the steps of the KPI search that do not depend on the KPI, so they are shared by all KPIs (see get_cached)
+	search_cache_stats	= None # for each kind of cached result (i.e., key[0]), the number of [hits, misses]
+	depth_cache		= None # for each dir and ix, the result of get_depth (or None, if not yet calculated)
 	
 
 	def get_num_cols(self):
@@ -77,6 +80,15 @@ class AnalyzerTable:
 				
 		
 	def get_depth(self, i, j, dir):
+		# called very often (for each cell while calculating the hierarchy, and while searching the KPIs), hence memoized
+		ix = self.get_ix(i, j)
+		res = self.depth_cache[dir][ix]
+		if(res is None):
+			res = self.calc_depth(i, j, dir)
+			self.depth_cache[dir][ix] = res
+		return res
+		
+	def calc_depth(self, i, j, dir):
 		ident_threshold = (3.0 / 609.0) * self.htmlpage.page_width if dir==HIERARCHY_DIR_UP else (3.0 / 609.0) * self.htmlpage.page_height
 		
 		if(not self.has_item_at(i, j)):
@@ -117,6 +129,9 @@ class AnalyzerTable:
 				
 				
 	def get_aligned_multirow_txt_with_rect(self, r0, c0):
+		return self.get_cached(('aligned_multirow_txt_with_rect', r0, c0), lambda: self.calc_aligned_multirow_txt_with_rect(r0, c0))
+		
+	def calc_aligned_multirow_txt_with_rect(self, r0, c0):
 		def go(dir, init_depth):
 			res = []
 			rect = Rect(9999999, 9999999, -1, -1)
@@ -180,7 +195,27 @@ class AnalyzerTable:
 		
 		
 		
+	def get_cached(self, key, calc_func):
+		# only for results that do not depend on the KPI, and that are not modified by the caller.
+		# key = (kind, args...), e.g. ('txt_nodes', r, c, dir, include_special_items)
+		stats = self.search_cache_stats.setdefault(key[0], [0, 0])
+		if(key in self.search_cache):
+			stats[0] += 1
+			return self.search_cache[key]
+		stats[1] += 1
+		res = calc_func()
+		self.search_cache[key] = res
+		return res
+		
+	def print_search_cache_stats(self, verbosity):
+		for kind, (hits, misses) in sorted(self.search_cache_stats.items()):
+			print_verbose(verbosity, lambda: '....cache ' + kind + ': hits=' + str(hits) + ', misses=' + str(misses))
+		
+		
 	def get_txt_nodes(self, r0, c0, dir, include_special_items):
+		return self.get_cached(('txt_nodes', r0, c0, dir, include_special_items), lambda: self.calc_txt_nodes(r0, c0, dir, include_special_items))
+		
+	def calc_txt_nodes(self, r0, c0, dir, include_special_items):
 		res = []
 		ix = self.get_ix(r0, c0)
 		rect = Rect(9999999, 9999999, -1, -1)
@@ -203,6 +238,9 @@ class AnalyzerTable:
 		return res
 		
 	def get_txt_nodes_above(self, r0, c0, include_special_items, break_at_number):
+		return self.get_cached(('txt_nodes_above', r0, c0, include_special_items, break_at_number), lambda: self.calc_txt_nodes_above(r0, c0, include_special_items, break_at_number))
+		
+	def calc_txt_nodes_above(self, r0, c0, include_special_items, break_at_number):
 		# search for text items that are above the current cell
 		res = []
 		r = r0 
@@ -243,6 +281,9 @@ class AnalyzerTable:
 
 			
 	def get_multi_row_headline(self, r0, c0, include_special_items):
+		return self.get_cached(('multi_row_headline', r0, c0, include_special_items), lambda: self.calc_multi_row_headline(r0, c0, include_special_items))
+		
+	def calc_multi_row_headline(self, r0, c0, include_special_items):
 		# get first non-empty row
 		r = self.get_first_non_empty_row(r0, c0)
 		if(r == self.get_num_rows() or not Format_Analyzer.looks_weak_words(self.get_item(r, c0))):
@@ -378,7 +419,7 @@ class AnalyzerTable:
 		init_depth = self.get_depth(r0, 0, HIERARCHY_DIR_UP)
 		while(r < self.get_num_rows()):
 			cur_years = self.find_applicable_year_line(r)
-			print_verbose(8, '.........-> r='+str(r)+', cur_years='+str(cur_years))
+			print_verbose(8, lambda: '.........-> r='+str(r)+', cur_years='+str(cur_years))
 			cur_items = return_items_for_row(r, cur_years)
 			if(cur_items is not None and contains_items(cur_items)):
 				#we found the applicable items
@@ -416,28 +457,33 @@ class AnalyzerTable:
 			r = advance_row(init_depth, r)
 		return None
 				
+	def find_unit_candidates(self, search_rect): # returns list of (idx, txt) of all items that could contain the unit
+		items_idx = self.htmlpage.find_items_within_rect(search_rect, [CAT_HEADLINE, CAT_OTHER_TEXT, CAT_TABLE_DATA, CAT_TABLE_HEADLINE, CAT_TABLE_SPECIAL, CAT_MISC, CAT_FOOTER])
+		return [(i, self.htmlpage.explode_item(i)) for i in items_idx]
+		
 	def find_applicable_unit_item(self, kpispecs, r0):
 		# returns the applicable item that contains the corresponding unit
 		sp_item = self.htmltable.find_applying_special_item(r0)
-		print_verbose(7, '....unit_item->sp_item='+str(sp_item))
+		print_verbose(7, lambda: '....unit_item->sp_item='+str(sp_item))
 		if(sp_item is not None and kpispecs.match_unit(sp_item.txt)):
 			return sp_item.txt
 		
 		# look for other unit items 
 		search_rect = self.htmltable.rows[r0]
 		search_rect.y0 =  0 #self.htmltable.table_rect.y0 - self.htmlpage.page_height * 0.125
-		items_idx = self.htmlpage.find_items_within_rect(search_rect, [CAT_HEADLINE, CAT_OTHER_TEXT, CAT_TABLE_DATA, CAT_TABLE_HEADLINE, CAT_TABLE_SPECIAL, CAT_MISC, CAT_FOOTER])
+		unit_candidates = self.get_cached(('unit_candidates', r0), lambda: self.find_unit_candidates(search_rect))
 		match_idx = -1
-		for i in items_idx:
-			txt = self.htmlpage.explode_item(i)
-			print_verbose(10,'.......trying instead: ' + txt)
+		match_txt = None
+		for i, txt in unit_candidates:
+			print_verbose(10,lambda: '.......trying instead: ' + txt)
 			if(kpispecs.match_unit(txt)):
 				print_verbose(10,'...........===> match!') 
 				if(match_idx == -1 or self.items[i].pos_y > self.items[match_idx].pos_y):
-					print_verbose(10,'...........===> better then previous match. new match_idx='+str(i)) 
+					print_verbose(10,lambda: '...........===> better then previous match. new match_idx='+str(i)) 
 					match_idx = i
+					match_txt = txt
 		if(match_idx != -1):
-			return self.htmlpage.explode_item(match_idx)
+			return match_txt
 		
 		return None
 			
@@ -465,7 +511,7 @@ class AnalyzerTable:
 							#cur_year = int(w.txt)
 					else:
 						cur_year = Format_Analyzer.looks_year_extended(w.txt)
-					print_verbose(11, '..................... Analyzing possible year string: "'+w.txt+'" => ' +str(cur_year))
+					print_verbose(11, lambda: '..................... Analyzing possible year string: "'+w.txt+'" => ' +str(cur_year))
 						
 					if(cur_year is not None and cur_year >= min_year and cur_year <= max_year):
 						best_year = cur_year
@@ -495,13 +541,13 @@ class AnalyzerTable:
 		print_verbose(5,  '<<< ================================= >>>')
 		print_verbose(5,  ' ')
 
-		print_verbose(5,  'year_rows = ' + str(self.year_rows))
+		print_verbose(5,  lambda: 'year_rows = ' + str(self.year_rows))
 		
 		print_verbose(5,  'Looking at headlines')
-		h_txt_nodes = self.get_txt_headline()
+		h_txt_nodes = self.get_cached(('txt_headline',), self.get_txt_headline)
 		h_match_dummy, h_score = kpispecs.match_nodes(h_txt_nodes) 
 		h_score *= 0.5 #decay factor for headline
-		print_verbose(5,  'Headline: ' + str(h_txt_nodes)+ ', score=' + str(h_score))
+		print_verbose(5,  lambda: 'Headline: ' + str(h_txt_nodes)+ ', score=' + str(h_score))
 
 		if(h_score < 0):
 			return [] # headline contains something that must be excluded
@@ -517,13 +563,13 @@ class AnalyzerTable:
 		for i in range(self.get_num_rows()):
 			txt_nodes = self.get_txt_nodes(i, 0, HIERARCHY_DIR_UP, True)
 			txt_nodes = txt_nodes + ([previous_txt_node_with_no_values] if previous_txt_node_with_no_values != '' and previous_txt_node_with_no_values not in txt_nodes else [])
-			print_verbose(5, 'Looking at row i='+str(i)+', txt_nodes='+str(txt_nodes))
+			print_verbose(5, lambda: 'Looking at row i='+str(i)+', txt_nodes='+str(txt_nodes))
 			txt_match, score = kpispecs.match_nodes(txt_nodes)
-			print_verbose(5, '---> score='+str(score))
+			print_verbose(5, lambda: '---> score='+str(score))
 			if(not txt_match):
 				print_verbose(5, '---> No match')
 				continue #no match
-			value_row, value_items = self.find_applicable_items_for_table_with_years(i)
+			value_row, value_items = self.get_cached(('items_for_table_with_years', i), lambda: self.find_applicable_items_for_table_with_years(i))
 			if(value_items is None):
 				print_verbose(5, '---> No values found')
 				if(self.has_item_at(i, 0)):
@@ -532,7 +578,7 @@ class AnalyzerTable:
 					previous_txt_node_with_no_values = '' 
 				continue #no values found
 			missmatch_value = False
-			print_verbose(6, '-------> value_row / value_items= '+str(value_row)+' / '+str(value_items))
+			print_verbose(6, lambda: '-------> value_row / value_items= '+str(value_row)+' / '+str(value_items))
 			for y, it in value_items.items():
 				if(it is None):
 					continue
@@ -569,7 +615,7 @@ class AnalyzerTable:
 					
 				total_score =  score + h_score + anywhere_match_score + bonus
 				if(total_score < kpispecs.minimum_score):
-					print_verbose(5, '---> Total score '+str(total_score)+' is less than min. score '+str(kpispecs.minimum_score))
+					print_verbose(5, lambda: '---> Total score '+str(total_score)+' is less than min. score '+str(kpispecs.minimum_score))
 					continue
 					
 					
@@ -588,7 +634,7 @@ class AnalyzerTable:
 				kpi_measure.unit	  = txt_unit
 				kpi_measure.match_type= 'AT.direct'
 				res.append(kpi_measure)
-				print_verbose(4, '---> Match: ' + str(kpi_measure) + ': score='+str(score)+',h_score='+str(h_score)+',anywhere_match_score='+str(anywhere_match_score)+',bonus='+str(bonus)+', multiplier='+str(multiplier))
+				print_verbose(4, lambda: '---> Match: ' + str(kpi_measure) + ': score='+str(score)+',h_score='+str(h_score)+',anywhere_match_score='+str(anywhere_match_score)+',bonus='+str(bonus)+', multiplier='+str(multiplier))
 				
 		res = KPIMeasure.remove_duplicates(res)
 		return res
@@ -596,6 +642,14 @@ class AnalyzerTable:
 	
 	
 	
+	def find_fixed_left_cols(self):
+		res = [0]
+		for j in range(1, self.get_num_cols()):
+			if(self.htmltable.col_looks_like_text_col(j)):
+				res.append(j)
+		return res
+		
+	
 	def find_kpi_with_indirect_years(self, kpispecs, bonus): 
 		# find KPIs that are only indirectly connected with year headline, or not at all
 		# Example:
@@ -614,14 +668,14 @@ class AnalyzerTable:
 		print_verbose(5,  ' ')
 
 		print_verbose(5,  'Looking at headlines')
-		h_txt_nodes = self.get_txt_headline()
+		h_txt_nodes = self.get_cached(('txt_headline',), self.get_txt_headline)
 		h_match_dummy, h_score = kpispecs.match_nodes(h_txt_nodes) 
 		if(h_score < 0):
 			return [] # headline contains something that must be excluded
 		
 		
 		h_score *= 0.1 #decay factor for headline
-		print_verbose(5,  'Headline: ' + str(h_txt_nodes)+ ', score=' + str(h_score))
+		print_verbose(5,  lambda: 'Headline: ' + str(h_txt_nodes)+ ', score=' + str(h_score))
 			
 			
 			
@@ -630,12 +684,9 @@ class AnalyzerTable:
 
 
 		# find possible fixed left columns
-		fixed_left_cols = [0]
-		for j in range(1, self.get_num_cols()):
-			if(self.htmltable.col_looks_like_text_col(j)):
-				fixed_left_cols.append(j)
+		fixed_left_cols = self.get_cached(('fixed_left_cols',), self.find_fixed_left_cols)
 		
-		print_verbose(6, 'fixed_left_cols='+str(fixed_left_cols))
+		print_verbose(6, lambda: 'fixed_left_cols='+str(fixed_left_cols))
 
 		for fixed_left_column in fixed_left_cols:
 			#fixed_left_column = 6
@@ -645,9 +696,9 @@ class AnalyzerTable:
 				if(self.has_item_at(i, fixed_left_column)):
 					font_size_row_node = self.get_item(i, fixed_left_column).font_size
 					
-				print_verbose(5, 'Looking at row i='+str(i)+', txt_nodes_row='+str(txt_nodes_row)+',fonz_size='+str(font_size_row_node))
+				print_verbose(5, lambda: 'Looking at row i='+str(i)+', txt_nodes_row='+str(txt_nodes_row)+',fonz_size='+str(font_size_row_node))
 
-				value_row = self.find_applicable_row_with_items_for_any_left_oriented_table(i)
+				value_row = self.get_cached(('row_with_items_for_any_left_oriented_table', i), lambda: self.find_applicable_row_with_items_for_any_left_oriented_table(i))
 
 				if(value_row is None):
 					print_verbose(5, '---> No values found')
@@ -655,7 +706,7 @@ class AnalyzerTable:
 					
 				txt_unit = self.find_applicable_unit_item(kpispecs, value_row)
 				
-				print_verbose(6, '-------> txt_unit='+str(txt_unit))
+				print_verbose(6, lambda: '-------> txt_unit='+str(txt_unit))
 				
 				if(txt_unit is None):
 					print_verbose(5, '---> Unit not matched')
@@ -663,7 +714,7 @@ class AnalyzerTable:
 
 				years = self.find_applicable_year_line(i)
 				
-				print_verbose(5, '--> years= '+str(years))
+				print_verbose(5, lambda: '--> years= '+str(years))
 				for j in range(fixed_left_column + 1, self.get_num_cols()):
 					if(not self.has_item_at(value_row, j)):
 						continue # empty cell
@@ -671,7 +722,7 @@ class AnalyzerTable:
 					it = self.get_item(value_row, j)
 					value_txt = it.txt
 					font_size_cell = it.font_size
-					print_verbose(5, '\n-> Looking at cell: row,col=' + str(value_row) +',' + str(j)+':' + str(value_txt) + ', font_size=' +str(font_size_cell))
+					print_verbose(5, lambda: '\n-> Looking at cell: row,col=' + str(value_row) +',' + str(j)+':' + str(value_txt) + ', font_size=' +str(font_size_cell))
 					if(font_size_row_node is not None and (font_size_cell < font_size_row_node / 1.75 or font_size_cell > font_size_row_node * 1.75)):
 						print_verbose(5, '---> Fontsize missmatch')
 						continue # value missmatch
@@ -680,10 +731,10 @@ class AnalyzerTable:
 						continue # value missmatch
 						
 					txt_nodes_col = self.get_txt_nodes_above(value_row, j, True, False) # TODO: Really use False here? 
-					print_verbose(5, '---> txt_nodes_col='+str(txt_nodes_col))
-					print_verbose(6, '......... matching against: ' + str(txt_nodes_row + txt_nodes_col))
+					print_verbose(5, lambda: '---> txt_nodes_col='+str(txt_nodes_col))
+					print_verbose(6, lambda: '......... matching against: ' + str(txt_nodes_row + txt_nodes_col))
 					txt_match, score = kpispecs.match_nodes(txt_nodes_row + txt_nodes_col)
-					print_verbose(5, '---> score='+str(score))
+					print_verbose(5, lambda: '---> score='+str(score))
 					if(not txt_match):
 						print_verbose(5, '---> No match')
 						continue #no match
@@ -717,7 +768,7 @@ class AnalyzerTable:
 							max_add = (self.get_item(next_non_empty_row, j).pos_y - (it.pos_y + it.height)) * 0.8
 						
 						search_rect.y1 += min(it.height * 1.0, max_add)
-						print_verbose(8, '..............-> max_add='+str(max_add)+ ', y1(old)=' +str(it.pos_y) + ', y1(new)=' + str(search_rect.y1) )
+						print_verbose(8, lambda: '..............-> max_add='+str(max_add)+ ', y1(old)=' +str(it.pos_y) + ', y1(new)=' + str(search_rect.y1) )
 						base_pos_x, base_pos_y = it.get_rect().get_center()
 						kpi_year = self.search_year_agressive(search_rect, self.default_year - 10, self.default_year, base_pos_x, base_pos_y, aggressive_year_pattern = False)
 						if(kpi_year == -1):
@@ -729,7 +780,7 @@ class AnalyzerTable:
 							search_rect.x0 = 0
 							search_rect.x1 = 9999999
 							kpi_year = self.search_year_agressive(search_rect, self.default_year - 10, self.default_year, base_pos_x, base_pos_y, aggressive_year_pattern = True)
-						print_verbose(7, '.........-> year found='+str(kpi_year) if kpi_year != -1 else '..........-> still nothing found. give up.')
+						print_verbose(7, lambda: '.........-> year found='+str(kpi_year) if kpi_year != -1 else '..........-> still nothing found. give up.')
 					
 					
 					anywhere_match, anywhere_match_score = kpispecs.match_anywhere_on_page(self.htmlpage, it.this_id)
@@ -740,7 +791,7 @@ class AnalyzerTable:
 					total_score = score + h_score + anywhere_match_score + bonus
 					
 					if(total_score < kpispecs.minimum_score):
-						print_verbose(5, '---> Total score '+str(total_score)+' is less than min. score '+str(kpispecs.minimum_score))
+						print_verbose(5, lambda: '---> Total score '+str(total_score)+' is less than min. score '+str(kpispecs.minimum_score))
 						continue
 						
 					kpi_measure = KPIMeasure()
@@ -759,7 +810,7 @@ class AnalyzerTable:
 					kpi_measure.match_type= 'AT.indirect'
 					kpi_measure.tmp		= i # we use this to determine score multiplier
 					res.append(kpi_measure)
-					print_verbose(4, '---> Match: ' + str(kpi_measure))
+					print_verbose(4, lambda: '---> Match: ' + str(kpi_measure))
 				
 		res = KPIMeasure.remove_duplicates(res)
 		
@@ -780,7 +831,7 @@ class AnalyzerTable:
 			kpi.score *= row_multiplier[kpi.tmp]
 			
 		
-		print_verbose(5, "===> found AT.indirect KPIs on Page " + str(self.htmlpage.page_num) + ": " + str(res) + "\n================================")
+		print_verbose(5, lambda: "===> found AT.indirect KPIs on Page " + str(self.htmlpage.page_num) + ": " + str(res) + "\n================================")
 		
 		return res
 				
@@ -791,7 +842,7 @@ class AnalyzerTable:
 					
 	def find_kpis(self, kpispecs):
 		# Find all possible occurences of KPIs in that table
-		print_verbose(6, "Analyzing Table :\n" +str(self.htmltable))
+		print_verbose(6, lambda: "Analyzing Table :\n" +str(self.htmltable))
 		res = []
 		res.extend(self.find_kpi_with_direct_years(kpispecs, 100)) # with years
 		res.extend(self.find_kpi_with_indirect_years(kpispecs, 0)) # without years
@@ -802,8 +853,18 @@ class AnalyzerTable:
 		res = KPIMeasure.remove_duplicates(res)
 		
 		if(len(res) > 0):
-			print_verbose(2, "Found KPIs on Page " + str(self.htmlpage.page_num) +",  Table : \n" +str(self.htmltable.get_printed_repr()) + "\n" + str(res) + "\n================================")
+			print_verbose(2, lambda: "Found KPIs on Page " + str(self.htmlpage.page_num) +",  Table : \n" +str(self.htmltable.get_printed_repr()) + "\n" + str(res) + "\n================================")
+		
+		return res
+		
 		
+	def find_multiple_kpis(self, kpispecs_lst):
+		# Returns a list with all possible occurences of each KPI in that table. Everything that does not depend on the KPI
+		# (text nodes, year and value items, unit candidates, ...) is only calculated once (see get_cached). Note: the KPIs
+		# must be searched one after another, because the search modifies some rects of the table (e.g., rows[r0].y0)
+		res = [self.find_kpis(k) for k in kpispecs_lst]
+		print_verbose(7, lambda: 'Search cache statistics of table on page ' + str(self.htmlpage.page_num) + ':')
+		self.print_search_cache_stats(7)
 		return res
 				
 			
@@ -818,9 +879,13 @@ class AnalyzerTable:
 		self.htmlpage	= htmlpage
 		self.items 		= htmlpage.items
 		self.default_year	= default_year
+		self.search_cache = {}
+		self.search_cache_stats = {}
+		self.depth_cache = []
 		self.table_hierarchy = []
 		for i in range(2):
 			self.table_hierarchy.append([-2] * len(self.htmltable.idx))
+			self.depth_cache.append([None] * len(self.htmltable.idx))
 		self.calculate_hierarchy(HIERARCHY_DIR_UP)
 		self.calculate_hierarchy(HIERARCHY_DIR_LEFT)
 		self.years = []
@@ -6,9 +6,20 @@
 # ============================================================================================================================
 
 from globals import *
+import functools
+
+
+
+# The predicates below are called for the same texts over and over again (e.g., for each cell of each table, each time
+# a KPI is searched). They only depend on their argument, so their results are cached (per process, see clear_caches).
+cached_predicates = []
+
+def cached_predicate(func):
+	res = functools.lru_cache(maxsize=FORMAT_ANALYZER_CACHE_SIZE)(func)
+	cached_predicates.append(res)
+	return res
 
 
-		
 class Format_Analyzer:
 	#pattern_numeric = re.compile(r'^(-?[ ]*[0-9]*(,[0-9][0-9][0-9])*(\.[0-9]+)?|-?[ ]*[0-9]*(\.[0-9][0-9][0-9])*(,[0-9]+)?)$')
 	#pattern_numeric = re.compile(r'^\(?(-?\(?[ ]*[0-9]*(,[0-9][0-9][0-9])*(\.[0-9]+)?|-?[ ]*[0-9]*(\.[0-9][0-9][0-9])*(,[0-9]+)?)\)?$')
@@ -39,6 +50,7 @@ class Format_Analyzer:
 		
 	
 	@staticmethod
+	@cached_predicate
 	def looks_numeric(val):
 		#return Format_Analyzer.pattern_numeric.match(val.replace(' ', '').replace('$', '')) and len(val)>0
 		val0 = remove_bad_chars(val, ' ()$%')
@@ -46,11 +58,13 @@ class Format_Analyzer:
 		return Format_Analyzer.pattern_numeric.match(val0.replace('WLTP', '')) and len(val0)>0 #by Lei
 
 	@staticmethod
+	@cached_predicate
 	def looks_numeric_multiple(val):
 		#return Format_Analyzer.pattern_numeric.match(val.replace(' ', '').replace('$', '')) and len(val)>0
 		return Format_Analyzer.pattern_numeric_multi.match(remove_bad_chars(val, ' ()$%')) and len(val)>0
 
 	@staticmethod
+	@cached_predicate
 	def looks_weak_numeric(val):
 		num_numbers = sum(c.isnumeric() for c in val)
 		return num_numbers > 0
@@ -60,6 +74,7 @@ class Format_Analyzer:
 		return looks_weak_numeric(val) and '%' in val
 		
 	@staticmethod
+	@cached_predicate
 	def to_year(val):
 #		val0 = remove_bad_chars(val, 'FY') #by Lei
 		val0 = re.sub(r'[^0-9]', '', val) #by Lei
@@ -68,10 +83,12 @@ class Format_Analyzer:
 #		return int(val0.replace(' ', ''))
 
 	@staticmethod
+	@cached_predicate
 	def looks_year(val):
 		return Format_Analyzer.pattern_year.match(val.replace(' ', ''))
 
 	@staticmethod
+	@cached_predicate
 	def looks_year_extended(val): #return year if found, otherwise None
 		if(Format_Analyzer.pattern_year_extended_1.match(val.replace(' ', ''))):
 			return int(Format_Analyzer.pattern_year_extended_1.match(val.replace(' ', '')).groups()[2])
@@ -108,26 +125,31 @@ class Format_Analyzer:
 		return float(s)
 		
 	@staticmethod
+	@cached_predicate
 	def cleanup_text(val): #remove all characters except letters and spaces
 		return re.sub(Format_Analyzer.pattern_cleanup_text, '', val)
 		
 
 	@staticmethod
+	@cached_predicate
 	def looks_null(val):
 		return Format_Analyzer.pattern_null.match(val.replace(' ', '').lower())
 
 	@staticmethod
+	@cached_predicate
 	def looks_words(val):
 		num_letters = sum(c.isalpha() for c in val)
 		return num_letters > 5
 
 	@staticmethod
+	@cached_predicate
 	def looks_weak_words(val):
 		num_letters = sum(c.isalpha() for c in val)
 		num_numbers = sum(c.isnumeric() for c in val)
 		return num_letters > 2 and num_letters > num_numbers
 
 	@staticmethod
+	@cached_predicate
 	def looks_weak_non_numeric(val):
 		num_letters = sum(c.isalpha() for c in val)
 		num_numbers = sum(c.isnumeric() for c in val)
@@ -137,16 +159,19 @@ class Format_Analyzer:
 		return num_letters > 0 and num_letters > num_numbers and ((num_letters + num_others > 1 and num_numbers < (num_letters + num_others) * 2 + 1) or (num_letters + num_others > num_numbers))
 
 	@staticmethod
+	@cached_predicate
 	def looks_other_special_item(val):
 		return len(val) < 4 and not Format_Analyzer.looks_words(val) and not Format_Analyzer.looks_numeric(val)
 		
 		
 
 	@staticmethod
+	@cached_predicate
 	def looks_pagenum(val):
 		return Format_Analyzer.pattern_pagenum.match(val.replace(' ', '')) and len(val)>0 and val.replace(' ', '') != '0'
 		
 	@staticmethod
+	@cached_predicate
 	def looks_running_text(val):
 		txt = Format_Analyzer.trim_whitespaces(val)
 		num_full_stops = txt.count(".")
@@ -176,6 +201,7 @@ class Format_Analyzer:
 			   
 			   
 	@staticmethod
+	@cached_predicate
 	def looks_footnote(val):
 		return Format_Analyzer.pattern_footnote.match(val.replace(' ', '').lower())
 			   
@@ -208,4 +234,14 @@ class Format_Analyzer:
 	@staticmethod
 	def cnt_overlapping_items(l0, l1):
 		return len(list(set(l0) & set(l1)))
-		
\ No newline at end of file
+
+
+	@staticmethod
+	def clear_caches():
+		for f in cached_predicates:
+			f.cache_clear()
+			
+	@staticmethod
+	def print_cache_stats(verbosity):
+		for f in cached_predicates:
+			print_verbose(verbosity, lambda: '....cache Format_Analyzer.' + f.__name__ + ': ' + str(f.cache_info()))
@@ -12,7 +12,7 @@ from globals import *
 from HTMLItem import *
 
 import scipy.cluster.hierarchy as hcl
-from scipy.spatial.distance import squareform
+from scipy.spatial.distance import pdist
 import numpy
 
 CLUSTER_DISTANCE_MODE_EUCLIDIAN = 0
@@ -149,6 +149,19 @@ class HTMLCluster:
 		raise ValueError('Invalid distance mode')
 		
 		
+	@staticmethod
+	def calc_condensed_distances(items, mode):
+		# same as item_dist for all pairs (i<j), but as condensed distance vector (see scipy.spatial.distance.squareform)
+		if(mode == CLUSTER_DISTANCE_MODE_EUCLIDIAN):
+			coords = numpy.array([it.get_rect().get_center() for it in items], dtype=numpy.float64)
+		elif(mode == CLUSTER_DISTANCE_MODE_RAW_TEXT):
+			coords = numpy.array([[it.pos_y] for it in items], dtype=numpy.float64)
+		else:
+			raise ValueError('Invalid distance mode')
+		# float_power(.., 0.5) instead of sqrt (euclidean), because dist uses **0.5, and the results must be identical
+		return numpy.float_power(pdist(coords, 'sqeuclidean'), 0.5)
+		
+		
 	@staticmethod
 	def generate_clusters(items, mode):
 		print_verbose(3, "Regenerating clusters")
@@ -167,24 +180,15 @@ class HTMLCluster:
 			nodes.append(cur)
 			
 			
-		print_verbose(3, 'Leaves: ' + str(nodes))
+		print_verbose(3, lambda: 'Leaves: ' + str(nodes))
 		
-		# generate distance matrix
-		l = len(items)
-		dmatrix = numpy.zeros((l, l))
-		for i in range(l):
-			for j in range(i+1,l):
-				d = HTMLCluster.item_dist(items[i], items[j], mode)
-				dmatrix[i, j] = d
-				dmatrix[j, i] = d
+		# generate (condensed) distance matrix
+		sq = HTMLCluster.calc_condensed_distances(items, mode)
 		
-		
-		print_verbose(5, dmatrix)
+		print_verbose(5, sq)
 		
 		# compute clusters
 		
-		sq = squareform(dmatrix)
-		
 		output_linkage = hcl.linkage(sq, method='average')
 		
 		# build up tree
@@ -203,7 +207,7 @@ class HTMLCluster:
 		res.regenerate_not_exported(items)
 		
 		
-		print_verbose(3, 'Clustering result: ' +str(res))
+		print_verbose(3, lambda: 'Clustering result: ' +str(res))
 		
 		return res
 		
@@ -64,6 +64,30 @@ class HTMLDirectory:
 			print_verbose(2, 'PDF-Filename: ' + self.src_pdf_filename)	
 		
 		
+	@staticmethod
+	def sort_by_page_num(files):
+		# page1.html, page2.html, ..., page10.html (instead of glob order)
+		def get_page_num(f):
+			m = re.match('.*?([0-9]+)\\.[a-z]+$', f)
+			return int(m.groups()[0]) if m else -1
+		return sorted(files, key=lambda f: (get_page_num(f), f))
+		
+		
+	@staticmethod
+	def parse_html_page(html_dir, f):
+		print_verbose(1, "ANALYZING HTML-FILE = " + str(f))
+	
+		htmlpage = HTMLPage.parse_html_file(html_dir,f)
+		
+		print_verbose(1, "Discovered tables: ")
+		
+		print_verbose(1, htmlpage.repr_tables_only())
+		
+		print_verbose(1, "Done with page = " + str(htmlpage.page_num))
+		
+		return htmlpage
+		
+		
 	def parse_html_directory(self, html_dir, page_wildcard):
 	
 		html_dir = remove_trailing_slash(html_dir)
@@ -73,26 +97,18 @@ class HTMLDirectory:
 		
 		self.read_pdf_filename(html_dir)
 					
-		
-		for f in glob.glob(pathname):
+		# pages are independent at this stage, so they can be parsed in parallel
+		files = HTMLDirectory.sort_by_page_num(glob.glob(pathname))
+		self.htmlpages.extend(run_in_process_pool(HTMLDirectory.parse_html_page, [(html_dir, f) for f in files], config.global_page_workers))
 
-			print_verbose(1, "ANALYZING HTML-FILE = " + str(f))
-		
-			htmlpage = HTMLPage.parse_html_file(html_dir,f)
-			
-			print_verbose(1, "Discovered tables: ")
-			
-			print_verbose(1, htmlpage.repr_tables_only())
 			
-			print_verbose(1, "Done with page = " + str(htmlpage.page_num))
-			
-			self.htmlpages.append(htmlpage)
-
+	@staticmethod
+	def render_page_to_png(htmlpage, base_dir, out_dir):
+		print_verbose(1, "Render to png : page = " + str(htmlpage.page_num))
+		htmlpage.render_to_png(base_dir, out_dir)
 			
 	def render_to_png(self, base_dir, out_dir):
-		for it in self.htmlpages:
-			print_verbose(1, "Render to png : page = " + str(it.page_num))
-			it.render_to_png(remove_trailing_slash(base_dir), remove_trailing_slash(out_dir))
+		run_in_process_pool(HTMLDirectory.render_page_to_png, [(it, remove_trailing_slash(base_dir), remove_trailing_slash(out_dir)) for it in self.htmlpages], config.global_page_workers)
 			
 	def print_all_tables(self):
 		for it in self.htmlpages:
@@ -100,12 +116,15 @@ class HTMLDirectory:
 			
 		
 			
+	@staticmethod
+	def save_page_to_dir(htmlpage, out_dir):
+		print_verbose(1, "Save to JSON and CSV: page = " + str(htmlpage.page_num))
+		htmlpage.save_to_file(remove_trailing_slash(out_dir) + r'/jpage'+"{:05d}".format(htmlpage.page_num) +'.json')
+		htmlpage.save_all_tables_to_csv(out_dir)
+		htmlpage.save_all_footnotes_to_txt(out_dir)
+			
 	def save_to_dir(self, out_dir):
-		for it in self.htmlpages:
-			print_verbose(1, "Save to JSON and CSV: page = " + str(it.page_num))
-			it.save_to_file(remove_trailing_slash(out_dir) + r'/jpage'+"{:05d}".format(it.page_num) +'.json')
-			it.save_all_tables_to_csv(out_dir)
-			it.save_all_footnotes_to_txt(out_dir)
+		run_in_process_pool(HTMLDirectory.save_page_to_dir, [(it, out_dir) for it in self.htmlpages], config.global_page_workers)
 			
 	def load_from_dir(self, html_dir, page_wildcard):
 	
@@ -114,7 +133,7 @@ class HTMLDirectory:
 	
 		self.read_pdf_filename(html_dir)
 		
-		for f in glob.glob(pathname):
+		for f in HTMLDirectory.sort_by_page_num(glob.glob(pathname)):
 			#if not (f.endswith('0052.json') or f.endswith('0053.json')): # can be used for debugging, esp. multipage analyzing
 			#	continue
 
@@ -14,37 +14,40 @@ from Format_Analyzer import *
 
 
 class HTMLItem:
-	line_num 		= None
-	tot_line_num	= None
-	pos_x 			= None # in pixels
-	pos_y 			= None # in pixels
-	width			= None # in pixels
-	height			= None # in pixels
-	initial_height	= None # in pixels
-	font_size		= None
-	txt 			= None
-	is_bold 		= None
-	brightness		= None
-	alignment		= None
-	font_file		= None
-	
-	this_id			= None 
-	next_id			= None # next line, -1 if None
-	prev_id			= None # prev line, -1 if None
-	left_id			= None # item to the left, -1 if None
-	right_id		= None # item to the right, -1 if None
-	
-	category		= None
-	temp_assignment	= None # an integer, that is normally set to 0. It has greater values while table extraction is in progress
-	
-	merged_list		= None #indexes of items, that this item had been merged with
-	words			= None #list of all words (each a HTMLWord)
-	space_width 	= None
-	has_been_split	= None
-	
-	rendering_color	= None # only used for PNG rendering. not related with KPI extraction
-	
-	page_num		= None
+	# there are many items per page => __slots__ instead of __dict__ (less memory, faster attribute access)
+	__slots__ = (
+		'line_num',
+		'tot_line_num',
+		'pos_x',		# in pixels
+		'pos_y',		# in pixels
+		'width',		# in pixels
+		'height',		# in pixels
+		'initial_height',	# in pixels
+		'font_size',
+		'txt',
+		'is_bold',
+		'brightness',
+		'alignment',
+		'font_file',
+		
+		'this_id',
+		'next_id',		# next line, -1 if None
+		'prev_id',		# prev line, -1 if None
+		'left_id',		# item to the left, -1 if None
+		'right_id',		# item to the right, -1 if None
+		
+		'category',
+		'temp_assignment',	# an integer, that is normally set to 0. It has greater values while table extraction is in progress
+		
+		'merged_list',	#indexes of items, that this item had been merged with
+		'words',		#list of all words (each a HTMLWord)
+		'space_width',
+		'has_been_split',
+		
+		'rendering_color',	# only used for PNG rendering. not related with KPI extraction
+		
+		'page_num',
+	)
 	
 	
 	def __init__(self):
@@ -76,6 +79,23 @@ class HTMLItem:
 		self.page_num = -1
 
 	
+	def __deepcopy__(self, memo):
+		# much faster than the generic deepcopy (used for backups, see HTMLTable.cleanup_table).
+		# All attributes are immutable, except for merged_list (which can be shared with a split item) and words
+		res = HTMLItem.__new__(HTMLItem)
+		memo[id(self)] = res
+		for a in HTMLItem.__slots__:
+			setattr(res, a, getattr(self, a))
+		res.merged_list = deepcopy(self.merged_list, memo)
+		res.words = []
+		for w in self.words:
+			new_w = HTMLWord()
+			new_w.txt = w.txt
+			new_w.rect = Rect(w.rect.x0, w.rect.y0, w.rect.x1, w.rect.y1)
+			new_w.item_id = w.item_id
+			res.words.append(new_w)
+		return res
+
 	def is_connected(self):
 		return next_id != -1 or prev_id != -1
 		
@@ -159,7 +179,7 @@ class HTMLItem:
 		
 		
 	def recalc_width(self):
-		span_font = ImageFont.truetype(self.font_file, self.font_size)
+		span_font = get_font(self.font_file, self.font_size)
 		size = span_font.getsize(self.txt)
 		self.width = size[0]
 		if(self.width == 0):
@@ -13,7 +13,11 @@
 from globals import *
 from HTMLTable import *
 from HTMLCluster import *
+from SpatialIndex import *
+from LineIndex import *
+from PageSerializer import *
 import copy
+import numpy
 		
 
 class HTMLPage:
@@ -24,10 +28,13 @@ class HTMLPage:
 	left_distrib	= None #distribution of pos_x values (left alignments)
 	tables			= None
 	paragraphs		= None
-	clusters		= None
+	clusters		= None # [] if not yet generated (see get_clusters), None if there are too few items
 	clusters_text	= None #clusters for traversing raw text
 	footnotes_idx	= None
 	page_start_y0	= None
+	spatial_index	= None # only set temporarily, while the item geometry does not change (see build_spatial_index)
+	item_grid		= None # cache for find_items_within_rect, dont export (see get_item_grid)
+	line_index		= None # cache for KPISpecs.AnywhereRegExMatch, dont export (see get_line_index)
 	
 	def __init__(self):
 		self.page_num 		= 0
@@ -50,6 +57,9 @@ class HTMLPage:
 	
 	@staticmethod
 	def merge(p0, p1): # merge two pages (p1 will be below p0)
+		# The merged page is only used for analyzing, and the analyzers never modify items. Hence, p0's items are
+		# shared with the merged page, and only p1's items are copied (they get new ids and coordinates).
+		# Tables are copied, because the analyzers modify some of their rects.
 		def get_max_line_num(p):
 			res = 0
 			for it in p.items:
@@ -69,48 +79,66 @@ class HTMLPage:
 				return -1
 			return id + offset
 			
-		p0c = copy.deepcopy(p0) #p0's copy
-		p1c = copy.deepcopy(p1) #p1's copy
-		#p0c will be the result
-		p0c.page_start_y0.append(p0c.page_height)
-		p0c.page_height += p1c.page_height
-		p0c.page_width = max(p0c.page_width, p1c.page_width)
-		p1c_min_line_num = get_max_line_num(p0c) + 1
-		p1c_min_id = get_max_id(p0c) + 1
-		p0c_num_items = len(p0c.items)
-		
-		for it in p1c.items:
-			it.line_num += p1c_min_line_num
-			it.tot_line_num = p0c.page_num * 10000 + it.line_num
-			it.pos_y += p1c.page_height
-			it.this_id = transform_id(it.this_id, p1c_min_id)
-			it.next_id = transform_id(it.next_id, p1c_min_id)
-			it.prev_id = transform_id(it.prev_id, p1c_min_id)
-			it.left_id = transform_id(it.left_id, p1c_min_id)
-			it.right_id = transform_id(it.right_id, p1c_min_id)
-			it.merged_list = [transform_id(id, p1c_min_id) for id in it.merged_list]
+		res = HTMLPage()
+		res.page_num = p0.page_num
+		res.page_start_y0 = p0.page_start_y0 + [p0.page_height]
+		res.page_height = p0.page_height + p1.page_height
+		res.page_width = max(p0.page_width, p1.page_width)
+		res.items = list(p0.items)
+		res.left_distrib = dict(p0.left_distrib)
+		res.footnotes_idx = list(p0.footnotes_idx)
+		
+		# copy tables, but not their items
+		p0_memo = {id(p0.items): res.items}
+		for it in p0.items:
+			p0_memo[id(it)] = it
+		res.tables = [copy.deepcopy(t, p0_memo) for t in p0.tables]
+		
+		p1_min_line_num = get_max_line_num(p0) + 1
+		p1_min_id = get_max_id(p0) + 1
+		p0_num_items = len(p0.items)
+		
+		p1_items = []
+		p1_memo = {id(p1.items): p1_items}
+		for it in p1.items:
+			new_it = copy.copy(it)
+			new_it.line_num += p1_min_line_num
+			new_it.tot_line_num = res.page_num * 10000 + new_it.line_num
+			new_it.pos_y += p1.page_height
+			new_it.this_id = transform_id(it.this_id, p1_min_id)
+			new_it.next_id = transform_id(it.next_id, p1_min_id)
+			new_it.prev_id = transform_id(it.prev_id, p1_min_id)
+			new_it.left_id = transform_id(it.left_id, p1_min_id)
+			new_it.right_id = transform_id(it.right_id, p1_min_id)
+			new_it.merged_list = [transform_id(id, p1_min_id) for id in it.merged_list]
+			new_it.words = []
 			for w in it.words:
-				w.item_id = transform_id(w.item_id, p1c_min_id)
-				w.rect.y0 += p0c.page_height
-				w.rect.y1 += p0c.page_height
-			#print(it)
-			p0c.items.append(it)
+				new_w = copy.copy(w)
+				new_w.rect = copy.copy(w.rect)
+				new_w.item_id = transform_id(w.item_id, p1_min_id)
+				new_w.rect.y0 += res.page_height
+				new_w.rect.y1 += res.page_height
+				new_it.words.append(new_w)
+			p1_memo[id(it)] = new_it
+			p1_items.append(new_it)
+			res.items.append(new_it)
 		
-		for ky in p1c.left_distrib:
-			p0c.left_distrib[ky] = p0c.left_distrib.get(ky, 0) + p1c.left_distrib[ky]
+		for ky in p1.left_distrib:
+			res.left_distrib[ky] = res.left_distrib.get(ky, 0) + p1.left_distrib[ky]
 		
-		for t in p1c.tables:
-			t.recalc_geometry()
+		for t in p1.tables:
+			new_t = copy.deepcopy(t, p1_memo)
+			new_t.recalc_geometry()
+			res.tables.append(new_t)
 		
-		p0c.tables.extend(p1c.tables)
-		p0c.find_paragraphs()
+		res.find_paragraphs()
 		
-		for idx in p1c.footnotes_idx:
-			p0c.footnotes_idx.append(idx + p0c_num_items)
+		for idx in p1.footnotes_idx:
+			res.footnotes_idx.append(idx + p0_num_items)
 		
-		p0c.generate_clusters()
+		# clusters are generated on first access
 		
-		return p0c
+		return res
 		
 		
 	
@@ -328,14 +356,16 @@ class HTMLPage:
 				
 			
 			
-			print_verbose(3, '---> Split item '+str(self.items[ij[0]]) + ' at word ' + \
+			print_verbose(3, lambda: '---> Split item '+str(self.items[ij[0]]) + ' at word ' + \
 			   str(ij[1]) + '(x1='+str(self.items[ij[0]].words[ij[1]-1].rect.x1)+'<-> x0='+str(self.items[ij[0]].words[ij[1]].rect.x0)+ \
 			   ' , space_width= '+str(self.items[item_id].space_width))
 			new_item = self.items[ij[0]].split(ij[1], next_id)
 			self.items.append(new_item)
-			print_verbose(3, '------> Result = "'+str(self.items[ij[0]].txt) + '" + "' + str(new_item.txt) + '"')
+			print_verbose(3, lambda: '------> Result = "'+str(self.items[ij[0]].txt) + '" + "' + str(new_item.txt) + '"')
 
 			next_id += 1
+			
+		self.items_changed()
 				
 		
 		
@@ -357,7 +387,7 @@ class HTMLPage:
 		for it in self.items:
 			cur_x = it.pos_x
 			self.left_distrib[cur_x] = self.left_distrib.get(cur_x, 0) + 1
-		print_verbose(5, 'Left distrib: ' + str(self.left_distrib))
+		print_verbose(5, lambda: 'Left distrib: ' + str(self.left_distrib))
 		
 	def find_paragraphs(self):
 		self.paragraphs = []
@@ -375,16 +405,47 @@ class HTMLPage:
 		self.paragraphs.sort()
 		
 	
+	def items_changed(self):
+		# must be called, whenever items of this page have been moved, resized, merged, split or replaced, or their texts
+		# or left/right neighbours have been changed. Then the indices are rebuilt on next use.
+		# (Replacing the list of items or appending items is detected automatically.)
+		self.drop_item_grid()
+		self.drop_line_index()
+		
+	def get_item_grid(self):
+		# (re)build the grid, if it has been dropped (see items_changed) or items have been added since the last call
+		if(self.item_grid is None or not self.item_grid.is_valid_for(self.items)):
+			self.item_grid = ItemGrid(self.items)
+		elif(config.global_verify_indices):
+			assert self.item_grid.is_equal_to(ItemGrid(self.items)), 'Stale ItemGrid on page ' + str(self.page_num) + ' (items_changed has not been called)'
+		return self.item_grid
+		
+	def drop_item_grid(self):
+		if('item_grid' in self.__dict__):
+			del self.item_grid
+			
+	def get_line_index(self):
+		# (re)build the index, if it has been dropped (see items_changed) or items have been added since the last call
+		if(self.line_index is None or not self.line_index.is_valid_for(self.items)):
+			self.line_index = LineIndex(self)
+		elif(config.global_verify_indices):
+			assert self.line_index.is_equal_to(LineIndex(self)), 'Stale LineIndex on page ' + str(self.page_num) + ' (items_changed has not been called)'
+		return self.line_index
+		
+	def drop_line_index(self):
+		if('line_index' in self.__dict__):
+			del self.line_index
+		
 	def find_items_within_rect_all_categories(self, rect): # returns list of indices
 		res = []
-		for i in range(len(self.items)):
+		for i in self.get_item_grid().find_candidates(rect):
 			if(Rect.calc_intersection_area(self.items[i].get_rect(), rect) > self.items[i].get_rect().get_area() * 0.3): #0.5?
 				res.append(i)
 		return res
 		
 	def find_items_within_rect(self, rect, categories): # returns list of indices
 		res = []
-		for i in range(len(self.items)):
+		for i in self.get_item_grid().find_candidates(rect):
 			if(self.items[i].category in categories):
 				if(Rect.calc_intersection_area(self.items[i].get_rect(), rect) > self.items[i].get_rect().get_area() * 0.3): #0.5?
 					res.append(i)
@@ -426,6 +487,17 @@ class HTMLPage:
 		if(this_align == ALIGN_CENTER):
 			pos_x += item.width*0.5
 
+		if(self.spatial_index is not None and not do_print):
+			for i, cur_x in self.spatial_index.find_vertical_aligned(pos_x, alignment, threshold_px):
+				cur_y = self.items[i].pos_y
+				delta = abs(cur_x-pos_x)
+				cur_score = ((threshold_px - delta)/self.page_width) * ( ((1.0 - abs(cur_y - pos_y) / self.page_height)) ** 5.0) 
+				if(cur_score<0.003):
+					cur_score=0
+				print_verbose(9, lambda: "VALIGN->"+str(self.items[i])+" has SCORE: "+str(cur_score))
+				score += cur_score
+				res.append(i)
+			return res, score
 			
 		for i in range(len(self.items)):
 			if(alignment != ALIGN_DEFAULT):
@@ -443,12 +515,12 @@ class HTMLPage:
 				
 			delta = abs(cur_x-pos_x)
 			if(do_print):
-				print_verbose(7, '---> delta for '+str(self.items[i])+' to '+str(pos_x)+' is '+str(delta))
+				print_verbose(7, lambda: '---> delta for '+str(self.items[i])+' to '+str(pos_x)+' is '+str(delta))
 			if(delta <= threshold_px):
 				cur_score = ((threshold_px - delta)/self.page_width) * ( ((1.0 - abs(cur_y - pos_y) / self.page_height)) ** 5.0) 
 				if(cur_score<0.003):
 					cur_score=0
-				print_verbose(9, "VALIGN->"+str(self.items[i])+" has SCORE: "+str(cur_score))
+				print_verbose(9, lambda: "VALIGN->"+str(self.items[i])+" has SCORE: "+str(cur_score))
 				score += cur_score
 				res.append(i)
 			
@@ -464,6 +536,9 @@ class HTMLPage:
 		y0 = item.pos_y
 		y1 = item.pos_y + item.height 
 		
+		if(self.spatial_index is not None):
+			return self.spatial_index.find_horizontal_aligned(y0, y1, self.items)
+		
 		for i in range(len(self.items)):
 			it = self.items[i]
 			if(it.pos_y < y1 and it.pos_y + it.height > y0):
@@ -472,22 +547,66 @@ class HTMLPage:
 		return res
 		
 		
+	def build_spatial_index(self):
+		# Speeds up find_vertical_aligned_items and find_horizontal_aligned_items.
+		# Only valid as long as no item is moved, resized, merged or split => call drop_spatial_index afterwards.
+		self.spatial_index = SpatialIndex(self.items)
+		
+	def drop_spatial_index(self):
+		if('spatial_index' in self.__dict__):
+			del self.spatial_index # falls back to the class attribute (None), so that it is never exported to JSON
+		
 	def clear_all_temp_assignments(self):
 		for it in self.items:
 			it.temp_assignment = 0
 		
+	def get_item_geometry(self):
+		# returns pos_x, pos_y, width, height of all items as numpy arrays
+		pos_x = numpy.array([it.pos_x for it in self.items], dtype=numpy.float64)
+		pos_y = numpy.array([it.pos_y for it in self.items], dtype=numpy.float64)
+		width = numpy.array([it.width for it in self.items], dtype=numpy.float64)
+		height = numpy.array([it.height for it in self.items], dtype=numpy.float64)
+		return pos_x, pos_y, width, height
+		
+	def calc_all_alignment_scores(self, threshold, chunk_size=ALIGNMENT_SCORE_CHUNK_SIZE):
+		# Vectorized version of find_vertical_aligned_items for all items at once.
+		# Returns an array of shape (num_items, 3) with the scores for ALIGN_LEFT, ALIGN_RIGHT and ALIGN_CENTER.
+		# The score of an item is the sum over all items, so the pairwise scores are calculated for chunk_size
+		# items at a time (memory: num_items * chunk_size floats).
+		num_items = len(self.items)
+		res = numpy.zeros((num_items, 3))
+		if(num_items == 0):
+			return res
+			
+		pos_x, pos_y, width, height = self.get_item_geometry()
+		threshold_px = threshold * self.page_width
+		
+		all_x = (pos_x, pos_x + width, pos_x + width*0.5) # left, right, center
+		
+		for c0 in range(0, num_items, chunk_size):
+			c1 = min(c0 + chunk_size, num_items)
+			# rows: all items, columns: current chunk
+			dy = numpy.abs(pos_y[:, None] - pos_y[None, c0:c1])
+			y_factor = numpy.float_power(1.0 - dy / self.page_height, 5.0) # same results as python's ** (unlike numpy.power, which may use SIMD)
+			for k in range(3):
+				delta = numpy.abs(all_x[k][:, None] - all_x[k][None, c0:c1])
+				cur_score = ((threshold_px - delta)/self.page_width) * y_factor
+				cur_score[cur_score<0.003] = 0
+				cur_score[delta > threshold_px] = 0
+				# cumsum adds up the rows one after another, exactly like the loop in find_vertical_aligned_items
+				res[c0:c1, k] = numpy.cumsum(cur_score, axis=0)[-1]
+				
+		return res
+		
 	def guess_all_alignments(self):
-		for it in self.items:
-			dummy, score_left = self.find_vertical_aligned_items(it, ALIGN_LEFT, DEFAULT_VTHRESHOLD)
-			dummy, score_right = self.find_vertical_aligned_items(it, ALIGN_RIGHT, DEFAULT_VTHRESHOLD)
-			dummy, score_center = self.find_vertical_aligned_items(it, ALIGN_CENTER, DEFAULT_VTHRESHOLD) # New-27.06.2022
-			#it.alignment = ALIGN_LEFT if score_left >= score_right else ALIGN_RIGHT
-			if(score_left >= score_right and score_left >= score_center):
-				it.alignment = ALIGN_LEFT
-			elif(score_right >= score_left and score_right >= score_center):
-				it.alignment = ALIGN_RIGHT
-			else:
-				it.alignment = ALIGN_CENTER
+		scores = self.calc_all_alignment_scores(DEFAULT_VTHRESHOLD)
+		score_left = scores[:, 0]
+		score_right = scores[:, 1]
+		score_center = scores[:, 2]
+		alignments = numpy.where((score_left >= score_right) & (score_left >= score_center), ALIGN_LEFT,
+					 numpy.where((score_right >= score_left) & (score_right >= score_center), ALIGN_RIGHT, ALIGN_CENTER))
+		for it, align in zip(self.items, alignments.tolist()):
+			it.alignment = align
 			
 			
 	def find_next_nonclassified_item(self):
@@ -636,7 +755,7 @@ class HTMLPage:
 						if(self.items[cur_item_id].height > self.items[next_item_id].height):
 							self.items[cur_item_id].category = CAT_HEADLINE
 						else:
-							print_verbose(10, "---->>> found CAT_OTHER_TEXT/1 for item " + str(cur_item_id))
+							print_verbose(10, lambda: "---->>> found CAT_OTHER_TEXT/1 for item " + str(cur_item_id))
 							self.items[cur_item_id].category = CAT_OTHER_TEXT
 				
 				# single (head-)lines at the beginning
@@ -648,7 +767,7 @@ class HTMLPage:
 						if(self.items[cur_item_id].height > self.items[next_item_id].height):
 							self.items[cur_item_id].category = CAT_HEADLINE
 						else:
-							print_verbose(10, "---->>> found CAT_OTHER_TEXT/2 for item " + str(cur_item_id))
+							print_verbose(10, lambda: "---->>> found CAT_OTHER_TEXT/2 for item " + str(cur_item_id))
 							self.items[cur_item_id].category = CAT_OTHER_TEXT
 				
 		
@@ -664,7 +783,7 @@ class HTMLPage:
 				if(not Format_Analyzer.looks_words(self.items[cur_item_id].txt)):
 					continue # only text
 			
-				print_verbose(9, "--> mark_other_text_components \ multi-rows headline: "+str(self.items[cur_item_id]))
+				print_verbose(9, lambda: "--> mark_other_text_components \ multi-rows headline: "+str(self.items[cur_item_id]))
 				next_item_id, next_y = cur_lines[i+1]	
 
 				if(self.items[next_item_id].category != CAT_RUNNING_TEXT):
@@ -677,7 +796,7 @@ class HTMLPage:
 					
 				y_threshold = 2*max(self.items[cur_item_id].height, self.items[next_item_id].height)
 				
-				print_verbose(9, "----> cur_y, next_y , y_threshold = " + str(cur_y) + ","+str(next_y)+","+str(y_threshold))
+				print_verbose(9, lambda: "----> cur_y, next_y , y_threshold = " + str(cur_y) + ","+str(next_y)+","+str(y_threshold))
 				
 				
 				if(abs(cur_y - next_y) < y_threshold and self.items[cur_item_id].height > self.items[next_item_id].height):
@@ -712,11 +831,11 @@ class HTMLPage:
 					pgnum_id = i
 					
 		if(pgnum_id != -1):
-			print_verbose(10, "---->>> found CAT_FOOTER/3 for item " + str(pgnum_id))
+			print_verbose(10, lambda: "---->>> found CAT_FOOTER/3 for item " + str(pgnum_id))
 			self.items[pgnum_id].category = CAT_FOOTER
 			for it in self.items:
 				if(it.pos_y == pgnum_pos_y):
-					print_verbose(10, "---->>> found CAT_FOOTER/4 for item " + str(it.this_id))
+					print_verbose(10, lambda: "---->>> found CAT_FOOTER/4 for item " + str(it.this_id))
 					it.category = CAT_FOOTER #footer
 		
 							
@@ -737,7 +856,7 @@ class HTMLPage:
 					min_dist=cur_dist
 					
 			if(min_dist > iso_threshold):
-				print_verbose(10, "---->>> found CAT_OTHER_TEXT/5 for item " + str(it.this_id))
+				print_verbose(10, lambda: "---->>> found CAT_OTHER_TEXT/5 for item " + str(it.this_id))
 				it.category = CAT_OTHER_TEXT
 					
 	
@@ -848,7 +967,7 @@ class HTMLPage:
 
 	
 	def discover_table_column(self, initial_item):
-		print_verbose(7, 'discover_table_column for item : ' + str(initial_item))
+		print_verbose(7, lambda: 'discover_table_column for item : ' + str(initial_item))
 
 		vitems, dummy = self.find_vertical_aligned_items(initial_item, ALIGN_DEFAULT, DEFAULT_VTHRESHOLD)
 		print_verbose(9, '---> 1. V-Items ')
@@ -870,7 +989,7 @@ class HTMLPage:
 		if(initial_item.this_id not in vitems):
 			vitems.append(initial_item.this_id)
 		
-		print_verbose(7, '---> top: ' + str(top) + ', and bottom:' + str(bottom))
+		print_verbose(7, lambda: '---> top: ' + str(top) + ', and bottom:' + str(bottom))
 		print_verbose(7, '---> V-Items ')
 		print_subset(7, self.items, vitems)
 		
@@ -878,7 +997,7 @@ class HTMLPage:
 		if(len(vitems) > 0):
 			sub_tab.init_by_cols(vitems, self.items)
 			sub_tab.set_temp_assignment()
-			print_verbose(5, 'Sub Table for current column at: ' +str(initial_item) + " = " +str(sub_tab))
+			print_verbose(5, lambda: 'Sub Table for current column at: ' +str(initial_item) + " = " +str(sub_tab))
 			
 			
 		return sub_tab
@@ -888,14 +1007,14 @@ class HTMLPage:
 		hitems = self.find_horizontal_aligned_items(initial_item)
 		hitems = self.sort_out_non_connected_row_items(hitems, initial_item)
 
-		print_verbose(7, "discover row at item: "+ str(initial_item))
+		print_verbose(7, lambda: "discover row at item: "+ str(initial_item))
 		print_subset(7, self.items, hitems)
 		
 		return hitems
 	
 	
 	def discover_subtables_recursively(self, initial_item, step): #step=0 => discover col; step=1 => discover row. each subtable is a column
-		print_verbose(5, "discover subtable rec, at item : " +str(initial_item) + " and step = " +str(step))
+		print_verbose(5, lambda: "discover subtable rec, at item : " +str(initial_item) + " and step = " +str(step))
 		
 		if(initial_item.has_category() or (initial_item.temp_assignment != 0 and step == 0)):
 			print_verbose(5, "---> recusion end")
@@ -916,7 +1035,7 @@ class HTMLPage:
 		elif(step==1): # row
 			res = []
 			hitems = self.discover_table_row(initial_item)
-			print_verbose(5, "---> found hitems = "+str(hitems))
+			print_verbose(5, lambda: "---> found hitems = "+str(hitems))
 			for i in hitems:
 				res.extend(self.discover_subtables_recursively(self.items[i], 0))
 			
@@ -926,7 +1045,7 @@ class HTMLPage:
 	
 		
 	def discover_table(self, initial_item):
-		print_verbose(2, "DISCOVER NEW TABLE AT " + str(initial_item))
+		print_verbose(2, lambda: "DISCOVER NEW TABLE AT " + str(initial_item))
 		
 		done = False
 		
@@ -936,29 +1055,32 @@ class HTMLPage:
 			initial_item.temp_assignment = 0
 			self.clear_all_temp_assignments()
 			
+			self.build_spatial_index() # items are not modified until cleanup_table
 			sub_tables = self.discover_subtables_recursively(initial_item, 0)
+			self.drop_spatial_index()
 			if(len(sub_tables) == 0):
 				return None
 				
 			table = sub_tables[0]
-			print_verbose(2, "Starting with table: "+str(sub_tables[0]))
+			print_verbose(2, lambda: "Starting with table: "+str(sub_tables[0]))
 			
 			for i in range(1,len(sub_tables)):
-				print_verbose(5, "Merging table: "+str(sub_tables[i]))
+				print_verbose(5, lambda: "Merging table: "+str(sub_tables[i]))
 				table = HTMLTable.merge(table, sub_tables[i], self.page_width)
-				print_verbose(5, "Next table:" + str(table))
+				print_verbose(5, lambda: "Next table:" + str(table))
 			
 			# TODO!!!
 			#table.recalc_geometry()
 			#table.unfold_patched_numbers()
 			table.cleanup_table(self.page_width, self.paragraphs)
+			self.items_changed() # items have been merged, split, moved or restored by HTMLTable.merge and cleanup_table
 			
 			if(table.is_good_table()):
 				# did we miss any items?
 				missing_items = self.find_items_within_rect(table.table_rect, [CAT_HEADLINE, CAT_OTHER_TEXT, CAT_RUNNING_TEXT, CAT_FOOTER])
 				if(len(missing_items)>0):
 					#yes => reclassify
-					print_verbose(2, "Found missing items : " +str(missing_items))
+					print_verbose(2, lambda: "Found missing items : " +str(missing_items))
 					for i in missing_items:
 						self.items[i].category = CAT_DEFAULT
 					done = False
@@ -975,7 +1097,7 @@ class HTMLPage:
 				break # we are done
 				
 			table = self.discover_table(next)
-			print_verbose(2, "FOUND TABLE: "+str(table))
+			print_verbose(2, lambda: "FOUND TABLE: "+str(table))
 			if(config.global_force_special_items_into_table):
 				table.force_special_items_into_table()
 				
@@ -1003,6 +1125,7 @@ class HTMLPage:
 			for table in self.tables:
 				table.merge_non_overlapping_rows()		
 				#pass
+			self.items_changed()
 	
 	def mark_all_footnotes(self):
 		
@@ -1017,7 +1140,7 @@ class HTMLPage:
 			if(self.items[idx].left_id != -1):
 				continue # skip this
 			txt = self.get_txt_unsplit(idx)
-			print_verbose(7, "Analyzing==>" + txt+ ", cat=" +str(self.items[idx].category))
+			print_verbose(7, lambda: "Analyzing==>" + txt+ ", cat=" +str(self.items[idx].category))
 			if(self.items[idx].category != CAT_OTHER_TEXT):
 				continue # skip this also
 			if(Format_Analyzer.looks_footnote(txt)):
@@ -1063,7 +1186,7 @@ class HTMLPage:
 		
 		# text
 		if(RENDERING_USE_CLUSTER_COLORS):
-			self.clusters_text.generate_rendering_colors_rec()
+			self.get_clusters(CLUSTER_DISTANCE_MODE_RAW_TEXT).generate_rendering_colors_rec()
 			
 		for it in self.items:
 			font_color = (0,0,255,255) #default
@@ -1107,7 +1230,7 @@ class HTMLPage:
 			if(RENDERING_USE_CLUSTER_COLORS):
 				font_color = it.rendering_color
 			
-			span_font = ImageFont.truetype(it.font_file if config.global_rendering_font_override == "" else config.global_rendering_font_override, it.font_size)
+			span_font = get_font(it.font_file if config.global_rendering_font_override == "" else config.global_rendering_font_override, it.font_size)
 			context.text((it.pos_x,it.pos_y), it.txt, font=span_font, fill=font_color)
 			
 			#for w in it.words:
@@ -1134,6 +1257,25 @@ class HTMLPage:
 		self.clusters = HTMLCluster.generate_clusters(self.items, CLUSTER_DISTANCE_MODE_EUCLIDIAN)
 		self.clusters_text = HTMLCluster.generate_clusters(self.items, CLUSTER_DISTANCE_MODE_RAW_TEXT)
 		
+	def invalidate_clusters(self):
+		self.clusters = []
+		self.clusters_text = []
+		
+	def get_clusters(self, mode):
+		# clusters are expensive, and only needed by some analyzers => they are generated on first access
+		if(mode == CLUSTER_DISTANCE_MODE_EUCLIDIAN):
+			if(self.clusters == []):
+				self.clusters = HTMLCluster.generate_clusters(self.items, CLUSTER_DISTANCE_MODE_EUCLIDIAN)
+			return self.clusters
+		if(mode == CLUSTER_DISTANCE_MODE_RAW_TEXT):
+			if(self.clusters_text == []):
+				self.clusters_text = HTMLCluster.generate_clusters(self.items, CLUSTER_DISTANCE_MODE_RAW_TEXT)
+			return self.clusters_text
+		raise ValueError('Invalid distance mode')
+		
+	def get_generated_clusters(self):
+		return [c for c in (self.clusters, self.clusters_text) if isinstance(c, HTMLCluster)]
+		
 				
 	# =====================================================================================================================
 	# Other procedures
@@ -1179,7 +1321,7 @@ class HTMLPage:
 				new_items.append(it)
 				cur_id += 1
 			else:
-				print_verbose(6,"Removing flyspeck item : " + str(it))
+				print_verbose(6,lambda: "Removing flyspeck item : " + str(it))
 			
 				
 		self.items = new_items
@@ -1196,7 +1338,7 @@ class HTMLPage:
 					if(Rect.calc_intersection_area(self.items[i].get_rect(), self.items[j].get_rect()) > 0.):
 						#overlapping items => remove it
 						keep[j] = False
-						print_verbose(5, "Removing item : " + str(self.items[j]) + ", because overlap with : " + str(self.items[i]))
+						print_verbose(5, lambda: "Removing item : " + str(self.items[j]) + ", because overlap with : " + str(self.items[i]))
 		
 		new_items = []
 		cur_id = 0
@@ -1236,7 +1378,7 @@ class HTMLPage:
 		self.find_paragraphs()
 		self.mark_all_tables()
 		self.mark_all_footnotes()
-		self.generate_clusters()
+		self.invalidate_clusters() # clusters will be generated on first access
 		
 
 		#tmp = self.discover_table_column(self.items[self.find_idx_of_item_by_txt(r'Group statement of changes in equity a')])
@@ -1275,13 +1417,14 @@ class HTMLPage:
 	
 	
 	def to_json(self):
+		self.drop_item_grid()
+		self.drop_line_index()
+		
 		for t in self.tables:
 			t.items = None
 		
-		if(self.clusters is not None):
-			self.clusters.cleanup_for_export()
-		if(self.clusters_text is not None):
-			self.clusters_text.cleanup_for_export()
+		for c in self.get_generated_clusters():
+			c.cleanup_for_export()
 		
 		#data = json.dumps(self, default=lambda o: o.__dict__, sort_keys=True, indent=4)
 		jsonpickle.set_preferred_backend('json')
@@ -1291,45 +1434,50 @@ class HTMLPage:
 		for t in self.tables:
 			t.items = self.items
 
-		if(self.clusters is not None):
-			self.clusters.regenerate_not_exported(self.items)
-		if(self.clusters_text is not None):
-			self.clusters_text.regenerate_not_exported(self.items)
+		for c in self.get_generated_clusters():
+			c.regenerate_not_exported(self.items)
 			
 			
 		return data
 		
 	def save_to_file(self, json_file):
-		data = self.to_json()
+		data = PageSerializer.dumps(self) # legacy format: self.to_json()
 		f = open(json_file, "w")
 		f.write(data)
 		f.close()
 		
 	@staticmethod
-	def load_from_json(data):
+	def load_from_json(data): # legacy format (jsonpickle)
 		obj = jsonpickle.decode(data)
-
-		for t in obj.tables:
-			t.items = obj.items
+		obj.restore_not_exported()
+		return obj
+		
+	def restore_not_exported(self):
+		self.left_distrib = PageSerializer.normalize_left_distrib(self.left_distrib)
+		
+		for t in self.tables:
+			t.items = self.items
 			
-		# regenerate clustes, if they are not available
-		if(obj.clusters is None or obj.clusters_text is None):
-			obj.generate_clusters()
+		# regenerate clustes, if they are not available (but only on first access, see get_clusters)
+		if(self.clusters is None or self.clusters_text is None):
+			self.invalidate_clusters()
 		else:
 			#just fill up clusters with missing values
-			obj.clusters.regenerate_not_exported(obj.items)
-			obj.clusters_text.regenerate_not_exported(obj.items)
-			
+			for c in self.get_generated_clusters():
+				c.regenerate_not_exported(self.items)
 			
 			
-		return obj
 		
 	@staticmethod
 	def load_from_file(json_file):
 		f = open(json_file, "r")
 		data = f.read()
 		f.close()
-		return HTMLPage.load_from_json(data)
+		if(not PageSerializer.is_page_data(data)):
+			return HTMLPage.load_from_json(data) # legacy jsonpickle file
+		obj = PageSerializer.dict_to_page(json.loads(data), HTMLPage())
+		obj.restore_not_exported()
+		return obj
 		
 	
 	
@@ -1446,10 +1594,10 @@ class HTMLPage:
 		#@font-face { font-family: ff24; src: url("24.ttf"); }
 		
 		
-		print_verbose(2, "PARSING HTML-FILE " + htmlfile)
+		print_verbose(2, lambda: "PARSING HTML-FILE " + htmlfile)
 		
 		page_num = int(pattern_pgnum.match(htmlfile).groups()[0])
-		print_verbose(4, "---> Page: " + str(page_num))
+		print_verbose(4, lambda: "---> Page: " + str(page_num))
 		bold_styles = []
 		font_dict = {}
 		font_url_dict = {}
@@ -1463,7 +1611,7 @@ class HTMLPage:
 		
 		for i in range(0, len(html_file)):
 			h = html_file[i].strip()
-			print_verbose(7, '---->' + h)
+			print_verbose(7, lambda: '---->' + h)
 			if(pattern_background.match(h)):
 				bg = pattern_background.match(h).groups()
 				res.page_num = int(bg[2+2])
@@ -1472,19 +1620,19 @@ class HTMLPage:
 			if(pattern_font.match(h)):
 				f = pattern_font.match(h).groups()
 				font_dict[int(f[0])] = int(f[1])
-				print_verbose(7, 'Font-> f='+str(f))
+				print_verbose(7, lambda: 'Font-> f='+str(f))
 			if(pattern_font_url.match(h)):
 				fu = pattern_font_url.match(h).groups()
 				font_url_dict[int(fu[0])] = fu[1]
 			if(pattern_bold.match(h)):
 				b = pattern_bold.match(h).groups()
 				bold_styles.append(b[0])
-				print_verbose(7, 'Bold->' + str(b))
+				print_verbose(7, lambda: 'Bold->' + str(b))
 			if(pattern_div.match(h)):
 				g = pattern_div.match(h).groups()
-				print_verbose(7, '-------->' + str(g))
+				print_verbose(7, lambda: '-------->' + str(g))
 				spans = g[2+1].split('</span>')
-				print_verbose(7, '-------->' + str(spans))
+				print_verbose(7, lambda: '-------->' + str(spans))
 				item = None
 				item = HTMLItem()
 				item.line_num = i
@@ -1503,7 +1651,7 @@ class HTMLPage:
 				for s in spans:
 					if(pattern_span.match(s)):
 						gs = pattern_span.match(s).groups()
-						print_verbose(7, '---------->' + str(gs))
+						print_verbose(7, lambda: '---------->' + str(gs))
 						if(gs[0] in bold_styles):
 							item.is_bold = True
 						
@@ -1512,18 +1660,18 @@ class HTMLPage:
 						
 						span_font = None
 						if(int(gs[0]) in font_dict and font_dict[int(gs[0])] in font_url_dict):
-							span_font = ImageFont.truetype(fonts_dir + '/' + font_url_dict[font_dict[int(gs[0])]] , int(gs[1]))
+							span_font = get_font(fonts_dir + '/' + font_url_dict[font_dict[int(gs[0])]] , int(gs[1]))
 							item.font_file = fonts_dir + '/' + font_url_dict[font_dict[int(gs[0])]]
 						else:
-							span_font = ImageFont.truetype(config.global_approx_font_name , int(gs[1]))
+							span_font = get_font(config.global_approx_font_name , int(gs[1]))
 							item.font_file = config.global_approx_font_name
 						
 						try:
-							space_width = max(space_width, get_text_width(' ', span_font), get_text_width('x', span_font))
+							space_width = max(space_width, get_cached_text_width(' ', item.font_file, int(gs[1])), get_cached_text_width('x', item.font_file, int(gs[1])))
 						except:
-							span_font = ImageFont.truetype(config.global_approx_font_name , int(gs[1]))
+							span_font = get_font(config.global_approx_font_name , int(gs[1]))
 							item.font_file = config.global_approx_font_name							
-							space_width = max(space_width, get_text_width(' ', span_font), get_text_width('x', span_font))
+							space_width = max(space_width, get_cached_text_width(' ', item.font_file, int(gs[1])), get_cached_text_width('x', item.font_file, int(gs[1])))
 						
 						#text_width = get_text_width(gs[6], int(gs[1]), span_font)
 						#if(text_width == 0):
@@ -1549,7 +1697,7 @@ class HTMLPage:
 								if(word.rect.x0 < word.rect.x1 and word.rect.y0 < word.rect.y1): # otherwise, bad word!
 									item.words.append(word)
 				
-				item.space_width = max(space_width, get_text_width(' ',ImageFont.truetype(config.global_approx_font_name, item.font_size)))
+				item.space_width = max(space_width, get_cached_text_width(' ', config.global_approx_font_name, item.font_size))
 				#print(item.space_width)
 				#item.space_width = get_text_width(' ',ImageFont.truetype(config.global_approx_font_name, item.font_size))
 				item.fix_overlapping_words()
@@ -11,6 +11,7 @@
 from globals import *
 from HTMLItem import *
 from ConsoleTable import *
+import bisect
 
 
 
@@ -355,8 +356,8 @@ class HTMLTable:
 				x0_1 = self.get_item(r1, c1).pos_x
 				x1_1 = self.get_item(r1, c1).pos_x+self.get_item(r1, c1).width
 				if(min(x1_0, x1_1) - max(x0_0, x0_1) >= 0):
-					print_verbose(7, "-----> Can't merge rows "+str(r0)+" and next one, because c0="+str(c0)+", c1="+str(c1)+" would overlap")
-					print_verbose(7, "These are the items "+str(self.get_item(r0,c0))+", and "+str(self.get_item(r1,c1)))
+					print_verbose(7, lambda: "-----> Can't merge rows "+str(r0)+" and next one, because c0="+str(c0)+", c1="+str(c1)+" would overlap")
+					print_verbose(7, lambda: "These are the items "+str(self.get_item(r0,c0))+", and "+str(self.get_item(r1,c1)))
 					return False # two columns would overlaping in the same row
 				if(x1_0 < x1_1):
 					c0 += 1
@@ -367,7 +368,7 @@ class HTMLTable:
 			else:
 				c0 += 1
 				
-		print_verbose(7, "----> Merge r0="+str(r0)+" where y0_max,y1_min = "+str(y0_max)+","+str(y1_min))
+		print_verbose(7, lambda: "----> Merge r0="+str(r0)+" where y0_max,y1_min = "+str(y0_max)+","+str(y1_min))
 		return True
 			
 			
@@ -455,13 +456,13 @@ class HTMLTable:
 			#rows
 			for i in range(self.num_rows-1, -1, -1):
 				if(self.is_empty_row(i)):
-					print_verbose(7, "Delete empty row : "+str(i))
+					print_verbose(7, lambda: "Delete empty row : "+str(i))
 					has_changed = True
 					self.delete_rows(i, i+1, False)
 			#cols
 			for j in range(self.num_cols-1, -1, -1):
 				if(self.is_empty_col(j)):
-					print_verbose(7, "Delete empty column : "+str(j))
+					print_verbose(7, lambda: "Delete empty column : "+str(j))
 					has_changed = True
 					self.delete_cols(j, j+1, False)
 					
@@ -502,8 +503,8 @@ class HTMLTable:
 
 		for i in range(self.num_rows-1):
 			if(not is_connected_row(i)):
-				print_verbose(5, "Throw away non-connected rows after /excl. :"+str(i))
-				print_verbose(5, "Current table: "+str(self))
+				print_verbose(5, lambda: "Throw away non-connected rows after /excl. :"+str(i))
+				print_verbose(5, lambda: "Current table: "+str(self))
 				self.delete_rows(i+1, self.num_rows)
 				return
 
@@ -543,7 +544,7 @@ class HTMLTable:
 				
 			if(num_rows_with_left_txt > 2 and num_numeric_rows > 2 and cur_delta_y > last_delta_y * 1.05 + 2):
 				if(cur_numeric_values == 0 and cur_header_values > 0 and cur_other_values == 0):	
-					print_verbose(5, "Throw away non-connected rows after probably new headline at row = "+str(i)+", cur/last_delta_y="+str(cur_delta_y)+"/"+str(last_delta_y))
+					print_verbose(5, lambda: "Throw away non-connected rows after probably new headline at row = "+str(i)+", cur/last_delta_y="+str(cur_delta_y)+"/"+str(last_delta_y))
 					self.delete_rows(i, self.num_rows)
 					return
 			
@@ -604,7 +605,7 @@ class HTMLTable:
 						continue
 					it_rect = it.get_rect()
 					if(Rect.calc_intersection_area(cur_rect, it_rect) > 0):
-						print_verbose(2, '----->> With ' +str(self.get_item(i, c0))+ ' the item ' +str(it) + ' overlaps')		
+						print_verbose(2, lambda: '----->> With ' +str(self.get_item(i, c0))+ ' the item ' +str(it) + ' overlaps')		
 						num_reg_text += 1
 			
 			
@@ -615,8 +616,8 @@ class HTMLTable:
 		
 		for j in range(self.num_cols-1):
 			if(not is_connected_col(j)):
-				print_verbose(5, "Throw away non-connected cols after /excl. :"+str(j))
-				print_verbose(5, "Current table: "+str(self))
+				print_verbose(5, lambda: "Throw away non-connected cols after /excl. :"+str(j))
+				print_verbose(5, lambda: "Current table: "+str(self))
 				self.delete_cols(j+1, self.num_cols)
 				return
 				
@@ -656,7 +657,7 @@ class HTMLTable:
 		
 		my_paragraphs.sort()
 		
-		print_verbose(5, "Relevant paragraphs:"+str(my_paragraphs))
+		print_verbose(5, lambda: "Relevant paragraphs:"+str(my_paragraphs))
 		
 		
 		last_para_idx = -1
@@ -673,10 +674,10 @@ class HTMLTable:
 					
 			#print(j, x0, x1, my_paragraphs)
 			cur_para_idx = find_cur_paragraph_idx(x0, x1, my_paragraphs)
-			print_verbose(7, "--> Col ="+str(j) + ", x0/x1="+str(self.cols[j].x0)+"/"+str(self.cols[j].x1)+" belong to paragraph p_idx = " + str(cur_para_idx) +  ", which is at " + str(my_paragraphs[cur_para_idx] if cur_para_idx != -1 else None) + " px")
+			print_verbose(7, lambda: "--> Col ="+str(j) + ", x0/x1="+str(self.cols[j].x0)+"/"+str(self.cols[j].x1)+" belong to paragraph p_idx = " + str(cur_para_idx) +  ", which is at " + str(my_paragraphs[cur_para_idx] if cur_para_idx != -1 else None) + " px")
 			if(j>1 and cur_para_idx != last_para_idx): #TODO 1 was 0, test is
 				# table is here probably split between two text paragraphs
-				print_verbose(5, "Throw away cols at next paragraph: col at next j="+str(j))
+				print_verbose(5, lambda: "Throw away cols at next paragraph: col at next j="+str(j))
 				self.delete_cols(j, self.num_cols)
 				return
 			last_para_idx = cur_para_idx
@@ -726,7 +727,7 @@ class HTMLTable:
 					j = cur_year_cols.c1
 				j += 1
 				
-		print_verbose(6, '----->> Found year lists at: ' +str(year_cols))
+		print_verbose(6, lambda: '----->> Found year lists at: ' +str(year_cols))
 		
 		
 		if(len(year_cols) < 2):
@@ -741,7 +742,7 @@ class HTMLTable:
 			if(min_yc == -1 or (year_cols[k].c0 < year_cols[min_yc].c0)):
 				min_yc = k
 				
-		print_verbose(6, "------->> min:" + str(year_cols[min_yc]) + " at idx " + str(min_yc))
+		print_verbose(6, lambda: "------->> min:" + str(year_cols[min_yc]) + " at idx " + str(min_yc))
 		
 		#find overlapping max
 		max_overlap_yc = -1
@@ -750,13 +751,13 @@ class HTMLTable:
 				if(max_overlap_yc == -1 or (year_cols[k].c1 > year_cols[max_overlap_yc].c1)):
 					max_overlap_yc = k
 		
-		print_verbose(6, "------->> max overlap:" + str(year_cols[max_overlap_yc]) + " at idx " + str(max_overlap_yc))
+		print_verbose(6, lambda: "------->> max overlap:" + str(year_cols[max_overlap_yc]) + " at idx " + str(max_overlap_yc))
 		
 		# are there any year cols after max overlap? if so, we can throw that part away
 		can_throw_away = False
 		for yc in year_cols:
 			if(yc.c0 > year_cols[max_overlap_yc].c1):
-				print_verbose(6, "-------->> throw away because : " + str(yc) )
+				print_verbose(6, lambda: "-------->> throw away because : " + str(yc) )
 				can_throw_away = True
 				
 		if(can_throw_away):
@@ -774,7 +775,7 @@ class HTMLTable:
 		
 		for i in range(2, self.num_cols):
 			if(are_cols_similar(0, i)):
-				print_verbose(7, "------->> cols 0 and " + str(i) + " are similar. Throw away from " + str(i))
+				print_verbose(7, lambda: "------->> cols 0 and " + str(i) + " are similar. Throw away from " + str(i))
 				self.delete_cols(i, self.num_cols)
 				return
 	
@@ -820,7 +821,7 @@ class HTMLTable:
 			
 		for j in range(self.num_cols):
 			if(col_looks_numeric(j)):
-				print_verbose(5, 'Numeric col found : '+str(j))
+				print_verbose(5, lambda: 'Numeric col found : '+str(j))
 				# find first possible special item of this col
 				r0 = self.find_first_non_empty_row_in_col(j)
 				r1 = r0
@@ -862,24 +863,32 @@ class HTMLTable:
 	def identify_overlapping_special_items(self):
 		# *  Identify all remaing items that must be set to be special items
 		#    because otherwise they would overlap with other columns.
-		# *  This is tricky, because we need to find a minimal set of such items,
-		#    which leads to an NP-complete problem.
-		# *  To solve it (fast in most cases), we employ a Backtracking algorithm
+		# *  This is tricky, because we need to find a minimal set of such items.
+		# *  The minimal number of such items can be calculated in polynomial time (see calc_optimal_sp_ix), 
+		#    but among all minimal sets, we prefer the one that is found first by a Backtracking algorithm, 
+		#    which always tries the widest items first (starting with the greedy solution).
+		# *  The Backtracking stops as soon as it has found a minimal set, skips sets of items that were already
+		#    tried in a different order, and is stopped after config.global_max_identify_complex_items_recursions 
+		#    steps (then, or if it finds no minimal set at all, the minimal set from calc_optimal_sp_ix is used)
 
 		rec_counter = 0		
-		timeout = False
-		t_start = 0
+		budget_exhausted = False
 		looks_numeric = []
 		tmp_boundaries = []
+		col_ix = [] # for each col: all ix of non-empty cells
+		visited = set() # sets of removed ix, that have already been tried
+		optimal_num = 9999999
 		
 		def calc_single_col_boundary(tmp_idx, col0):
-			cur_bdry = (9999999, -1)
-			for i in range(self.num_rows):
-				cur_ix = self.get_ix(i,col0)
+			x0 = 9999999
+			x1 = -9999999 # (items can have negative coordinates)
+			for cur_ix in col_ix[col0]:
 				cur_idx = tmp_idx[cur_ix] 
 				if(cur_idx != -1):
-					cur_bdry =( min(cur_bdry[0], self.items[cur_idx].pos_x),  max(cur_bdry[1], self.items[cur_idx].pos_x + self.items[cur_idx].width) )
-			return cur_bdry		
+					it = self.items[cur_idx]
+					x0 = min(x0, it.pos_x)
+					x1 = max(x1, it.pos_x + it.width)
+			return (x0, x1)
 		
 		def calc_col_boundaries(tmp_idx):
 			res = [(0,0)] * self.num_cols
@@ -887,97 +896,166 @@ class HTMLTable:
 			for j in range(self.num_cols):
 				res[j] = calc_single_col_boundary(tmp_idx, j)
 			return res
+			
+		def calc_overlap_x(bdry):
+			# col overlaps with next non-empty col, iff its x0 is less than this
+			return bdry[0] + (bdry[1] - bdry[0]) * 0.99 #0.99 tolerance, because sometimes font width is overestimated
 		
 		def find_first_overlapping_col(boundaries):
 			for j in range(self.num_cols-1):
-				if(boundaries[j][1] == -1):
+				if(boundaries[j][1] == -9999999):
 					continue # skip empty columns
 				
 				#find nextnon-empty col
 				k = j+1
-				while(k<self.num_cols and boundaries[k][1] == -1):
+				while(k<self.num_cols and boundaries[k][1] == -9999999):
 					k+=1
 					
 				if(k == self.num_cols):
 					return -1 # only empty columns left
 				
-				if(boundaries[j][0] + (boundaries[j][1] - boundaries[j][0]) * 0.99 > boundaries[k][0]):
-					#0.99 tolerance, because sometimes font width is overestimated
+				if(calc_overlap_x(boundaries[j]) > boundaries[k][0]):
 					return j
 			return -1
 						
 		def find_possible_overlapping_ix(c0, tmp_idx, boundaries):
 			bdry = (min(boundaries[c0][0],boundaries[c0+1][0]), max(boundaries[c0][1], boundaries[c0+1][1]))
 			res = []
-			found_something = False
 			for j in range(self.num_cols):
 				if(boundaries[j][1] > bdry[0] and boundaries[j][0] < bdry[1]):
 					#all items from this col might be overlaping
-					for i in range(self.num_rows):
-						cur_ix = self.get_ix(i,j)
+					for cur_ix in col_ix[j]:
 						if(tmp_idx[cur_ix] != -1):
 							res.append(cur_ix)
-							found_something = True
-			res = sorted(res, key=lambda ix: - self.items[tmp_idx[ix]].width) #sort descending
-			if(not found_something):
+			if(len(res) == 0):
 				raise ValueError('Some columns are overlapping, but there are no relevant items.')
+			return sorted(res, key=lambda ix: - self.items[tmp_idx[ix]].width) #sort descending
+			
+		def calc_col_choices(tmp_idx, col0):
+			# all possible boundaries (x0, x1), to which col0 can be reduced by removing items (except numbers), and
+			# the number of items that need to be removed for that. Only items outside of (x0, x1) are removed.
+			cur_ix = [ix for ix in col_ix[col0] if tmp_idx[ix] != -1]
+			pos = [(self.items[tmp_idx[ix]].pos_x, self.items[tmp_idx[ix]].pos_x + self.items[tmp_idx[ix]].width) for ix in cur_ix]
+			num_pos = [pos[k] for k in range(len(cur_ix)) if looks_numeric[cur_ix[k]]]
+			max_x0 = min([p[0] for p in num_pos]) if len(num_pos) > 0 else 9999999
+			min_x1 = max([p[1] for p in num_pos]) if len(num_pos) > 0 else -9999999 # (items can have negative coordinates)
+			by_x1 = sorted(pos, key=lambda p: p[1])
+			res = []
+			for a in sorted(set([p[0] for p in pos])):
+				if(a > max_x0):
+					break # we would have to remove a number
+				kept = [p for p in by_x1 if p[0] >= a]
+				x0 = 9999999
+				for k in range(len(kept)):
+					x0 = min(x0, kept[k][0])
+					b = kept[k][1]
+					if(b >= min_x1 and (k == len(kept) - 1 or kept[k+1][1] != b)):
+						res.append((x0, b, len(pos) - (k + 1)))
+			return res, len(num_pos) == 0, len(pos)
+			
+		def calc_optimal_sp_ix(tmp_idx):
+			# returns the minimal number of items to be removed, and a list of such items (or 9999999, None)
+			# * Only the boundaries of neighbouring non-empty cols matter, so we go from left to right and keep
+			#   for each possible overlap_x of the last non-empty col the lowest number of removed items so far
+			# * States are (overlap_x, num_removed, backtracking info). We keep only states that are not dominated 
+			#   (i.e., num_removed decreases with increasing overlap_x)
+			states = [(-9999999, 0, None)]
+			for j in range(self.num_cols):
+				choices, can_be_empty, num_items = calc_col_choices(tmp_idx, j)
+				if(num_items == 0):
+					continue
+				new_states = []
+				if(can_be_empty):
+					new_states = [(s[0], s[1] + num_items, (j, None, s)) for s in states]
+				state_x = [s[0] for s in states]
+				for x0, x1, num_removed in choices:
+					k = bisect.bisect_right(state_x, x0) - 1 # last state with overlap_x <= x0, i.e., no overlap
+					if(k >= 0):
+						new_states.append((calc_overlap_x((x0, x1)), states[k][1] + num_removed, (j, (x0, x1), states[k])))
+				new_states.sort(key=lambda s: (s[0], s[1]))
+				states = []
+				for s in new_states:
+					if(len(states) == 0 or s[1] < states[-1][1]):
+						states.append(s)
+				if(len(states) == 0):
+					return 9999999, None # not possible without removing numbers
+				
+			# backtrack, to find the removed items
+			res = []
+			s = states[-1]
+			while(s[2] is not None):
+				j, bdry, s_prev = s[2]
+				for ix in col_ix[j]:
+					if(tmp_idx[ix] != -1):
+						it = self.items[tmp_idx[ix]]
+						if(bdry is None or it.pos_x < bdry[0] or it.pos_x + it.width > bdry[1]):
+							res.append(ix)
+				s = s_prev
+			return states[-1][1], res
+			
+		def remove_ix(tmp_idx, ix):
+			col = ix % self.num_cols
+			old = (tmp_idx[ix], tmp_boundaries[col])
+			tmp_idx[ix] = -1
+			tmp_boundaries[col] = calc_single_col_boundary(tmp_idx, col)
+			return old
+			
+		def restore_ix(tmp_idx, ix, old):
+			tmp_idx[ix] = old[0]
+			tmp_boundaries[ix % self.num_cols] = old[1]
+			
+		def find_greedy_set(tmp_idx):
+			# returns list of removed ix'es (last removed first, like find_allowed_set_rec), or None if greedy fails
+			res = []
+			old = []
+			first_overlapping_col = find_first_overlapping_col(tmp_boundaries)
+			while(first_overlapping_col != -1):
+				possible_overlap_ix = [ix for ix in find_possible_overlapping_ix(first_overlapping_col, tmp_idx, tmp_boundaries) if not looks_numeric[ix]]
+				if(len(possible_overlap_ix) == 0):
+					res = None # only numbers left, which are never used as special items
+					break
+				ix = possible_overlap_ix[0]
+				old.append((ix, remove_ix(tmp_idx, ix)))
+				res.insert(0, ix)
+				first_overlapping_col = find_first_overlapping_col(tmp_boundaries)
+			for ix, old_val in reversed(old):
+				restore_ix(tmp_idx, ix, old_val)
 			return res
-							
-
 						
-		def find_allowed_set_rec(tmp_idx, num_sp_items, last_sp_ix, lowest_num_so_far):
+		def find_allowed_set_rec(tmp_idx, removed_ix, last_sp_ix, lowest_num_so_far):
 			# returns set of ix'es, such that after removing them, the rest is allowed (e.g., no overlap)
 			nonlocal rec_counter
-			nonlocal t_start
-			nonlocal timeout
-			nonlocal looks_numeric
-			nonlocal tmp_boundaries
+			nonlocal budget_exhausted
 			
 			rec_counter += 1
+			if(rec_counter > config.global_max_identify_complex_items_recursions):
+				budget_exhausted = True
 			
-			if(rec_counter % 1000 == 0):
-				t_now = time.time()
-				if(t_now - t_start > config.global_max_identify_complex_items_timeout): #max 5 sec TODO
-					timeout = True
-				
-			
-			if(num_sp_items >= lowest_num_so_far or timeout):
+			num_sp_items = len(removed_ix)
+			if(num_sp_items >= lowest_num_so_far or lowest_num_so_far <= optimal_num or budget_exhausted or removed_ix in visited):
 				print_verbose(20,"No better solution exists")
 				return 9999999, [] # we cant find a better solution
+			visited.add(removed_ix)
 			
 			first_overlapping_col = find_first_overlapping_col(tmp_boundaries)
 			if(first_overlapping_col == -1):
-				print_verbose(9,"Found solution, num_sp_items="+str(num_sp_items))
+				print_verbose(9,lambda: "Found solution, num_sp_items="+str(num_sp_items))
 				return num_sp_items, [last_sp_ix] #we found allowed set, where only num_sp_items items are excluded
 			
-
-			#raise ValueError('first_overlapping_col='+str(first_overlapping_col))
+			if(num_sp_items + 1 >= lowest_num_so_far):
+				return 9999999, [] # removing another item cant lead to a better solution
 			
 			possible_overlap_ix = find_possible_overlapping_ix(first_overlapping_col, tmp_idx, tmp_boundaries)
 			best_sp_ix = []
 			
-			#raise ValueError('possible_overlap_ix='+str(possible_overlap_ix))
-			
-			#print_verbose(15, "num_sp_item="+str(num_sp_items)+", Boundaries = "+str(tmp_boundaries)+", first_overlapping_col = " \
-			#              +str(first_overlapping_col) + " lowest_num_so_far="+str(lowest_num_so_far)) # ", possible_overlap_ix= " +str(possible_overlap_ix) +
-
 			for ix in possible_overlap_ix:
 				# try this ix
 				if(looks_numeric[ix]):
 					continue # never use numbers as special items
 				
-				#if(num_sp_items==0):
-				#	print_verbose(0, "---> Trying: " +str(self.items[tmp_idx[ix]]))
-				
-				col = ix % self.num_cols
-				
-				old = tmp_idx[ix]
-				tmp_idx[ix] = -1
-				old_bdry = tmp_boundaries[col]
-				tmp_boundaries[col] = calc_single_col_boundary(tmp_idx, col)
-				cur_lowest_num, cur_sp_ix = find_allowed_set_rec(tmp_idx, num_sp_items+1, ix, lowest_num_so_far)
-				tmp_idx[ix] = old
-				tmp_boundaries[col] = old_bdry
+				old = remove_ix(tmp_idx, ix)
+				cur_lowest_num, cur_sp_ix = find_allowed_set_rec(tmp_idx, removed_ix | frozenset([ix]), ix, lowest_num_so_far)
+				restore_ix(tmp_idx, ix, old)
 				if(cur_lowest_num < lowest_num_so_far):
 					lowest_num_so_far = cur_lowest_num
 					best_sp_ix = cur_sp_ix
@@ -995,23 +1073,30 @@ class HTMLTable:
 		
 		for cur_idx in tmp_idx:
 			looks_numeric.append(Format_Analyzer.looks_numeric(self.items[cur_idx].txt))
-			
+		
+		for j in range(self.num_cols):
+			col_ix.append([self.get_ix(i, j) for i in range(self.num_rows) if tmp_idx[self.get_ix(i, j)] != -1])
 
 		tmp_boundaries = calc_col_boundaries(tmp_idx)
 		
-		t_start = time.time()
-		lowest_num_so_far, sp_ix = find_allowed_set_rec(tmp_idx, 0, -1, 9999999)
-		t_end = time.time()
-		print_verbose(3, "---> find_allowed_set_rec completed after time="+str(t_end-t_start)+"sec,  recursions="+str(rec_counter))
-		
-		if(timeout and lowest_num_so_far == 9999999):
-			#we coulnt find a solution => give up on this table
-			print_verbose(3, "---> No solution. Give up")
-			#for k in range(len(self.idx)):
-			#	self.special_idx.append(self.idx[k])
-			#	self.idx[k] = -1
-			return
-		
+		greedy_sp_ix = find_greedy_set(tmp_idx)
+		optimal_num, optimal_sp_ix = calc_optimal_sp_ix(tmp_idx)
+		lowest_num_so_far, sp_ix = find_allowed_set_rec(tmp_idx, frozenset(), -1, 9999999 if greedy_sp_ix is None else len(greedy_sp_ix))
+		if(greedy_sp_ix is not None and lowest_num_so_far >= len(greedy_sp_ix)):
+			# no better solution than the greedy one
+			lowest_num_so_far = len(greedy_sp_ix)
+			sp_ix = greedy_sp_ix + [-1]
+		if(lowest_num_so_far > optimal_num):
+			# Backtracking was stopped, before it found a minimal solution, or it cannot find one, because it only
+			# considers the items of the first overlapping col and the col right of it (which might be empty)
+			lowest_num_so_far = optimal_num
+			sp_ix = optimal_sp_ix + [-1]
+		print_verbose(3, lambda: "---> find_allowed_set_rec completed after recursions="+str(rec_counter)+(" (budget exhausted)" if budget_exhausted else ""))
+		
+		add_metric('identify_overlapping_special_items.calls')
+		add_metric('identify_overlapping_special_items.recursions', rec_counter)
+		if(budget_exhausted):
+			add_metric('identify_overlapping_special_items.budget_exhausted')
 		
 		if(lowest_num_so_far == 9999999):
 			#print(str(self))
@@ -1063,182 +1148,6 @@ class HTMLTable:
 			
 		
 		
-	"""
-	
-	
-	
-	# old, slow code:
-
-	def identify_overlapping_special_items(self):
-		# *  Identify all remaing items that must be set to be special items
-		#    because otherwise they would overlap with other columns.
-		# *  This is tricky, because we need to find a minimal set of such items,
-		#    which leads to an NP-complete problem.
-		# *  To solve it (fast in most cases), we employ a Backtracking algorithm
-		# TODO: Tuning!! (calc boundries only once, and then recalc only affected col; precalc looks numeric)
-
-		rec_counter = 0		
-		timeout = False
-		t_start = 0
-		
-		def calc_col_boundaries(tmp_idx):
-			res = [(0,0)] * self.num_cols
-			
-			for j in range(self.num_cols):
-				cur_bdry = (9999999, -1)
-				for i in range(self.num_rows):
-					cur_ix = self.get_ix(i,j)
-					cur_idx = tmp_idx[cur_ix] 
-					if(cur_idx != -1):
-						cur_bdry =( min(cur_bdry[0], self.items[cur_idx].pos_x),  max(cur_bdry[1], self.items[cur_idx].pos_x + self.items[cur_idx].width) )
-				res[j] = cur_bdry
-			return res
-		
-		def find_first_overlapping_col(boundaries):
-			for j in range(self.num_cols-1):
-				if(boundaries[j][1] == -1):
-					continue # skip empty columns
-				
-				#find nextnon-empty col
-				k = j+1
-				while(k<self.num_cols and boundaries[k][1] == -1):
-					k+=1
-					
-				if(k == self.num_cols):
-					return -1 # only empty columns left
-				
-				if(boundaries[j][0] + (boundaries[j][1] - boundaries[j][0]) * 0.85 > boundaries[k][0]):
-					#0.85x tolerance, because sometimes font width is overestimated
-					return j
-			return -1
-						
-		def find_possible_overlapping_ix(c0, tmp_idx, boundaries):
-			bdry = (min(boundaries[c0][0],boundaries[c0+1][0]), max(boundaries[c0][1], boundaries[c0+1][1]))
-			res = []
-			found_something = False
-			for j in range(self.num_cols):
-				if(boundaries[j][1] > bdry[0] and boundaries[j][0] < bdry[1]):
-					#all items from this col might be overlaping
-					for i in range(self.num_rows):
-						cur_ix = self.get_ix(i,j)
-						if(tmp_idx[cur_ix] != -1):
-							res.append(cur_ix)
-							found_something = True
-			res = sorted(res, key=lambda ix: - self.items[tmp_idx[ix]].width) #sort descending
-			if(not found_something):
-				raise ValueError('Some columns are overlapping, but there are no relevant items.')
-			return res
-							
-
-						
-		def find_allowed_set_rec(tmp_idx, num_sp_items, sp_ix, lowest_num_so_far):
-			# returns set of ix'es, such that after removing them, the rest is allowed (e.g., no overlap)
-			nonlocal rec_counter
-			nonlocal t_start
-			nonlocal timeout
-			rec_counter += 1
-			
-			if(rec_counter % 1000 == 0):
-				t_now = time.time()
-				if(t_now - t_start > 5.0): #max 5 sec TODO
-					timeout = True
-				
-			
-			if(num_sp_items >= lowest_num_so_far or timeout):
-				print_verbose(20,"No better solution exists")
-				return 9999999, [] # we cant find a better solution
-			
-			boundaries = calc_col_boundaries(tmp_idx)
-			first_overlapping_col = find_first_overlapping_col(boundaries)
-			if(first_overlapping_col == -1):
-				print_verbose(9,"Found solution, num_sp_items="+str(num_sp_items))
-				return num_sp_items, sp_ix #we found allowed set, where only num_sp_items items are excluded
-			
-				
-			possible_overlap_ix = find_possible_overlapping_ix(first_overlapping_col, tmp_idx, boundaries)
-			best_sp_ix = None
-			
-			
-			print_verbose(15, "num_sp_item="+str(num_sp_items)+", Boundaries = "+str(boundaries)+", first_overlapping_col = " \
-			              +str(first_overlapping_col) + " lowest_num_so_far="+str(lowest_num_so_far)) # ", possible_overlap_ix= " +str(possible_overlap_ix) +
-
-			for ix in possible_overlap_ix:
-				# try this ix
-				if(Format_Analyzer.looks_numeric(self.items[tmp_idx[ix]].txt)):
-					continue # never use numbers as special items
-				print_verbose(20, "---> Trying: " +str(self.items[tmp_idx[ix]]))
-				old = tmp_idx[ix]
-				tmp_idx[ix] = -1
-				cur_lowest_num, cur_sp_ix = find_allowed_set_rec(tmp_idx, num_sp_items+1, sp_ix + [ix], lowest_num_so_far)
-				tmp_idx[ix] = old
-				if(cur_lowest_num < lowest_num_so_far):
-					lowest_num_so_far = cur_lowest_num
-					best_sp_ix = cur_sp_ix
-				if(cur_lowest_num == num_sp_items+1):
-					break # we cannot find a better solution, so escape early
-			
-			return lowest_num_so_far, best_sp_ix
-				
-				
-		if(self.num_cols == 0):
-			return # nothing to do
-			
-			
-		tmp_idx = self.idx.copy()
-		
-		#boundaries = calc_col_boundaries(tmp_idx)
-		#print(self)
-		#print(boundaries)
-		#raise ValueError('xxxx')
-		
-		t_start = time.time()
-		lowest_num_so_far, sp_ix = find_allowed_set_rec(tmp_idx, 0, [], 9999999)
-		t_end = time.time()
-		print_verbose(3, "---> find_allowed_set_rec completed after time="+str(t_end-t_start)+"sec,  recursions="+str(rec_counter))
-		
-		if(timeout and lowest_num_so_far == 9999999):
-			#we coulnt find a solution => give up on this table
-			print_verbose(3, "---> No solution. Give up")
-			#for k in range(len(self.idx)):
-			#	self.special_idx.append(self.idx[k])
-			#	self.idx[k] = -1
-			return
-		
-		
-		if(lowest_num_so_far == 9999999):
-			#print(str(self))
-			#raise ValueError('Some columns are overlapping, but after backtracking, no items were found that could be removed.')
-			return
-		
-		for ix in sp_ix:
-			self.special_idx.append(self.idx[ix])
-			self.idx[ix] = -1
-			
-			
-		self.recalc_geometry()
-		
-		
-	
-		return
-				
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	
-	"""
 
 
 				
@@ -1268,17 +1177,40 @@ class HTMLTable:
 			if(dist <= DEFAULT_SPECIAL_ITEM_MAX_DIST and self.items[i].pos_y <= self.table_rect.y1):
 				tmp.append(i)
 			else:
-				print_verbose(5, "Throw away special item: "+str(self.items[i]) + " from table with rect : " + 
+				print_verbose(5, lambda: "Throw away special item: "+str(self.items[i]) + " from table with rect : " + 
 			                     str(self.table_rect) + " and distance: " + str(dist))
 		self.special_idx = sorted(tmp, key=lambda i: self.items[i].pos_y )
 				
 		
 	
 			
+	def get_cleanup_state(self):
+		# everything that the cleanup passes read from this table. The rects (rows, cols, table_rect, ...) only depend on this
+		# and on the items. The only pass that changes items is merge_down_all_rows (merge_rows), and it always removes a row.
+		# Hence, this state only depends on the table itself, not on any changes to items outside of it.
+		return (self.num_rows, self.num_cols, tuple(self.idx), tuple(self.special_idx), tuple(self.headline_idx))
+		
+		
+	def run_cleanup_pass(self, name, cleanup_pass, clean_states):
+		# runs cleanup_pass, unless it is known to change nothing in the current state of the table.
+		# clean_states: name -> state, after which the last run of that pass didnt change anything.
+		# Passes are deterministic, and the state never returns to an earlier one (rows, cols and items are only 
+		# removed or merged), so such a pass would not change anything this time either.
+		state = self.get_cleanup_state()
+		if(clean_states.get(name) == state):
+			print_verbose(6, lambda: "------>> Skip " + name + " (table unchanged)")
+			return
+		cleanup_pass()
+		if(self.get_cleanup_state() == state):
+			clean_states[name] = state
+		
+		
 	def cleanup_table(self, page_width, paragraphs):
 	
-		bak_items = deepcopy(self.items)
-		bak_idx = deepcopy(self.idx)
+		# only items of this table are restored after the cleanup (see below), so only they need a backup
+		bak_idx = self.idx.copy()
+		bak_item_idx = sorted(set(bak_idx) - set([-1]))
+		bak_items = dict(zip(bak_item_idx, deepcopy([self.items[i] for i in bak_item_idx])))
 
 		num_cells = -1
 		old_num_actual_items = -1
@@ -1289,10 +1221,28 @@ class HTMLTable:
 		#config.global_verbosity = 6
 		
 		
-		print_verbose(3, 'Table before cleanup: '+str(self))
-		
-		
-		
+		print_verbose(3, lambda: 'Table before cleanup: '+str(self))
+		
+		# each pass is preceded by compactify (except for recalc_geometry)
+		cleanup_passes = [
+			('compactify',								self.compactify),
+			('recalc_geometry',							self.recalc_geometry),
+			('throw_away_non_connected_rows',			self.throw_away_non_connected_rows),
+			('throw_away_rows_after_new_header',		self.throw_away_rows_after_new_header),
+			('throw_away_non_connected_cols',			lambda: self.throw_away_non_connected_cols(page_width)),
+			('throw_away_cols_at_next_paragraph',		lambda: self.throw_away_cols_at_next_paragraph(paragraphs)),
+			('throw_away_cols_after_year_list',			self.throw_away_cols_after_year_list),
+			('throw_away_duplicate_looking_cols',		self.throw_away_duplicate_looking_cols),
+			('merge_down_all_rows',						self.merge_down_all_rows),
+			('merge_down_all_cols',						self.merge_down_all_cols),
+			('identify_headline',						self.identify_headline),
+			('throw_away_last_headline',				self.throw_away_last_headline),
+			('identify_overlapping_special_items',		self.identify_overlapping_special_items),
+			('identify_non_numeric_special_items',		self.identify_non_numeric_special_items),
+			('compactify',								self.compactify),
+			('recalc_geometry',							self.recalc_geometry)]
+		
+		clean_states = {}
 		
 		while(True):
 			cur_num_actual_items = self.count_actual_items()
@@ -1305,64 +1255,12 @@ class HTMLTable:
 			
 			
 			print_verbose(3, "--> Next cleanuptable iteration")
-			self.compactify()
-			print_verbose(6, "------>> After compactify:" + str(self.get_printed_repr()))
-
-			self.recalc_geometry()
-			print_verbose(6, "------>> After recalc_geometry:" + str(self.get_printed_repr()))
-
-			self.compactify()
-			self.throw_away_non_connected_rows()
-			print_verbose(6, "------>> After throw_away_non_connected_rows:" + str(self.get_printed_repr()))
-
-			self.compactify()
-			self.throw_away_rows_after_new_header()
-			print_verbose(6, "------>> After throw_away_rows_after_new_header:" + str(self.get_printed_repr()))
-
-			self.compactify()
-			self.throw_away_non_connected_cols(page_width) 
-			print_verbose(6, "------>> After throw_away_non_connected_cols:" + str(self.get_printed_repr()))
-
-			self.compactify()
-			self.throw_away_cols_at_next_paragraph(paragraphs)
-			print_verbose(6, "------>> After throw_away_cols_at_next_paragraph:" + str(self.get_printed_repr()))
-			
-			self.compactify()
-			self.throw_away_cols_after_year_list()
-			print_verbose(6, "------>> After throw_away_cols_after_year_list:" + str(self.get_printed_repr()))
-
-			self.compactify()
-			self.throw_away_duplicate_looking_cols()
-			print_verbose(6, "------>> After throw_away_duplicate_looking_cols:" + str(self.get_printed_repr()))
-			
-			self.compactify()
-			self.merge_down_all_rows()
-			print_verbose(6, "------>> After merge_down_all_rows:" + str(self.get_printed_repr()))
-
-			self.compactify()
-			self.merge_down_all_cols()
-			print_verbose(6, "------>> After merge_down_all_cols:" + str(self.get_printed_repr()))
-
-			self.compactify()
-			self.identify_headline()
-			print_verbose(6, "------>> After identify_headline:" + str(self.get_printed_repr()))
-			
-			self.compactify()
-			self.throw_away_last_headline()
-			print_verbose(6, "------>> After throw_away_last_headline:" + str(self.get_printed_repr()))
-
-			self.compactify()
-			self.identify_overlapping_special_items()
-			print_verbose(6, "------>> After identify_overlapping_special_items:" + str(self.get_printed_repr()))
-			#raise ValueError('XXX')
-
-			self.compactify()
-			self.identify_non_numeric_special_items()
-			print_verbose(6, "------>> After identify_non_numeric_special_items:" + str(self.get_printed_repr()))
-			
-			self.compactify()
-			self.recalc_geometry()
-			print_verbose(6, "------>> After recalc_geometry:" + str(self.get_printed_repr()))
+			for name, cleanup_pass in cleanup_passes:
+				if(name not in ('compactify', 'recalc_geometry')):
+					self.run_cleanup_pass('compactify', self.compactify, clean_states)
+				self.run_cleanup_pass(name, cleanup_pass, clean_states)
+				print_verbose(6, lambda: "------>> After " + name + ":" + str(self.get_printed_repr()))
+				#raise ValueError('XXX')
 				
 
 		self.compactify()
@@ -1370,11 +1268,11 @@ class HTMLTable:
 		self.special_idx = sorted(self.special_idx, key=lambda i: self.items[i].pos_y )
 		self.throw_away_distant_special_items(page_width)
 		
-		print_verbose(6, "------>> After throw_away_distant_special_items:" + str(self.get_printed_repr()))
+		print_verbose(6, lambda: "------>> After throw_away_distant_special_items:" + str(self.get_printed_repr()))
 		
 		# restore all items that are no longer part of that table
 		to_restore = list(set(bak_idx) - set(self.idx + [-1]))
-		print_verbose(3, "Restoring old items with idx: "+str(to_restore))
+		print_verbose(3, lambda: "Restoring old items with idx: "+str(to_restore))
 		for i in to_restore:
 			# was this item merged and the merged item is still used?
 			was_merged = False
@@ -1383,10 +1281,10 @@ class HTMLTable:
 					was_merged = True
 					break
 			if(not was_merged):
-				print_verbose(6, '----> Old item '+str(i)+' was not merged => Restore')
+				print_verbose(6, lambda: '----> Old item '+str(i)+' was not merged => Restore')
 				self.items[i] = bak_items[i]
 			else:
-				print_verbose(6, '----> Old item '+str(i)+' was merged => Dont touch')
+				print_verbose(6, lambda: '----> Old item '+str(i)+' was merged => Dont touch')
 				
 				
 				
@@ -1394,7 +1292,7 @@ class HTMLTable:
 				
 		self.compactify()		
 				
-		print_verbose(6, "------>> After restoring old item:" + str(self.get_printed_repr()))
+		print_verbose(6, lambda: "------>> After restoring old item:" + str(self.get_printed_repr()))
 		
 		print_verbose(3, "===============>>>>>>>>>>>>>>>> Cleanup done <<<<<<<<<<<< =====================")
 		
@@ -1540,7 +1438,7 @@ class HTMLTable:
 		
 	
 	def categorize_as_table(self):
-		print_verbose(7, "--> Categorize as new table: "+str(self))
+		print_verbose(7, lambda: "--> Categorize as new table: "+str(self))
 		for i in self.idx:
 			if(i!=-1):
 				self.items[i].category = CAT_TABLE_DATA
@@ -1553,7 +1451,7 @@ class HTMLTable:
 			
 		
 	def categorize_as_misc(self):
-		print_verbose(7, "--> Categorize as misc: "+str(self))
+		print_verbose(7, lambda: "--> Categorize as misc: "+str(self))
 		for i in self.get_all_idx():
 			if(i!=-1):
 				self.items[i].category = CAT_MISC
@@ -1700,7 +1598,7 @@ class HTMLTable:
 			while(tab1_col < tab1.num_cols or tab2_col < tab2.num_cols):
 				tmp_items = []
 				# find leftmost col
-				print_verbose(5, "----> tab1_col=" + str(tab1_col) + ", tab2_col=" + str(tab2_col))
+				print_verbose(5, lambda: "----> tab1_col=" + str(tab1_col) + ", tab2_col=" + str(tab2_col))
 				tab1_col_x = tab1.col_aligned_pos_x[tab1_col] if tab1_col < tab1.num_cols else 9999999
 				tab2_col_x = tab2.col_aligned_pos_x[tab2_col] if tab2_col < tab2.num_cols else 9999999
 				use_tab1 = tab1_col_x <= tab2_col_x + threshold_px
@@ -1710,7 +1608,7 @@ class HTMLTable:
 					use_tab1 = tab1_col_x < tab2_col_x
 					use_tab2 = not use_tab1			
 
-				print_verbose(5, "------> tab1_col_x=" + str(tab1_col_x) + ", tab2_col_x=" + str(tab2_col_x)+ ", use1/2="+str(use_tab1)+"/"+str(use_tab2))
+				print_verbose(5, lambda: "------> tab1_col_x=" + str(tab1_col_x) + ", tab2_col_x=" + str(tab2_col_x)+ ", use1/2="+str(use_tab1)+"/"+str(use_tab2))
 
 				
 				# insert items from that col(s)
@@ -1737,8 +1635,8 @@ class HTMLTable:
 									#very strange case! should normally never occurence. bad can happen due to bad pdf formatting
 									print_verbose(6, "------>>> Bad case! Must rearrange item")
 									it1.pos_y += it1.height * 0.0001
-								print_verbose(5, "-----> Split neccessary: " + str(it) + " cant be merged with " +str(it1))
-								print_verbose(5, "-----> Split is here: " + str(tmp_rows[0:i+1]) +" <-> " +str(it1.pos_y) + " <-> "+ str(tmp_rows[i+1:]))
+								print_verbose(5, lambda: "-----> Split neccessary: " + str(it) + " cant be merged with " +str(it1))
+								print_verbose(5, lambda: "-----> Split is here: " + str(tmp_rows[0:i+1]) +" <-> " +str(it1.pos_y) + " <-> "+ str(tmp_rows[i+1:]))
 								tmp_rows = tmp_rows[0:i+1] + [it1.pos_y] + tmp_rows[i+1:]
 								return False, [], tmp_rows
 						
@@ -1802,7 +1700,7 @@ class HTMLTable:
 			list_idx = tab1.find_marked_idx_at_y0(0, 1, cur_rect.y0, 1)
 			list_idx += tab2.find_marked_idx_at_y0(0, 2, cur_rect.y0, 1)
 
-			print_verbose(9, "----> Continue with idx1="+str(idx1)+",idx2="+str(idx2)+", r="+str(cur_rect)+", list_idx="+str(list_idx))
+			print_verbose(9, lambda: "----> Continue with idx1="+str(idx1)+",idx2="+str(idx2)+", r="+str(cur_rect)+", list_idx="+str(list_idx))
 			
 			
 			min_y = 9999999
@@ -1813,7 +1711,7 @@ class HTMLTable:
 			tmp_rows.append(min_y) #(list_idx, min_y))
 		
 		
-		print_verbose(5, "----> Rows: "+ str(tmp_rows))
+		print_verbose(5, lambda: "----> Rows: "+ str(tmp_rows))
 		# Find all new columns
 		print_verbose(3, "--> Rows found, continuing with columns")
 		finding_cols_done = False
@@ -1821,7 +1719,7 @@ class HTMLTable:
 		while(not finding_cols_done):
 			print_verbose(7, "--> Next try")
 			finding_cols_done, tmp_cols, tmp_rows = find_all_new_columns(tab1, tab2, tmp_rows, threshold_px)
-			print_verbose(7, "----> New Rows: "+ str(tmp_rows))
+			print_verbose(7, lambda: "----> New Rows: "+ str(tmp_rows))
 			
 		# Build resulting table
 		print_verbose(3, "--> Columns found, now build final table")
@@ -1923,7 +1821,7 @@ class HTMLTable:
 				n1 = True
 	
 		if(n0 and n1):
-			print_verbose(8, '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 have both numbers')
+			print_verbose(8, lambda: '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 have both numbers')
 			return False,0 # both rows contain numbers			
 		
 		#if(config.global_table_merging_only_if_numbers_come_first and not n0):
@@ -1939,14 +1837,14 @@ class HTMLTable:
 		for j in range(self.num_cols):
 			both_filled = self.has_item_at(r0, j) and self.has_item_at(r0+1, j) 
 			if(both_filled and not self.get_item(r0,j).is_weakly_mergable_after_reconnect(self.get_item(r0+1,j))):
-				print_verbose(8, '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 are not mergable. Items:' \
+				print_verbose(8, lambda: '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 are not mergable. Items:' \
 				                  + str(self.get_item(r0,j)) + ' and ' + str(self.get_item(r0+1,j)))
 				return False,0
 			if(both_filled):
 				has_mergable_candidates = True
 				font_chars = self.get_item(r0,j).get_font_characteristics()
 				if(self.get_item(r0,j).pos_y + self.get_item(r0,j).height*(3.0 if n0 else 2.1) < self.get_item(r0+1,j).pos_y):
-					print_verbose(8, '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 are too far apart. Items:' \
+					print_verbose(8, lambda: '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 are too far apart. Items:' \
 					                  + str(self.get_item(r0,j)) + ' and ' + str(self.get_item(r0+1,j)))
 					return False,0
 				cur_y0 = self.get_item(r0, j).pos_y + self.get_item(r0, j).height if self.has_item_at(r0, j) else 0
@@ -1955,22 +1853,22 @@ class HTMLTable:
 				y1_min = min(y1_min, cur_y1)
 
 		if(not has_mergable_candidates):
-			print_verbose(8, '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 have no mergable candidates')
+			print_verbose(8, lambda: '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 have no mergable candidates')
 			return False,0
 
 		if(y0_max >= y1_min):
-			print_verbose(8, '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 would overlap')
+			print_verbose(8, lambda: '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 would overlap')
 			return False,0
 			
 		# make sure, all same font characteristics
 		for j in range(self.num_cols):
 			if((self.has_item_at(r0, j) and self.get_item(r0,j).get_font_characteristics() != font_chars) \
 			   or (self.has_item_at(r0+1, j) and self.get_item(r0+1,j).get_font_characteristics() != font_chars)):
-				print_verbose(8, '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 have different font chars')
+				print_verbose(8, lambda: '--->> is_non_overlapping_row_mergable: Rows r0='+str(r0)+' and r0+1 have different font chars')
 				return False,0
 			
 		mod_dist = math.floor((y1_min-y0_max)*100.0)/100.0 * (0.66 if n0 else 1)
-		print_verbose(8, "---->>> For row="+str(r0)+", mod_dist="+str(mod_dist) + ", y0_max=" +str(y0_max) + ",y1_min="+str(y1_min))
+		print_verbose(8, lambda: "---->>> For row="+str(r0)+", mod_dist="+str(mod_dist) + ", y0_max=" +str(y0_max) + ",y1_min="+str(y1_min))
 		return True, mod_dist # TODO: maybe use only the distance, where both rows are filled?
 	
 	
@@ -1988,23 +1886,23 @@ class HTMLTable:
 					min_dist = min(min_dist, dist)
 					min_row = i
 		
-		print_verbose(7, "The following non-overlapping rows could be merged: " + str(merge_list))
+		print_verbose(7, lambda: "The following non-overlapping rows could be merged: " + str(merge_list))
 		if(len(merge_list)==0):
 			return False # nothing was merged
 			
-		print_verbose(7, "We merge now " + str(min_row))
+		print_verbose(7, lambda: "We merge now " + str(min_row))
 		
-		print_verbose(9, "Before merging: " + self.get_printed_repr())
+		print_verbose(9, lambda: "Before merging: " + self.get_printed_repr())
 		self.merge_rows(min_row, True)
-		print_verbose(9, "After merging rows " +str(min_row)+" and r+1: " + self.get_printed_repr())
+		print_verbose(9, lambda: "After merging rows " +str(min_row)+" and r+1: " + self.get_printed_repr())
 		
 		self.recalc_geometry()
-		print_verbose(9, "After recalc geometry: " + self.get_printed_repr())
+		print_verbose(9, lambda: "After recalc geometry: " + self.get_printed_repr())
 		
 		return True #we merged something!
 	
 	def merge_non_overlapping_rows(self):
-		print_verbose(7, "merge_non_overlapping_rows, Table=" + self.get_printed_repr())
+		print_verbose(7, lambda: "merge_non_overlapping_rows, Table=" + self.get_printed_repr())
 		while True:
 			if(not self.merge_non_overlapping_rows_single()):
 				return
@@ -2048,7 +1946,7 @@ class HTMLTable:
 					j = cur_year_cols.c1
 				j += 1
 				
-		print_verbose(6, '----->> Found year lists at: ' +str(year_cols))
+		print_verbose(6, lambda: '----->> Found year lists at: ' +str(year_cols))
 		
 		
 		yl = []
@@ -2064,7 +1962,7 @@ class HTMLTable:
 				if(y[1]+1 < cur_tab.num_cols):
 					cur_tab.delete_cols(y[1]+1, cur_tab.num_cols)
 				cur_tab.delete_cols(0, y[0]-1)
-				print_verbose(6, "Found sub-table:\n"+str(cur_tab.get_printed_repr()))
+				print_verbose(6, lambda: "Found sub-table:\n"+str(cur_tab.get_printed_repr()))
 				res.append(cur_tab)
 			
 		return res
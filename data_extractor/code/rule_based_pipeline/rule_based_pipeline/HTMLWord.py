@@ -12,9 +12,11 @@ from Rect import *
 
 
 class HTMLWord:
-	txt		= None
-	rect	= None
-	item_id	= None # to which HTMLItem id does this word belong?
+	__slots__ = (
+		'txt',
+		'rect',
+		'item_id',	# to which HTMLItem id does this word belong?
+	)
 	
 	
 	def __init__(self):
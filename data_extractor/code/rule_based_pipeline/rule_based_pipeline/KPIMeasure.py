@@ -71,21 +71,23 @@ class KPIMeasure:
 	def remove_duplicates(lst): # from the list of KPIMeasure "lst", remove all duplicates (same kpi_name and year), with less than best score
 	
 		#return lst # Dont remoe anything (for debug purposes only)
-	
-		keep = [False] * len(lst)
+		
+		# For each (kpi_name, year), we keep the best score. If there are multiple with the best score, we keep the last one.
+		# Note: measures without a comparable score (i.e., NaN) are never removed, and never remove others.
+		best = {} # (kpi_name, year) -> index in lst
 		for i in range(len(lst)):
-			better_kpi_exists = False
-			for j in range(len(lst)):
-				if(i==j):
-					continue
-				if(lst[j].kpi_name == lst[i].kpi_name and lst[j].year == lst[i].year and (lst[j].score > lst[i].score or (lst[j].score == lst[i].score and j > i ))):
-					better_kpi_exists = True
-					break
-			keep[i] = not better_kpi_exists
+			score = lst[i].score
+			if(score != score):
+				continue # NaN
+			key = (lst[i].kpi_name, lst[i].year)
+			if(key not in best or score >= lst[best[key]].score):
+				best[key] = i
+		
+		keep = set(best.values())
 		
 		res = []
 		for i in range(len(lst)):
-			if(keep[i]):
+			if(i in keep or lst[i].score != lst[i].score):
 				res.append(lst[i])
 		
 		return res
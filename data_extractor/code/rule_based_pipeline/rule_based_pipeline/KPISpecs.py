@@ -9,6 +9,11 @@
 from globals import *
 from Format_Analyzer import *
 from HTMLPage import *
+import numpy
+try:
+	import re._parser as re_parser # Python >= 3.11
+except ImportError:
+	import sre_parse as re_parser
 
 
 # Matching modes:
@@ -65,6 +70,10 @@ class KPISpecs:
 			return True if self.pattern_regex.match(txt if self.case_sensitive else txt.lower()) else False #b/c regexp matcher returns not just a boolean value
 			
 		def match_nodes(self, txt_nodes): #check if nodes are matched by this, and if yes return True togehter with score
+			concat_hit = self.allow_matching_against_concat_txt and self.match_single_node(' '.join(txt_nodes))
+			return self.score_nodes(txt_nodes, [self.match_single_node(txt) for txt in txt_nodes], concat_hit)
+			
+		def score_nodes(self, txt_nodes, node_hits, concat_hit): # like match_nodes, but the regex matching has already been done (node_hits[i] = True, if txt_nodes[i] is matched)
 			matched = False
 			final_score = 0
 			num_hits = 0
@@ -72,13 +81,13 @@ class KPISpecs:
 			concat_final_score = 0
 			
 			if(self.allow_matching_against_concat_txt):
-				concat_txt = ' '.join(txt_nodes)
-				if(self.match_single_node(concat_txt)):
+				if(concat_hit):
+					concat_txt = ' '.join(txt_nodes)
 					concat_final_score = self.score * (self.letter_decay **  max(len(Format_Analyzer.cleanup_text(concat_txt)) - self.letter_decay_disregard, 0) )
 					concat_match = True
 			
 			for i in range(len(txt_nodes)):
-				if(self.match_single_node(txt_nodes[i])):
+				if(node_hits[i]):
 					if(self.matching_mode == MATCHING_MUST_EXCLUDE):
 						return False, -1 # we matched something that must not be included
 					matched = True
@@ -98,6 +107,86 @@ class KPISpecs:
 			
 			return True, max(concat_final_score, final_score)
 			
+			
+	class DescRegExMatcher: # matches the description patterns (DescRegExMatch) of many KPIs at once
+		# The same texts are matched for each KPI, row and column of a table. Hence, each text is matched only once
+		# against all patterns, and the hits are cached. Before a regex is evaluated, we check if the text contains
+		# all literal strings, that any match of the regex must contain (e.g., "prov" and "reserv" for ".*prov.*reserv.*"),
+		# which is much faster and rules out most patterns.
+		MAX_CACHE_SIZE = 100000
+		
+		patterns		= None # list of (pattern_regex, case_sensitive, literal_ids) of all different patterns
+		pattern_idx		= None # (pattern_raw, case_sensitive) -> index in patterns
+		literals		= None # list of (literal, case_sensitive) of all different literals
+		literal_idx		= None # (literal, case_sensitive) -> index in literals
+		hits_cache		= None # txt -> frozenset of indices of all patterns that match txt
+		
+		def __init__(self, kpispecs_lst):
+			self.patterns = []
+			self.pattern_idx = {}
+			self.literals = []
+			self.literal_idx = {}
+			self.hits_cache = {}
+			for k in kpispecs_lst:
+				for d in k.desc_regex_match_list:
+					self.get_pattern_idx(d)
+		
+		@staticmethod
+		def find_required_literals(pattern_regex):
+			# returns strings, that are contained in any text matched by pattern_regex (not necessarily all of them)
+			res = []
+			if(pattern_regex.flags & re.IGNORECASE):
+				return res
+				
+			def go(parsed):
+				cur = ''
+				for op, av in parsed:
+					if(op == re_parser.LITERAL):
+						cur += chr(av)
+						continue
+					if(cur != ''):
+						res.append(cur)
+						cur = ''
+					if(op == re_parser.SUBPATTERN and av[1] == 0 and av[2] == 0): # group without inline flags
+						go(av[3])
+					elif(op in (re_parser.MAX_REPEAT, re_parser.MIN_REPEAT) and av[0] >= 1): # repeated at least once
+						go(av[2])
+				if(cur != ''):
+					res.append(cur)
+			
+			go(re_parser.parse(pattern_regex.pattern, pattern_regex.flags))
+			return res
+		
+		def get_pattern_idx(self, desc_regex_match):
+			key = (desc_regex_match.pattern_raw, desc_regex_match.case_sensitive)
+			if(key not in self.pattern_idx):
+				literal_ids = []
+				for lit in KPISpecs.DescRegExMatcher.find_required_literals(desc_regex_match.pattern_regex):
+					lit_key = (lit, desc_regex_match.case_sensitive)
+					if(lit_key not in self.literal_idx):
+						self.literal_idx[lit_key] = len(self.literals)
+						self.literals.append(lit_key)
+					literal_ids.append(self.literal_idx[lit_key])
+				self.pattern_idx[key] = len(self.patterns)
+				self.patterns.append((desc_regex_match.pattern_regex, desc_regex_match.case_sensitive, literal_ids))
+				self.hits_cache = {} # cached hits do not include the new pattern
+			return self.pattern_idx[key]
+			
+		def find_hits(self, txt):
+			res = self.hits_cache.get(txt)
+			if(res is None):
+				txt_lower = txt.lower()
+				found = [lit in (txt if case_sensitive else txt_lower) for lit, case_sensitive in self.literals]
+				hits = []
+				for i, (pattern_regex, case_sensitive, literal_ids) in enumerate(self.patterns):
+					if(all(found[j] for j in literal_ids) and pattern_regex.match(txt if case_sensitive else txt_lower)):
+						hits.append(i)
+				res = frozenset(hits)
+				if(len(self.hits_cache) >= KPISpecs.DescRegExMatcher.MAX_CACHE_SIZE):
+					self.hits_cache = {}
+				self.hits_cache[txt] = res
+			return res
+		
 		
 	class GeneralRegExMatch: # regex matcher for value or unit of KPI
 		pattern_raw 	= None
@@ -168,57 +257,59 @@ class KPISpecs:
 			return None # not implemented
 
 		
+		def calc_distances(self, a, b_x, b_y, threshold): # like calc_distance, but for many points b at once (b_x, b_y are numpy arrays)
+			if(self.distance_mode==DISTANCE_EUCLIDIAN):
+				return numpy.float_power(numpy.float_power(b_x - a[0], 2.0) + numpy.float_power(b_y - a[1], 2.0), 0.5)
+			if(self.distance_mode in (DISTANCE_MOD_EUCLID, DISTANCE_MOD_EUCLID_UP_ONLY)):
+				below = a[1] < b_y - threshold if self.distance_mode==DISTANCE_MOD_EUCLID else numpy.zeros(len(b_y), dtype=bool)
+				right = a[0] < b_x - threshold
+				penalty = numpy.where(right, numpy.where(below, 90.0, 50.0), numpy.where(below, 50.0, 1.0))
+				dx = numpy.abs(b_x - a[0])
+				dy = numpy.abs(b_y - a[1])
+				dx, dy = numpy.where(dx > dy, dx * 0.01, dx), numpy.where(dx > dy, dy, dy * 0.01) #by Lei
+				res = penalty * numpy.float_power(dx*dx+dy*dy, 0.5)
+				if(self.distance_mode==DISTANCE_MOD_EUCLID_UP_ONLY):
+					res[a[1] < b_y] = -1 # reference_point text below basepoint
+				return res
+			
+			return None # not implemented
+			
+		
 		def match(self, htmlpage, cur_item_idx):
-			taken = [False] * len(htmlpage.items)
-			matches = [] # list of (idx, txt, score_base)
+			# The lines of the page and the lines matched by the regex are only determined once per page (see LineIndex).
+			# Here, we only calculate the scores of the matched lines, which are then summed up in descending order.
+			lines = htmlpage.get_line_index()
+			pos = lines.find_matches(self.general_match)
 			base_rect = htmlpage.items[cur_item_idx].get_rect()
 			base_point = ((base_rect.x0 + base_rect.x1) * 0.5, (base_rect.y0 + base_rect.y1) * 0.5)
 			page_diag = (htmlpage.page_width**2 + htmlpage.page_height**2)**0.5
 			page_threshold = page_diag * 0.0007
-
 			
-			for i in range(len(htmlpage.items)):
-				if(taken[i]):
-					continue
-				idx_list = htmlpage.explode_item_by_idx(i)
-				# mark as taken
-				for j in idx_list:
-					taken[j] = True
-				txt = htmlpage.explode_item(i)
-				if(self.general_match.match(txt)):
-					rect = Rect(9999999, 9999999, -1, -1)
-					for j in idx_list:
-						rect.grow(htmlpage.items[j].get_rect())
-					reference_point = ((rect.x0 + rect.x1) * 0.5, (rect.y0 + rect.y1) * 0.5)
-					
-					dist = self.calc_distance(base_point, reference_point, page_threshold)
-					if(dist==-1):
-						continue
-					dist_exp = dist / (0.1 * page_diag)
-					
-					score_base = self.score * (self.score_decay ** dist_exp ) * (self.letter_decay ** max(len(Format_Analyzer.cleanup_text(txt)) - self.letter_decay_disregard, 0) )
-					print_verbose(9,'..........txt:'+str(txt)+' has dist_exp='+str(dist_exp)+'  and score='+str(score_base))
-
-					matches.append((i, txt, score_base))
-
-			matches = sorted(matches, key=lambda m: - m[2])  # sort desc by score_base
+			dist = self.calc_distances(base_point, lines.center_x[pos], lines.center_y[pos], page_threshold)
+			pos = pos[dist != -1]
+			dist = dist[dist != -1]
+			dist_exp = dist / (0.1 * page_diag)
+			score_base = self.score * numpy.float_power(self.score_decay, dist_exp) * numpy.float_power(self.letter_decay, numpy.maximum(lines.cleanup_len[pos] - self.letter_decay_disregard, 0))
+			print_verbose(9, lambda: '\n'.join(['..........txt:'+str(lines.txt[p])+' has dist_exp='+str(float(d))+'  and score='+str(float(s)) for p, d, s in zip(pos, dist_exp, score_base)]))
 			
-			if(len(matches) > 0):
-				print_verbose(8, 'AnywhereRegExMatch.match of item ' + str(htmlpage.items[cur_item_idx]) + ' matches with: ' + str(matches))
+			order = numpy.argsort(-score_base, kind='stable') # sort desc by score_base
+			pos = pos[order]
+			score_base = score_base[order]
+			
+			if(len(pos) > 0):
+				print_verbose(8, lambda: 'AnywhereRegExMatch.match of item ' + str(htmlpage.items[cur_item_idx]) + ' matches with: ' + str([(lines.idx[p], lines.txt[p], float(s)) for p, s in zip(pos, score_base)]))
 			
 			
 			
 			final_score = 0
-			num_hits = 0
-			for i in range(len(matches)):
+			if(len(pos) > 0):
 				if(self.matching_mode == MATCHING_MUST_EXCLUDE):
 					return False, -1 # we matched something that must not be included
 				
+				# cumsum adds up the scores one after another, exactly like a loop
+				final_score = float(numpy.cumsum(score_base * numpy.float_power(self.multi_match_decay, numpy.arange(len(pos), dtype=numpy.float64)))[-1])
 				
-				final_score += matches[i][2] * (self.multi_match_decay ** num_hits)
-				num_hits += 1
-				
-			if(self.matching_mode in (MATCHING_MUST_INCLUDE, MATCHING_MUST_INCLUDE_EACH_NODE) and len(matches) == 0 ):
+			if(self.matching_mode in (MATCHING_MUST_INCLUDE, MATCHING_MUST_INCLUDE_EACH_NODE) and len(pos) == 0 ):
 				return False, 0 # something must be included was never matched
 				
 			return True, final_score				
@@ -239,6 +330,7 @@ class KPISpecs:
 	anywhere_regex_match_list	= None
 	minimum_score				= None
 	minimum_score_desc_regex	= None
+	desc_matcher				= None # DescRegExMatcher, possibly shared with other KPISpecs (see AnalyzerDirectory.find_multiple_kpis)
 	#value_preference			= None # 1=all values are equally peferable; >1= prefer greater values; <1= prefer smaller values (not yet implemented and probably not neccessary)
 	
 	
@@ -255,6 +347,7 @@ class KPISpecs:
 		self.anywhere_regex_match_list = []
 		self.minimum_score = 0
 		self.minimum_score_desc_regex = 0
+		self.desc_matcher = None
 		#self.value_preference = 1.0
 		
 		
@@ -262,16 +355,42 @@ class KPISpecs:
 		return len(self.unit_regex_match_list) > 0
 		
 		
+	def get_desc_matcher(self):
+		if(self.desc_matcher is None):
+			self.desc_matcher = KPISpecs.DescRegExMatcher([self])
+		return self.desc_matcher
+		
+		
 	def match_nodes(self, desc_nodes): #check if nodes are matched by this, and if yes return True togehter with score
 		final_score = 0
 		at_least_one_match = False
 		bad_match = False
 		min_score = 0
 		
+		matcher = self.get_desc_matcher()
+		node_hits = [matcher.find_hits(txt) for txt in desc_nodes]
+		concat_hits = matcher.find_hits(' '.join(desc_nodes)) if any(d.allow_matching_against_concat_txt for d in self.desc_regex_match_list) else frozenset()
 		
+		desc_hits = [] # list of (node_hits, concat_hit) for each d
+		counted_hit = False
+		excluded_hit = False
 		for d in self.desc_regex_match_list:
-			match, score = d.match_nodes(desc_nodes)
-			print_verbose(7,'..... matching "'+d.pattern_raw+'"  => match,score='+str(match)+','+str(score))
+			idx = matcher.get_pattern_idx(d)
+			d_node_hits = [idx in h for h in node_hits]
+			d_concat_hit = d.allow_matching_against_concat_txt and idx in concat_hits
+			desc_hits.append((d_node_hits, d_concat_hit))
+			if(d.matching_mode in (MATCHING_MAY_INCLUDE, MATCHING_MUST_INCLUDE, MATCHING_MUST_INCLUDE_EACH_NODE) and d.count_if_matched and (d_concat_hit or any(d_node_hits))):
+				counted_hit = True
+			if(d.matching_mode == MATCHING_MUST_EXCLUDE and any(d_node_hits)):
+				excluded_hit = True
+		
+		if(not counted_hit):
+			# then there cannot be at least one match (see below), so we don't need to calculate the scores
+			return False, -1 if excluded_hit else 0
+		
+		for d, (d_node_hits, d_concat_hit) in zip(self.desc_regex_match_list, desc_hits):
+			match, score = d.score_nodes(desc_nodes, d_node_hits, d_concat_hit)
+			print_verbose(7,lambda: '..... matching "'+d.pattern_raw+'"  => match,score='+str(match)+','+str(score))
 			if(not match):
 				# must included, but not included. or must excluded, but included
 				bad_match = True
@@ -337,7 +456,7 @@ class KPISpecs:
 				at_least_one_match_needed = True
 			
 			match, score = d.match(htmlpage, cur_item_idx)
-			print_verbose(7,'..... matching anywhere "'+d.general_match.pattern_raw+'"  => match,score='+str(match)+','+str(score))
+			print_verbose(7,lambda: '..... matching anywhere "'+d.general_match.pattern_raw+'"  => match,score='+str(match)+','+str(score))
 			if(not match):
 				# must included, but not included. or must excluded, but included
 				bad_match = True
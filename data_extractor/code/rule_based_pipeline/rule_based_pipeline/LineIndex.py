@@ -0,0 +1,73 @@
+# ============================================================================================================================
+# PDF_Analyzer
+# File   : LineIndex.py
+# Author : PDF_Analyzer maintainers
+# Date   : 19.10.2026
+#
+# Note   : 1 HTMLPage can have 1 LineIndex over its text lines (rebuilt automatically, see HTMLPage.get_line_index)
+# Note   : A line consists of all items that are connected via left_id / right_id (see HTMLPage.explode_item)
+# ============================================================================================================================
+
+from globals import *
+from Rect import *
+from Format_Analyzer import *
+import numpy
+
+
+class LineIndex:
+	# Texts and centers of all lines of a page, and the lines matched by each regex. KPISpecs.AnywhereRegExMatch needs
+	# them for each candidate value on the page, so they are only calculated once per page (resp. once per regex).
+
+	items_ref		= None # the list of items, that this index was built for
+	num_items		= None
+	idx				= None # for each line, the index of the first item
+	txt				= None # for each line, the concatenated text (see HTMLPage.explode_item)
+	center_x		= None # numpy array with the x coordinate of the center of each line
+	center_y		= None # numpy array with the y coordinate of the center of each line
+	cleanup_len		= None # numpy array with the length of each text after Format_Analyzer.cleanup_text
+	match_cache		= None # (pattern_raw, case_sensitive) -> numpy array with the numbers of all lines matched by that regex
+
+
+	def __init__(self, htmlpage):
+		self.items_ref = htmlpage.items
+		self.num_items = len(htmlpage.items)
+		self.idx = []
+		self.txt = []
+		self.match_cache = {}
+		center_x = []
+		center_y = []
+
+		taken = [False] * len(htmlpage.items)
+		for i in range(len(htmlpage.items)):
+			if(taken[i]):
+				continue
+			idx_list = htmlpage.explode_item_by_idx(i)
+			# mark as taken
+			for j in idx_list:
+				taken[j] = True
+			rect = Rect(9999999, 9999999, -1, -1)
+			for j in idx_list:
+				rect.grow(htmlpage.items[j].get_rect())
+			self.idx.append(i)
+			self.txt.append(htmlpage.explode_item(i))
+			center_x.append((rect.x0 + rect.x1) * 0.5)
+			center_y.append((rect.y0 + rect.y1) * 0.5)
+
+		self.center_x = numpy.array(center_x, dtype=numpy.float64)
+		self.center_y = numpy.array(center_y, dtype=numpy.float64)
+		self.cleanup_len = numpy.array([len(Format_Analyzer.cleanup_text(t)) for t in self.txt], dtype=numpy.int64)
+
+
+	def is_valid_for(self, items):
+		return self.items_ref is items and self.num_items == len(items)
+		
+	def is_equal_to(self, other): # only for debugging (see config.global_verify_indices)
+		return self.idx == other.idx and self.txt == other.txt and numpy.array_equal(self.center_x, other.center_x) \
+			and numpy.array_equal(self.center_y, other.center_y)
+
+
+	def find_matches(self, general_match): # general_match is a KPISpecs.GeneralRegExMatch
+		key = (general_match.pattern_raw, general_match.case_sensitive)
+		if(key not in self.match_cache):
+			self.match_cache[key] = numpy.array([k for k in range(len(self.txt)) if general_match.match(self.txt[k])], dtype=numpy.int64)
+		return self.match_cache[key]
@@ -0,0 +1,194 @@
+# ============================================================================================================================
+# PDF_Analyzer
+# File   : PageSerializer.py
+# Author : PDF_Analyzer maintainers
+# Date   : 19.10.2026
+#
+# Note   : Converts 1 HTMLPage from/to a compact, versioned JSON format (used for the jpage*.json files)
+# Note   : Item and word attributes are stored column-wise (one list per attribute), all other objects by an explicit
+#          schema. Legacy jsonpickle files are still read by HTMLPage.load_from_file.
+# ============================================================================================================================
+
+from globals import *
+from HTMLItem import *
+from HTMLWord import *
+from HTMLTable import *
+from HTMLCluster import *
+from Rect import *
+
+
+class PageSerializer:
+
+	FORMAT_NAME		= 'rb_page'
+	FORMAT_VERSION	= 1 # increment this, whenever the schema changes (and keep reading the old versions)
+
+	# all item attributes, except words (stored separately) and rendering_color (a tuple)
+	ITEM_COLUMNS	= [a for a in HTMLItem.__slots__ if a not in ('words', 'rendering_color')]
+
+	TABLE_LISTS		= ['idx', 'marks', 'col_aligned_pos_x', 'headline_idx', 'special_idx']
+
+
+	@staticmethod
+	def rect_to_list(r):
+		return [r.x0, r.y0, r.x1, r.y1]
+
+	@staticmethod
+	def list_to_rect(l):
+		return Rect(l[0], l[1], l[2], l[3])
+
+
+	@staticmethod
+	def items_to_dict(items):
+		res = {}
+		for a in PageSerializer.ITEM_COLUMNS:
+			res[a] = [getattr(it, a) for it in items]
+		res['rendering_color'] = [list(it.rendering_color) for it in items]
+		res['num_words'] = [len(it.words) for it in items]
+		words = [w for it in items for w in it.words]
+		res['words'] = {
+			'txt'		: [w.txt for w in words],
+			'item_id'	: [w.item_id for w in words],
+			'rect'		: [PageSerializer.rect_to_list(w.rect) for w in words] }
+		return res
+
+	@staticmethod
+	def dict_to_items(d):
+		res = []
+		w = d['words']
+		k = 0
+		for i in range(len(d['num_words'])):
+			it = HTMLItem()
+			for a in PageSerializer.ITEM_COLUMNS:
+				setattr(it, a, d[a][i])
+			it.rendering_color = tuple(d['rendering_color'][i])
+			it.words = []
+			for j in range(d['num_words'][i]):
+				word = HTMLWord()
+				word.txt = w['txt'][k]
+				word.item_id = w['item_id'][k]
+				word.rect = PageSerializer.list_to_rect(w['rect'][k])
+				it.words.append(word)
+				k += 1
+			res.append(it)
+		return res
+
+
+	@staticmethod
+	def table_to_dict(t):
+		res = {}
+		for a in PageSerializer.TABLE_LISTS:
+			res[a] = getattr(t, a)
+		res['num_rows'] = t.num_rows
+		res['num_cols'] = t.num_cols
+		res['rows'] = [PageSerializer.rect_to_list(r) for r in t.rows]
+		res['cols'] = [PageSerializer.rect_to_list(c) for c in t.cols]
+		res['table_rect'] = PageSerializer.rect_to_list(t.table_rect)
+		return res
+
+	@staticmethod
+	def dict_to_table(d):
+		res = HTMLTable()
+		for a in PageSerializer.TABLE_LISTS:
+			setattr(res, a, d[a])
+		res.num_rows = d['num_rows']
+		res.num_cols = d['num_cols']
+		res.rows = [PageSerializer.list_to_rect(r) for r in d['rows']]
+		res.cols = [PageSerializer.list_to_rect(c) for c in d['cols']]
+		res.table_rect = PageSerializer.list_to_rect(d['table_rect'])
+		res.items = None # set by HTMLPage
+		return res
+
+
+	@staticmethod
+	def cluster_to_dict(root):
+		# None (too few items) and [] (not yet generated) are kept as they are
+		if(not isinstance(root, HTMLCluster)):
+			return root
+		# the trees can be very deep, so they are stored as flat lists in post-order (without recursion)
+		idx = []
+		children = []
+		node_num = {}
+		stack = [(root, False)]
+		while(len(stack) > 0):
+			c, visited = stack.pop()
+			if(visited or not c.is_internal_node()):
+				node_num[id(c)] = len(idx)
+				idx.append(c.idx)
+				children.append([node_num[id(x)] for x in c.children])
+			else:
+				stack.append((c, True))
+				for x in reversed(c.children):
+					stack.append((x, False))
+		return {'idx': idx, 'children': children}
+
+	@staticmethod
+	def dict_to_cluster(d):
+		if(not isinstance(d, dict)):
+			return d
+		nodes = []
+		for i in range(len(d['idx'])):
+			c = HTMLCluster()
+			c.idx = d['idx'][i]
+			c.children = [nodes[j] for j in d['children'][i]]
+			c.items = None # set by HTMLPage
+			c.flat_text = None
+			nodes.append(c)
+		return nodes[len(nodes)-1]
+
+
+	@staticmethod
+	def page_to_dict(page):
+		return {
+			'format'		: PageSerializer.FORMAT_NAME,
+			'version'		: PageSerializer.FORMAT_VERSION,
+			'page_num'		: page.page_num,
+			'page_width'	: page.page_width,
+			'page_height'	: page.page_height,
+			'items'			: PageSerializer.items_to_dict(page.items),
+			'left_distrib'	: [[k, v] for k, v in page.left_distrib.items()], # keys are numbers
+			'tables'		: [PageSerializer.table_to_dict(t) for t in page.tables],
+			'paragraphs'	: page.paragraphs,
+			'clusters'		: PageSerializer.cluster_to_dict(page.clusters),
+			'clusters_text'	: PageSerializer.cluster_to_dict(page.clusters_text),
+			'footnotes_idx'	: page.footnotes_idx,
+			'page_start_y0'	: page.page_start_y0 }
+
+	@staticmethod
+	def dict_to_page(d, page):
+		# fills the (empty) HTMLPage page
+		if(d['version'] > PageSerializer.FORMAT_VERSION):
+			raise ValueError('Unsupported page format version ' + str(d['version']) + ' (supported: <= ' + str(PageSerializer.FORMAT_VERSION) + ')')
+		page.page_num = d['page_num']
+		page.page_width = d['page_width']
+		page.page_height = d['page_height']
+		page.items = PageSerializer.dict_to_items(d['items'])
+		page.left_distrib = {k: v for k, v in d['left_distrib']} # see normalize_left_distrib
+		page.tables = [PageSerializer.dict_to_table(t) for t in d['tables']]
+		page.paragraphs = d['paragraphs']
+		page.clusters = PageSerializer.dict_to_cluster(d['clusters'])
+		page.clusters_text = PageSerializer.dict_to_cluster(d['clusters_text'])
+		page.footnotes_idx = d['footnotes_idx']
+		page.page_start_y0 = d['page_start_y0']
+		return page
+
+
+	@staticmethod
+	def normalize_left_distrib(left_distrib):
+		# the keys are pos_x values (numbers). The legacy jsonpickle format stores them as strings => convert them back,
+		# so that a page behaves the same, no matter in which format it had been stored
+		res = {}
+		for k, v in left_distrib.items():
+			if(isinstance(k, str)):
+				k = int(k) if k.lstrip('-').isdigit() else float(k)
+			res[k] = v
+		return res
+
+
+	@staticmethod
+	def is_page_data(data):
+		# cheap check of the file contents, without parsing them: dumps always writes 'format' as the first key
+		return data.startswith('{"format":' + json.dumps(PageSerializer.FORMAT_NAME))
+
+	@staticmethod
+	def dumps(page):
+		return json.dumps(PageSerializer.page_to_dict(page), separators=(',', ':'))
@@ -0,0 +1,110 @@
+# ============================================================================================================================
+# PDF_Analyzer
+# File   : PageTextIndex.py
+# Author : PDF_Analyzer maintainers
+# Date   : 19.10.2026
+#
+# Note   : 1 PageTextIndex refers to 1 HTMLPage
+# Note   : Used by main_find_xy to look up the coordinates of a text on a page
+# ============================================================================================================================
+
+from globals import *
+import bisect
+
+
+class PageTextIndex:
+	# All text runs of a page (an item, concatenated with all following lines via next_id) are stored
+	# in one buffer. For each item, the text run starting at this item is buffer[item_start[k]:item_end[k]]
+	# (i.e., the texts of the item and of all its next lines, joined by ' ', with line breaks replaced by ' ').
+	
+	SEPARATOR = '\n' # never part of a text run, since line breaks are replaced by spaces
+
+	page		= None
+	buffer		= None
+	item_start	= None # item index -> offset of the text run starting at this item
+	item_end	= None # item index -> offset of the end of this text run
+	token_start	= None # sorted offsets of all words (non-whitespace tokens) in buffer
+	
+	
+	def __init__(self, page):
+		self.page = page
+		self.item_start = [None] * len(page.items)
+		self.item_end = [None] * len(page.items)
+		
+		# resolve next_id links once (first item wins, like a linear scan would do)
+		idx_by_id = {}
+		for k in range(len(page.items)):
+			if(page.items[k].this_id not in idx_by_id):
+				idx_by_id[page.items[k].this_id] = k
+		
+		next_idx = [idx_by_id.get(it.next_id) if it.next_id != -1 else None for it in page.items]
+		
+		is_successor = [False] * len(page.items)
+		for n in next_idx:
+			if(n is not None):
+				is_successor[n] = True
+		
+		# chain heads first, then anything not reachable from a head (cycles)
+		heads = [k for k in range(len(page.items)) if not is_successor[k]]
+		heads += [k for k in range(len(page.items)) if is_successor[k]]
+		
+		parts = []
+		length = 0
+		for h in heads:
+			if(self.item_start[h] is not None):
+				continue
+			chain = []
+			visited = set()
+			k = h
+			while(k is not None and k not in visited):
+				visited.add(k)
+				txt = page.items[k].txt.replace('\n', ' ')
+				if(len(chain) > 0):
+					parts.append(' ')
+					length += 1
+				if(self.item_start[k] is None):
+					self.item_start[k] = length
+					chain.append(k)
+				parts.append(txt)
+				length += len(txt)
+				k = next_idx[k]
+			for c in chain:
+				self.item_end[c] = length
+			parts.append(PageTextIndex.SEPARATOR)
+			length += 1
+			
+		self.buffer = ''.join(parts)
+		self.token_start = [m.start() for m in re.finditer(r'\S+', self.buffer)]
+		
+		
+	def find_all(self, txt):
+		res = []
+		pos = self.buffer.find(txt)
+		while(pos != -1):
+			res.append(pos)
+			pos = self.buffer.find(txt, pos + 1)
+		return res
+		
+		
+	def count_words(self, offset0, offset1):
+		# number of words in buffer[offset0:offset1], where offset0 is the start of a word
+		return bisect.bisect_left(self.token_start, offset1) - bisect.bisect_left(self.token_start, offset0)
+		
+		
+	def find_txt(self, txt):
+		# returns (item, word_index) for the first item (in page order) whose text run contains txt, and
+		# where the word_index is a valid index into the words of that item. None, if there is no such item.
+		occurrences = self.find_all(txt)
+		if(len(occurrences) == 0):
+			return None
+			
+		for k in range(len(self.page.items)):
+			start = self.item_start[k]
+			o = bisect.bisect_left(occurrences, start)
+			if(o == len(occurrences) or occurrences[o] + len(txt) > self.item_end[k]):
+				continue # substring not found
+			word_index = self.count_words(start, occurrences[o])
+			if(word_index >= len(self.page.items[k].words)):
+				continue # list index out of range
+			return self.page.items[k], word_index
+		return None
@@ -9,10 +9,7 @@ from globals import *
 
 
 class Rect:
-	x0 = None
-	x1 = None
-	y0 = None
-	y1 = None
+	__slots__ = ('x0', 'x1', 'y0', 'y1')
 
 
 	def __init__(self):
@@ -0,0 +1,161 @@
+# ============================================================================================================================
+# PDF_Analyzer
+# File   : SpatialIndex.py
+# Author : PDF_Analyzer maintainers
+# Date   : 19.10.2026
+#
+# Note   : 1 HTMLPage can have 1 SpatialIndex over its HTMLItems
+# Note   : The index is a snapshot of the item geometry. It must be rebuilt (or dropped), once items are moved, merged
+#          or split.
+# Note   : 1 HTMLPage can have 1 ItemGrid over the rectangles of its HTMLItems (rebuilt automatically, see HTMLPage.get_item_grid)
+# ============================================================================================================================
+
+from globals import *
+import bisect
+
+
+class SpatialIndex:
+	# For every alignment, the aligned x-positions of all items are kept in a sorted array (together with the
+	# item indices), so that all items within a threshold can be found by bisection in O(log n + k).
+	# The same is done for the y-positions for row queries.
+	
+	EPSILON = 1e-6 # candidates are searched in a slightly larger range, and then filtered exactly
+
+	num_items		= None
+	keys_x			= None # alignment -> sorted list of aligned x-positions
+	idx_x			= None # alignment -> item indices in the same order as keys_x
+	keys_y			= None # sorted list of pos_y
+	idx_y			= None # item indices in the same order as keys_y
+	max_height		= None
+	
+	
+	def __init__(self, items):
+		self.num_items = len(items)
+		self.keys_x = {}
+		self.idx_x = {}
+		
+		def aligned_x(it, align):
+			cur_x = it.pos_x
+			if(align == ALIGN_RIGHT):
+				cur_x += it.width
+			if(align == ALIGN_CENTER):
+				cur_x += it.width*0.5
+			return cur_x
+			
+		for align in (ALIGN_LEFT, ALIGN_RIGHT, ALIGN_CENTER, ALIGN_DEFAULT):
+			# ALIGN_DEFAULT means: each item with its own alignment
+			x = [(aligned_x(items[i], align if align != ALIGN_DEFAULT else items[i].alignment), i) for i in range(len(items))]
+			x.sort()
+			self.keys_x[align] = [k for k, i in x]
+			self.idx_x[align] = [i for k, i in x]
+			
+		y = sorted([(items[i].pos_y, i) for i in range(len(items))])
+		self.keys_y = [k for k, i in y]
+		self.idx_y = [i for k, i in y]
+		self.max_height = max([it.height for it in items], default=0)
+		
+		
+	def find_vertical_aligned(self, pos_x, alignment, threshold_px):
+		# returns (sorted) indices and aligned x-positions of all items with abs(cur_x - pos_x) <= threshold_px
+		keys = self.keys_x[alignment]
+		i0 = bisect.bisect_left(keys, pos_x - threshold_px - SpatialIndex.EPSILON)
+		i1 = bisect.bisect_right(keys, pos_x + threshold_px + SpatialIndex.EPSILON)
+		res = [(self.idx_x[alignment][i], keys[i]) for i in range(i0, i1) if abs(keys[i] - pos_x) <= threshold_px]
+		res.sort()
+		return res
+		
+		
+	def find_horizontal_aligned(self, y0, y1, items):
+		# returns (sorted) indices of all items with pos_y < y1 and pos_y + height > y0
+		i0 = bisect.bisect_left(self.keys_y, y0 - self.max_height - SpatialIndex.EPSILON)
+		i1 = bisect.bisect_left(self.keys_y, y1)
+		res = [self.idx_y[i] for i in range(i0, i1) if items[self.idx_y[i]].pos_y < y1 and items[self.idx_y[i]].pos_y + items[self.idx_y[i]].height > y0]
+		res.sort()
+		return res
+		
+		
+		
+class ItemGrid:
+	# Uniform grid over the rectangles of all items, used by HTMLPage.find_items_within_rect(_all_categories).
+	# Each item is registered in all cells, that its rectangle touches. A query returns all items registered
+	# in the cells touched by the query rectangle (a superset of all intersecting items).
+	# Items without a positive area are not registered, but always returned, so that the callers can apply
+	# exactly the same criteria as before.
+	
+	items_ref		= None # the list of items, that this grid was built for
+	num_items		= None
+	x0				= None
+	y0				= None
+	cell_width		= None
+	cell_height		= None
+	num_cols		= None
+	num_rows		= None
+	cells			= None # (col, row) -> list of item indices
+	irregular_idx	= None # indices of items without a positive area
+	
+	
+	def __init__(self, items):
+		self.items_ref = items
+		self.num_items = len(items)
+		self.cells = {}
+		self.irregular_idx = []
+		
+		regular_idx = []
+		for i in range(len(items)):
+			if(items[i].width > 0 and items[i].height > 0):
+				regular_idx.append(i)
+			else:
+				self.irregular_idx.append(i)
+				
+		self.x0 = min([items[i].pos_x for i in regular_idx], default=0)
+		self.y0 = min([items[i].pos_y for i in regular_idx], default=0)
+		x1 = max([items[i].pos_x + items[i].width for i in regular_idx], default=0)
+		y1 = max([items[i].pos_y + items[i].height for i in regular_idx], default=0)
+		
+		# about one item per cell
+		num_cells = max(1, int(math.sqrt(len(regular_idx))))
+		self.num_cols = num_cells
+		self.num_rows = num_cells
+		self.cell_width = max((x1 - self.x0) / self.num_cols, SpatialIndex.EPSILON)
+		self.cell_height = max((y1 - self.y0) / self.num_rows, SpatialIndex.EPSILON)
+		
+		for i in regular_idx:
+			it = items[i]
+			c0, c1 = self.get_col_range(it.pos_x, it.pos_x + it.width)
+			r0, r1 = self.get_row_range(it.pos_y, it.pos_y + it.height)
+			for c in range(c0, c1 + 1):
+				for r in range(r0, r1 + 1):
+					self.cells.setdefault((c, r), []).append(i)
+					
+					
+	@staticmethod
+	def get_cell_range(a0, a1, base, size, num):
+		def get_cell(a):
+			return min(max(int(math.floor((a - base) / size)), 0), num - 1)
+		return get_cell(a0), get_cell(a1)
+		
+	def get_col_range(self, x0, x1):
+		return ItemGrid.get_cell_range(x0, x1, self.x0, self.cell_width, self.num_cols)
+		
+	def get_row_range(self, y0, y1):
+		return ItemGrid.get_cell_range(y0, y1, self.y0, self.cell_height, self.num_rows)
+		
+		
+	def is_valid_for(self, items):
+		return self.items_ref is items and self.num_items == len(items)
+		
+	def is_equal_to(self, other): # only for debugging (see config.global_verify_indices)
+		return (self.x0, self.y0, self.cell_width, self.cell_height, self.num_cols, self.num_rows, self.cells, self.irregular_idx) == \
+			(other.x0, other.y0, other.cell_width, other.cell_height, other.num_cols, other.num_rows, other.cells, other.irregular_idx)
+		
+		
+	def find_candidates(self, rect):
+		# returns (sorted) indices of all items, that might intersect with rect
+		res = set(self.irregular_idx)
+		if(rect.x1 >= rect.x0 and rect.y1 >= rect.y0):
+			c0, c1 = self.get_col_range(rect.x0, rect.x1)
+			r0, r1 = self.get_row_range(rect.y0, rect.y1)
+			for c in range(c0, c1 + 1):
+				for r in range(r0, r1 + 1):
+					res.update(self.cells.get((c, r), []))
+		return sorted(res)
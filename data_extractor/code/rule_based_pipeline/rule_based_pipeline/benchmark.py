@@ -0,0 +1,176 @@
+# ============================================================================================================================
+# PDF_Analyzer
+# File   : benchmark.py
+# Author : PDF_Analyzer maintainers
+# Date   : 19.10.2026
+#
+# Note   : Measures the run-time of the single stages for an already converted PDF (i.e., a html_dir created by
+#          pdftohtml_mod, containing page*.html). Nothing in the html_dir is modified, all output goes to a temp dir.
+# Note   : With --fonts, loading the fonts of all items is compared with and without the font cache (see get_font).
+# Note   : With --json_dir, the page file formats (legacy jsonpickle vs. compact) are compared by size and load time.
+# Note   : With --logging, the time spent for formatting log messages that are not printed is measured.
+# ============================================================================================================================
+
+from globals import *
+import argparse
+import tempfile
+from HTMLDirectory import *
+from AnalyzerDirectory import *
+from test import * #only for the KPI specs
+import config
+
+
+def measure_best(func, repeat):
+	times = []
+	res = None
+	for i in range(repeat):
+		time_start = time.time()
+		res = func()
+		times.append(time.time() - time_start)
+	return res, min(times)
+	
+	
+def measure(desc, func, repeat):
+	res, best_time = measure_best(func, repeat)
+	print(desc.ljust(40) + ": " + "{:.3f}".format(best_time) + " sec (best of " + str(repeat) + ")")
+	return res
+	
+
+def benchmark_parse(html_dir, repeat):
+	def parse():
+		dir = HTMLDirectory()
+		dir.parse_html_directory(html_dir, 'page*.html')
+		return dir
+		
+	dir = measure("Parse HTML (" + str(get_num_of_files(html_dir + '/page*.html')) + " pages)", parse, repeat)
+	print("Cached fonts".ljust(40) + ": " + str(get_font.cache_info()))
+	
+	with tempfile.TemporaryDirectory() as out_dir:
+		measure("Render to PNG", lambda: dir.render_to_png(html_dir, out_dir), repeat)
+		measure("Save to JSON", lambda: dir.save_to_dir(out_dir), repeat)
+	return dir
+		
+		
+def benchmark_fonts(dir, repeat):
+	# replays the font requests of parse_html_file (font and widths of ' ' and 'x' for each item) with and without cache
+	fonts = [(it.font_file, it.font_size) for p in dir.htmlpages for it in p.items if it.font_file != '']
+	print("Font requests".ljust(40) + ": " + str(len(fonts)) + " (" + str(len(set(fonts))) + " distinct fonts and sizes)")
+	
+	def load_uncached():
+		for font_file, font_size in fonts:
+			font = ImageFont.truetype(font_file, font_size)
+			get_text_width(' ', font)
+			get_text_width('x', font)
+			
+	def load_cached():
+		get_font.cache_clear()
+		get_cached_text_width.cache_clear()
+		for font_file, font_size in fonts:
+			get_font(font_file, font_size)
+			get_cached_text_width(' ', font_file, font_size)
+			get_cached_text_width('x', font_file, font_size)
+			
+	measure("Load fonts (uncached)", load_uncached, repeat)
+	measure("Load fonts (cached)", load_cached, repeat)
+		
+		
+def benchmark_page_format(json_dir, repeat):
+	files = HTMLDirectory.sort_by_page_num(glob.glob(json_dir + '/jpage*.json'))
+	pages = [HTMLPage.load_from_file(f) for f in files]
+	print("Pages".ljust(40) + ": " + str(len(pages)) + " (" + str(sum([len(p.items) for p in pages])) + " items)")
+	
+	formats = [('jsonpickle', lambda p: p.to_json()), ('compact v' + str(PageSerializer.FORMAT_VERSION), PageSerializer.dumps)]
+	
+	with tempfile.TemporaryDirectory() as out_dir:
+		for name, dumps in formats:
+			fnames = [out_dir + '/' + name.replace(' ', '_') + '_' + os.path.basename(f) for f in files]
+			def save_all():
+				for p, fname in zip(pages, fnames):
+					save_txt_to_file(dumps(p), fname)
+					
+			measure("Save (" + name + ")", save_all, repeat)
+			size = sum([os.path.getsize(f) for f in fnames])
+			print(("Size (" + name + ")").ljust(40) + ": " + "{:.3f}".format(size / 1e6) + " MB")
+			measure("Load (" + name + ")", lambda: [HTMLPage.load_from_file(f) for f in fnames], repeat)
+		
+
+def print_verbose_format_discarded(verbosity, txt, *args):
+	# the old behaviour of print_verbose: all messages were formatted, even if they were not printed
+	msg = format_verbose(txt, args)
+	if(verbosity <= config.global_verbosity):
+		print(str(msg))
+		
+
+def replace_print_verbose(old_func, new_func):
+	# all modules import print_verbose via "from globals import *", hence it is replaced in each of them
+	for module in list(sys.modules.values()):
+		if(getattr(module, 'print_verbose', None) is old_func):
+			module.print_verbose = new_func
+	
+
+def benchmark_logging(html_dir, repeat):
+	kpis = test_prepare_kpispecs()
+	page_workers = config.global_page_workers
+	config.global_page_workers = 1 # print_verbose is only replaced in this process
+	
+	def parse_and_analyze():
+		dir = HTMLDirectory()
+		dir.parse_html_directory(html_dir, 'page*.html')
+		ana = AnalyzerDirectory(dir, 2019)
+		ana.find_multiple_kpis(kpis)
+		
+	times = []
+	orig_print_verbose = print_verbose # (this module's print_verbose is replaced as well)
+	for format_discarded in (False, True):
+		if(format_discarded):
+			replace_print_verbose(orig_print_verbose, print_verbose_format_discarded)
+		try:
+			dummy, best_time = measure_best(parse_and_analyze, repeat)
+		finally:
+			replace_print_verbose(print_verbose_format_discarded, orig_print_verbose)
+		print(("Parse + analyze (" + ("format" if format_discarded else "skip") + " discarded msgs)").ljust(40) + ": " + "{:.3f}".format(best_time) + " sec (best of " + str(repeat) + ")")
+		times.append(best_time)
+	config.global_page_workers = page_workers
+	print("Formatting discarded messages".ljust(40) + ": " + "{:.3f}".format(times[1] - times[0]) + " sec (" + "{:.1f}".format(100.0 * (times[1] - times[0]) / times[1]) + "% of the run-time before)")
+	
+
+def main():
+	parser = argparse.ArgumentParser(description='Benchmark of the rule-based pipeline stages')
+	parser.add_argument('--html_dir',
+						type=str,
+						default=None,
+						help='Folder created by pdftohtml_mod, containing page*.html')
+	parser.add_argument('--json_dir',
+						type=str,
+						default=None,
+						help='Folder containing jpage*.json (e.g., a html_dir after analyzing), to compare the page file formats')
+	parser.add_argument('--fonts',
+						action='store_true',
+						help='Compare loading the fonts of all items with and without the font cache (needs --html_dir)')
+	parser.add_argument('--logging',
+						action='store_true',
+						help='Measure the time spent for formatting log messages that are not printed (needs --html_dir)')
+	parser.add_argument('--repeat',
+						type=int,
+						default=3,
+						help='Number of repetitions per stage')
+	args = parser.parse_args()
+	
+	config.global_verbosity = 0
+	path = remove_trailing_slash(os.path.dirname(os.path.realpath(__file__))).replace('\\', '/')
+	config.global_exec_folder = path + r'/'
+	config.global_rendering_font_override = path + r'/' + config.global_rendering_font_override
+	config.global_approx_font_name = path + r'/' + config.global_approx_font_name
+	
+	if(args.html_dir is not None):
+		dir = benchmark_parse(remove_trailing_slash(args.html_dir), args.repeat)
+		if(args.fonts):
+			benchmark_fonts(dir, args.repeat)
+		if(args.logging):
+			benchmark_logging(remove_trailing_slash(args.html_dir), args.repeat)
+	if(args.json_dir is not None):
+		benchmark_page_format(remove_trailing_slash(args.json_dir), args.repeat)
+	
+
+if __name__ == '__main__':
+	main()
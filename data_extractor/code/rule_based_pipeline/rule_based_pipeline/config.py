@@ -21,7 +21,7 @@ global_output_folder = r"output/"
 global_kpi_spec_path 	= ""  # if set, then command line argument will be ignored; example: "kpispec.txt"
 global_rendering_font_override = r"default_font.otf"
 global_approx_font_name		=r"default_font.otf" # use this font as approximation
-global_max_identify_complex_items_timeout = 0.5 # seconds
+global_max_identify_complex_items_recursions = 10000 # max. number of Backtracking steps per table in HTMLTable.identify_overlapping_special_items (afterwards, any minimal solution is used)
 
 global_force_special_items_into_table = True
 global_row_connection_threshold = 10.0 #default=5 . If there is empty space for that many times the previous row height, we will consider this as two distinct tables
@@ -35,4 +35,10 @@ global_html_encoding = "utf-8" # default: "ascii"
 
 global_ignore_all_years = True # default: False. Set it to true to ignore all years for every KPI (this is used for CDP reports)
 
-global_analyze_multiple_pages_at_one = True # default: False. Set it to True, to additionally search for KPIs on multiple (currently: 2) subsequent pages at once.
\ No newline at end of file
+global_analyze_multiple_pages_at_one = True # default: False. Set it to True, to additionally search for KPIs on multiple (currently: 2) subsequent pages at once.
+
+global_page_workers = 0 # default: 0. Number of processes used for parsing, rendering and saving the pages of one PDF (1=sequential, 0=all cores, shared by the PDFs analyzed in parallel if resolve_page_workers is used)
+
+global_render_png = False # default: False. Set it to True, to render each page with its tables and items to output*.png (only for debugging, not needed for KPI extraction)
+
+global_verify_indices = False # default: False. Set it to True, to check on each use, that the cached ItemGrid / LineIndex of a page still match its items (slow, only for debugging)
@@ -21,6 +21,8 @@ import html
 import shutil
 import config
 import math
+import functools
+from concurrent.futures import ProcessPoolExecutor
 
 
 ALIGN_DEFAULT 			= 0
@@ -47,6 +49,10 @@ DEFAULT_SPECIAL_ITEM_MAX_DIST		= 15.0 / 609.0 #609px is sample page width
 DEFAULT_HTHROWAWAY_DIST 			= 0.3
 DEFAULT_SPECIAL_ITEM_CUTOFF_DIST 	= 15.0 / 609.9 #609px is sample page width
 DEFAULT_FLYSPECK_HEIGHT				= 3.0 / 841.0 #841.0 is sampe page height
+ALIGNMENT_SCORE_CHUNK_SIZE			= 256 # number of items, whose alignment scores are calculated at once
+FONT_CACHE_SIZE						= 512 # max. number of loaded fonts (i.e., font file and size) kept per process
+TEXT_WIDTH_CACHE_SIZE				= 4096 # max. number of cached text widths per process (see get_cached_text_width)
+FORMAT_ANALYZER_CACHE_SIZE			= 65536 # max. number of cached results per Format_Analyzer predicate (e.g., looks_numeric)
 
 
 # Rendering options
@@ -77,10 +83,40 @@ def print_big(txt, do_wait = True):
 
 
 		
-def print_verbose(verbosity, txt):
+def print_verbose(verbosity, txt, *args):
+	# txt can be a callable (e.g., lambda: 'x=' + str(x)) or a %-format string with args. Then, it is only formatted,
+	# if it is actually printed. Use this for all messages, that are expensive to build.
 	if(verbosity <= config.global_verbosity):
-		print(str(txt))
+		print(str(format_verbose(txt, args)))
 		
+def format_verbose(txt, args):
+	if(callable(txt)):
+		return txt()
+	if(len(args) > 0):
+		return txt % args
+	return txt
+		
+# process-wide counters (e.g., how often a search budget was exhausted), collected from worker processes by
+# run_in_process_pool and exported by main.py
+metrics = {}
+
+def add_metric(name, value=1):
+	metrics[name] = metrics.get(name, 0) + value
+	
+def add_metrics(other):
+	for name, value in other.items():
+		add_metric(name, value)
+		
+def reset_metrics():
+	metrics.clear()
+	
+def get_metrics():
+	return dict(metrics)
+
+def print_metrics(verbosity, title):
+	for name in sorted(metrics.keys()):
+		print_verbose(verbosity, title + name + " = " + str(metrics[name]))
+			
 def print_subset(verbosity, list, subset):
 	for s in subset:
 		print_verbose(verbosity, list[s])
@@ -110,6 +146,16 @@ def get_text_width(text,  font):
 	size = font.getsize(text)
 	return size[0]
 
+# Loading a font from disk is expensive, and the same few fonts are used for thousands of spans and items.
+# Hence, fonts and the widths of frequently measured texts are cached (per process, bounded, see FONT_CACHE_SIZE).
+@functools.lru_cache(maxsize=FONT_CACHE_SIZE)
+def get_font(font_file, font_size):
+	return ImageFont.truetype(font_file, font_size)
+	
+@functools.lru_cache(maxsize=TEXT_WIDTH_CACHE_SIZE)
+def get_cached_text_width(text, font_file, font_size): # only use this for a small set of texts, e.g. ' ' and 'x'
+	return get_text_width(text, get_font(font_file, font_size))
+
 def get_html_out_dir(fname):
 	fname = '/'+ fname.replace('\\','/')
 	return config.global_working_folder + r'html/' + fname[(fname.rfind(r'/')+1):] + r'.html_dir' 
@@ -123,6 +169,41 @@ def save_txt_to_file(txt, fname):
 	with open(fname, "w", encoding="utf-8") as text_file:
 		text_file.write(txt)
 
+def get_config_globals():
+	return {k: v for k, v in vars(config).items() if k.startswith('global_')}
+	
+def init_worker(config_globals):
+	# worker processes need the same configuration as the main process (e.g., if they are spawned, not forked)
+	for k, v in config_globals.items():
+		setattr(config, k, v)
+
+def resolve_page_workers(num_pdf_workers):
+	# config.global_page_workers = 0 means: use all cores, shared by the PDFs that are analyzed in parallel
+	if(config.global_page_workers <= 0):
+		config.global_page_workers = max(1, (os.cpu_count() or 1) // max(num_pdf_workers, 1))
+	return config.global_page_workers
+
+def call_with_metrics(func, *args):
+	# runs in a worker process: returns the result of func(*args) and the metrics counted meanwhile
+	reset_metrics()
+	res = func(*args)
+	return res, get_metrics()
+
+def run_in_process_pool(func, args_list, num_workers):
+	# calls func(*args) for each args in args_list, and returns the results in the same order as args_list
+	if(num_workers <= 0):
+		num_workers = os.cpu_count() or 1 # 0 = all cores (for callers, that have not used resolve_page_workers)
+	if(num_workers <= 1 or len(args_list) <= 1):
+		return [func(*args) for args in args_list]
+	with ProcessPoolExecutor(max_workers=min(num_workers, len(args_list)), initializer=init_worker, initargs=(get_config_globals(),)) as executor:
+		futures = [executor.submit(call_with_metrics, func, *args) for args in args_list]
+		res = []
+		for f in futures:
+			cur_res, cur_metrics = f.result()
+			add_metrics(cur_metrics)
+			res.append(cur_res)
+		return res
+
 	
 def hsv_to_rgba(h, s, v): #h,s,v in [0,1], result r,g,b,a in [0,256)
 	if s == 0.0: return (v, v, v)
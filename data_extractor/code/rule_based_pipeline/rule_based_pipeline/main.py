@@ -17,6 +17,7 @@ from TestData import *
 from DataImportExport import *
 from test import * #only for testing / debugging purpose
 import config
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 
 	
@@ -65,7 +66,8 @@ def analyze_pdf(pdf_file, kpis, default_year, info_file_contents, wildcard_restr
 		dir = HTMLDirectory()
 		if(force_parse_pdf or get_num_of_files(htmldir_path+'/jpage*.json') != get_num_of_files(htmldir_path+'/page*.html') ): 
 			dir.parse_html_directory(get_html_out_dir(pdf_file), 'page*.html') # ! page*
-			dir.render_to_png(htmldir_path, htmldir_path)
+			if(config.global_render_png):
+				dir.render_to_png(htmldir_path, htmldir_path)
 			dir.save_to_dir(htmldir_path)
 			#exit() #TODO: Remove this!!!!!
 			if(wildcard_restrict_page == '*'):
@@ -87,6 +89,7 @@ def analyze_pdf(pdf_file, kpis, default_year, info_file_contents, wildcard_restr
 	#print(kpis)
 	
 	kpiresults = KPIResultSet(ana.find_multiple_kpis(kpis))
+	Format_Analyzer.print_cache_stats(5)
 	
 	
 	print_big("FINAL RESULT FOR: "+ str(pdf_file.upper()), do_wait = False)
@@ -96,6 +99,14 @@ def analyze_pdf(pdf_file, kpis, default_year, info_file_contents, wildcard_restr
 	
 	
 	
+def analyze_pdf_timed(pdf, kpis, default_year, info_file_contents):
+	time_start = time.time()
+	reset_metrics()
+	Format_Analyzer.clear_caches() # cached results are only reused within one PDF
+	kpiresults = analyze_pdf(config.global_raw_pdf_folder + pdf, kpis, default_year, info_file_contents, wildcard_restrict_page='*', assume_conversion_done=False, force_parse_pdf=False) ### TODO:  Modify * in order to analyze specfic page, e.g.:  *00042 ###
+	return kpiresults, time.time() - time_start, get_metrics()
+	
+	
 def get_input_variable(val, desc):
 	if val is None:
 		val = input(desc)
@@ -129,11 +140,26 @@ def main():
 						type=int,
 						default=1,
 						help='Verbosity level (0=shut up)')
+	parser.add_argument('--workers',
+						type=int,
+						default=1,
+						help='Number of PDFs analyzed in parallel (1=sequential)')
+	parser.add_argument('--page_workers',
+						type=int,
+						default=None,
+						help='Number of processes used for the pages of one PDF (1=sequential, 0=all cores; default: config.global_page_workers)')
+	parser.add_argument('--render_png', '--render-png',
+						action='store_true',
+						help='Render each page with its tables and items to output*.png (only for debugging; default: config.global_render_png)')
 	args = parser.parse_args()
 	config.global_raw_pdf_folder = remove_trailing_slash(get_input_variable(args.raw_pdf_folder, "What is the raw pdf folder?")).replace('\\', '/') + r'/'
 	config.global_working_folder = remove_trailing_slash(get_input_variable(args.working_folder, "What is the working folder?")).replace('\\', '/') + r'/'
 	config.global_output_folder =  remove_trailing_slash(get_input_variable(args.output_folder, "What is the output folder?")).replace('\\', '/') + r'/'
 	config.global_verbosity = args.verbosity
+	config.global_render_png = args.render_png or config.global_render_png
+	if(args.page_workers is not None):
+		config.global_page_workers = args.page_workers
+	resolve_page_workers(args.workers)
 	
 	os.makedirs(config.global_working_folder, exist_ok=True)
 	os.makedirs(config.global_output_folder, exist_ok=True)
@@ -154,6 +180,8 @@ def main():
 	print_verbose(1, "Using config.global_working_folder=" + config.global_working_folder)
 	print_verbose(1, "Using config.global_output_folder=" + config.global_output_folder)
 	print_verbose(1, "Using config.global_verbosity=" + str(config.global_verbosity))
+	print_verbose(1, "Using config.global_render_png=" + str(config.global_render_png))
+	print_verbose(1, "Using config.global_page_workers=" + str(config.global_page_workers))
 	print_verbose(5, "Using config.global_rendering_font_override=" + config.global_rendering_font_override)
 
 	#test_data = load_test_data(r'test_data/aggregated_complete_samples_new.csv')
@@ -183,20 +211,40 @@ def main():
 
 	kpis = test_prepare_kpispecs() # TODO: In the future, KPI specs should be loaded from "nicer" implemented source, e.g., JSON file definiton
 	
-	overall_kpiresults = KPIResultSet()
+	overall_kpiresults = KPIResultSet(kpimeasures = [])
 	
 	info_file_contents = DataImportExport.load_info_file_contents(remove_trailing_slash(config.global_working_folder) + '/info.json')
 	
 	time_start = time.time()
 	
-	for pdf in pdfs:
+	def save_pdf_results(pdf, cur_kpiresults):
 		kpiresults = KPIResultSet(kpimeasures = [])
-		cur_kpiresults = analyze_pdf(config.global_raw_pdf_folder + pdf, kpis, DEFAULT_YEAR, info_file_contents, wildcard_restrict_page='*', assume_conversion_done=False, force_parse_pdf=False) ### TODO:  Modify * in order to analyze specfic page, e.g.:  *00042 ###
 		kpiresults.extend(cur_kpiresults)
-		overall_kpiresults.extend(cur_kpiresults)
 		kpiresults.save_to_csv_file(config.global_output_folder + pdf + r'.csv')
 		print_verbose(1, "RESULT FOR " + pdf)
 		print_verbose(1, kpiresults)
+	
+	pdf_kpiresults = {}
+	pdf_times = {}
+	pdf_metrics = {}
+	
+	if(args.workers <= 1):
+		for pdf in pdfs:
+			pdf_kpiresults[pdf], pdf_times[pdf], pdf_metrics[pdf] = analyze_pdf_timed(pdf, kpis, DEFAULT_YEAR, info_file_contents)
+			save_pdf_results(pdf, pdf_kpiresults[pdf])
+	else:
+		with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=(get_config_globals(),)) as executor:
+			futures = {executor.submit(analyze_pdf_timed, pdf, kpis, DEFAULT_YEAR, info_file_contents): pdf for pdf in pdfs}
+			for future in as_completed(futures):
+				pdf = futures[future]
+				pdf_kpiresults[pdf], pdf_times[pdf], pdf_metrics[pdf] = future.result()
+				save_pdf_results(pdf, pdf_kpiresults[pdf]) # write results of each PDF as soon as it is finished
+	
+	# merge in the original PDF order
+	reset_metrics()
+	for pdf in pdfs:
+		overall_kpiresults.extend(pdf_kpiresults[pdf])
+		add_metrics(pdf_metrics[pdf])
 
 
 		
@@ -208,15 +256,23 @@ def main():
 	#overall_kpiresults.save_to_file(config.global_output_folder + r'kpiresults_test_tmp.json')
 	overall_kpiresults.save_to_csv_file(config.global_output_folder + r'kpiresults_tmp.csv')
 	
+	# export metrics (e.g., how often search budgets were exhausted), per PDF and in total
+	with open(config.global_output_folder + r'metrics_tmp.json', 'w') as f:
+		json.dump({'pdfs': pdf_metrics, 'total': get_metrics()}, f, indent=4, sort_keys=True)
+	
 	
 	total_time = time_finish - time_start
-	print_verbose(1, "Total run-time: " + str(total_time) + " sec ( " + str(total_time / max(len(pdfs), 1)) + " sec per PDF)")
+	for pdf in pdfs:
+		print_verbose(1, "Run-time for " + pdf + ": " + str(pdf_times[pdf]) + " sec")
+	print_verbose(1, "Total run-time: " + str(total_time) + " sec ( " + str(total_time / max(len(pdfs), 1)) + " sec per PDF, " + str(args.workers) + " worker(s))")
+	print_metrics(1, "Metric: ")
 	
 
 	
 	
 
-main()	
+if __name__ == '__main__':
+	main()	
 
 
 
@@ -10,6 +10,7 @@ from globals import *
 import argparse
 from HTMLDirectory import *
 from HTMLPage import *
+from PageTextIndex import *
 from TestData import *
 from test import *
 import config
@@ -25,16 +26,11 @@ def generate_dummy_test_data():
 	
 	return test_data
 
-def analyze_pdf(pdf_file, pageNum, txt, info_file_contents, force_pdf_convert=False, force_parse_pdf=False, assume_conversion_done=False, do_wait=False):
-	
-	print_verbose(1, "Analyzing PDF: " +str(pdf_file))
+def prepare_pdf(pdf_file, info_file_contents, force_pdf_convert=False, force_parse_pdf=False, assume_conversion_done=False, do_wait=False):
 	
 	htmldir_path = get_html_out_dir(pdf_file)#get pdf  
 	os.makedirs(htmldir_path, exist_ok=True) #ceate directory recursively
 	
-	reload_neccessary = True # why use this?
-	
-	dir = HTMLDirectory()
 	if(not assume_conversion_done):
 		#convert pdf to html
 		print_big("Convert PDF to HTML", do_wait)
@@ -44,63 +40,68 @@ def analyze_pdf(pdf_file, pageNum, txt, info_file_contents, force_pdf_convert=Fa
 		# parse and create json and png
 		print_big("Convert HTML to JSON and PNG", do_wait)
 
-		#dir = HTMLDirectory()
+		dir = HTMLDirectory()
 		if(force_parse_pdf or get_num_of_files(htmldir_path+'/jpage*.json') != get_num_of_files(htmldir_path+'/page*.html') ): 
 			dir.parse_html_directory(get_html_out_dir(pdf_file), 'page*.html') # ! page*
-			dir.render_to_png(htmldir_path, htmldir_path)
+			if(config.global_render_png):
+				dir.render_to_png(htmldir_path, htmldir_path)
 			dir.save_to_dir(htmldir_path)
+	
+	return htmldir_path
 
-				
+def load_pages(htmldir_path, page_nums):
+	# load each required page exactly once, even if it is requested by many answers
+	dir = HTMLDirectory()
+	for page_num in sorted(set(page_nums)):
+		dir.load_from_dir(htmldir_path, 'jpage' + "{:05d}".format(page_num) + '.json')
+	
+	res = {}
+	for p in dir.htmlpages:
+		res[p.page_num] = p
+	return res
+
+def find_txt_in_page_index(page, page_index, txt):
+	print_verbose(2, "looking for: " + txt)
+	found = page_index.find_txt(txt)
+	if(found is None):
+		print_verbose(2, "substring not found")
+		return []
+	i, wordIndex = found
+	print_verbose(2, "wordIndex:" )
+	print_verbose(2, wordIndex)
+	res = [i.words[wordIndex].rect.get_coordinates()[0]/page.page_width, i.words[wordIndex].rect.get_coordinates()[1]/page.page_height]
+	print_verbose(2, res)
+	##### TODO: Also compare the paragraph from the CSV, in order to get the best result if we have multiple matches !!!
+	return res
+
+def analyze_pdf_batch(pdf_file, queries, info_file_contents, force_pdf_convert=False, force_parse_pdf=False, assume_conversion_done=False, do_wait=False):
+	# queries : list of (page_num, txt)
+	# returns : list of coordinates [x, y] (or [] if not found), in the same order as queries
+	
+	print_verbose(1, "Analyzing PDF: " +str(pdf_file))
+	
+	htmldir_path = prepare_pdf(pdf_file, info_file_contents, force_pdf_convert, force_parse_pdf, assume_conversion_done, do_wait)
 
 	# load json files
 	print_big("Load from JSON", do_wait)
-	if(reload_neccessary):
-		dir = HTMLDirectory() 
-		dir.load_from_dir(htmldir_path, 'jpage*' + str(pageNum) + '.json')
-	
+	pages = load_pages(htmldir_path, [page_num for page_num, txt in queries])
 
 	# get coordinates
 	print_big("get coordinates", do_wait)
+	page_indices = {}
 	res = []
-	index = None
-	this_id = 0
-	for p in dir.htmlpages:
-		#print_verbose(2, p.page_num)
-		if(p.page_num == pageNum):
-			for i in p.items:
-				contxt = concat_Nitem(i,p)
-				print_verbose(2, "\n\ncontxt:")
-				print_verbose(2, contxt)
-				try:
-					print_verbose(2, "looking for: " + txt)
-					index = contxt.index(txt) #get the index substing's first letter 
-					wordIndex = len(contxt[:index].strip().split()) #get str before substring's 1st letter, split it by word，length = index of substring's 1st word
-					print_verbose(2, "wordIndex:" )
-					print_verbose(2, wordIndex)
-					#print_verbose(2, "input txt:" + txt)
-					res.extend((i.words[wordIndex].rect.get_coordinates()[0]/p.page_width,i.words[wordIndex].rect.get_coordinates()[1]/p.page_height))
-					print_verbose(2, res)
-					##### TODO: Also compare the paragraph from the CSV, in order to get the best result if we have multiple matches !!!
-					return res
-					#if(i.txt == txt):
-					#res.extend(i.get_coordis()) #result[158.27,115.37]
-				except ValueError:
-					print_verbose(2, "substring not found")
-				except IndexError:
-					print_verbose(2, "list index out of range")
+	for page_num, txt in queries:
+		if(page_num not in pages):
+			res.append([])
+			continue
+		if(page_num not in page_indices):
+			page_indices[page_num] = PageTextIndex(pages[page_num])
+		res.append(find_txt_in_page_index(pages[page_num], page_indices[page_num], txt))
 	return res
-	
-def concat_Nitem(item,page):
-	res = item.txt
-	cur_item = item
-	while(cur_item.next_id != -1):
-		for i in page.items:
-			if(i.this_id == cur_item.next_id): #identify the next line of item
-				res += ' ' + i.txt
-				cur_item = i #update condition of while
-				break
-	return res.replace('\n', ' ')
 
+def analyze_pdf(pdf_file, pageNum, txt, info_file_contents, force_pdf_convert=False, force_parse_pdf=False, assume_conversion_done=False, do_wait=False):
+	return analyze_pdf_batch(pdf_file, [(pageNum, txt)], info_file_contents, force_pdf_convert, force_parse_pdf, assume_conversion_done, do_wait)[0]
+	
 def get_input_variable(val, desc):
 	if val is None:
 		val = input(desc)
@@ -120,16 +121,26 @@ def get_input_variable(val, desc):
 	
 def modify_csv(csv, info_file_contents):
 	csvPD = pd.read_csv(csv, encoding='utf-8') #Building a csv reader
-	coordis = None
+	
+	# group all answers without coordinates by pdf, so that each pdf is only loaded once
+	rows_by_pdf = {}
 	for c in range(len(csvPD)): #check columns
 		#print(str(c) + str(csvPD['PDF_NAME'][c]))
 		if str(csvPD['POS_X'][c])=="nan" or str(csvPD['POS_Y'][c]) == "nan":
-			coordis = analyze_pdf(config.global_raw_pdf_folder + str(csvPD['PDF_NAME'][c]), int(csvPD['PAGE'][c]), str(csvPD['ANSWER_RAW'][c]), info_file_contents, assume_conversion_done=False, force_parse_pdf=False)
+			pdf_name = str(csvPD['PDF_NAME'][c])
+			if(pdf_name not in rows_by_pdf):
+				rows_by_pdf[pdf_name] = []
+			rows_by_pdf[pdf_name].append(c)
+	
+	for pdf_name, rows in rows_by_pdf.items():
+		queries = [(int(csvPD['PAGE'][c]), str(csvPD['ANSWER_RAW'][c])) for c in rows]
+		all_coordis = analyze_pdf_batch(config.global_raw_pdf_folder + pdf_name, queries, info_file_contents, assume_conversion_done=False, force_parse_pdf=False)
+		for c, coordis in zip(rows, all_coordis):
 			print_verbose(2, "coord:")
 			print_verbose(2, coordis)
 			if(len(coordis)>0):
-				csvPD['POS_X'][c] = coordis[0]
-				csvPD['POS_Y'][c] = coordis[1]
+				csvPD.loc[c, 'POS_X'] = coordis[0]
+				csvPD.loc[c, 'POS_Y'] = coordis[1]
 			#df = pd.DataFrame(coordis, encoding = 'utf-8-sig') #initical data as dataframe
 	csvPD.to_csv(csv, index=False)
 	print_verbose(2, csvPD.to_csv(csv, index=False))
@@ -175,6 +186,13 @@ def main():
 						type=int,
 						default=1,
 						help='Verbosity level (0=shut up)')	
+	parser.add_argument('--page_workers',
+						type=int,
+						default=None,
+						help='Number of processes used for the pages of one PDF (1=sequential, 0=all cores; default: config.global_page_workers)')
+	parser.add_argument('--render_png', '--render-png',
+						action='store_true',
+						help='Render each page with its tables and items to output*.png (only for debugging; default: config.global_render_png)')
 
 	args = parser.parse_args()
 	config.global_raw_pdf_folder = remove_trailing_slash(get_input_variable(args.raw_pdf_folder, "What is the raw pdf folder?")).replace('\\', '/') + r'/'
@@ -185,6 +203,10 @@ def main():
 	#config.global_text = get_input_variable(args.text, "For which text do you want to find the x, y coordinates?")
 	config.global_output_folder =  remove_trailing_slash(get_input_variable(args.output_folder, "What is the output folder?")).replace('\\', '/') + r'/'
 	config.global_verbosity = args.verbosity
+	config.global_render_png = args.render_png or config.global_render_png
+	if(args.page_workers is not None):
+		config.global_page_workers = args.page_workers
+	resolve_page_workers(1)
 	
 	os.makedirs(config.global_working_folder, exist_ok=True)
 	os.makedirs(config.global_output_folder, exist_ok=True)
@@ -205,6 +227,8 @@ def main():
 	print_verbose(1, "Using config.global_working_folder=" + config.global_working_folder)
 	print_verbose(1, "Using config.global_output_folder=" + config.global_output_folder)
 	print_verbose(1, "Using config.global_verbosity=" + str(config.global_verbosity))
+	print_verbose(1, "Using config.global_render_png=" + str(config.global_render_png))
+	print_verbose(1, "Using config.global_page_workers=" + str(config.global_page_workers))
 	print_verbose(5, "Using config.global_rendering_font_override=" + config.global_rendering_font_override)
 
 	test_data = generate_dummy_test_data()
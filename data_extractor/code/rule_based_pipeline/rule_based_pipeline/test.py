@@ -50,7 +50,7 @@ def test_save_json(dir):
 	
 def test_print_all_clusters(htmldir):
 	for p in htmldir.htmlpages:
-		print(p.clusters_text)
+		print(p.get_clusters(CLUSTER_DISTANCE_MODE_RAW_TEXT))
 
 
 
@@ -0,0 +1,31 @@
+import importlib
+import sys
+import typing
+from pathlib import Path
+import pytest
+
+
+path_rule_based_pipeline = (Path(__file__).parents[2] / 'rule_based_pipeline' / 'rule_based_pipeline').resolve()
+
+
+@pytest.fixture(scope='module')
+def rule_based_pipeline() -> typing.Callable:
+    """Fixture making the modules of the rule-based pipeline importable for the tests of one test module
+
+    The rule-based pipeline is not a package and its modules import each other by name (e.g. config, globals, main).
+    Hence, its folder is only added to sys.path while the test module runs, and all modules imported from there are
+    removed from sys.modules afterwards, so that they cannot shadow equally named modules in other tests.
+
+    :return: Function importing a module of the rule-based pipeline by name
+    :rtype: typing.Callable
+    :yield: Function importing a module of the rule-based pipeline by name
+    :rtype: Iterator[typing.Callable]
+    """
+    modules_before = set(sys.modules)
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.syspath_prepend(str(path_rule_based_pipeline))
+        yield importlib.import_module
+    for name in set(sys.modules) - modules_before:
+        module_file = getattr(sys.modules[name], '__file__', None)
+        if module_file is not None and Path(module_file).resolve().parent == path_rule_based_pipeline:
+            del sys.modules[name]
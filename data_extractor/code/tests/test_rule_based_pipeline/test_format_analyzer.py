@@ -0,0 +1,51 @@
+import types
+import pytest
+
+
+@pytest.fixture(scope='module')
+def format_analyzer(rule_based_pipeline) -> types.ModuleType:
+    """Fixture for the module Format_Analyzer of the rule-based pipeline
+
+    :return: Module Format_Analyzer
+    :rtype: types.ModuleType
+    """
+    return rule_based_pipeline('Format_Analyzer')
+
+
+sample_texts = ['', ' ', '2019', '2019/20', 'FY 2020', '31.12.2020', '2020/12/31', '1,234.5', '(12.3)', '-', 'n/a',
+                '12) see note', '42', '0', 'WLTP 123', '15 %', 'Scope 1 emissions', 'abc', 'x1',
+                'This is a long sentence, which looks like running text. It has commas, and full stops. Really.']
+
+
+@pytest.mark.parametrize('txt', sample_texts)
+def test_cached_predicates(format_analyzer: types.ModuleType, txt: str):
+    """Tests if the cached predicates return the same results as the uncached ones, also for repeated calls
+
+    :param format_analyzer: Module Format_Analyzer
+    :type format_analyzer: types.ModuleType
+    :param txt: Text to be analyzed
+    :type txt: str
+    """
+    format_analyzer.Format_Analyzer.clear_caches()
+    for func in format_analyzer.cached_predicates:
+        if func.__name__ == 'to_year' and not any(c.isdigit() for c in txt):
+            continue
+        expected = func.__wrapped__(txt)
+        for i in range(2):
+            res = func(txt)
+            assert bool(res) == bool(expected)
+            assert res == expected or (hasattr(res, 'group') and res.group() == expected.group())
+
+
+def test_clear_caches(format_analyzer: types.ModuleType):
+    """Tests if clear_caches empties the caches of all predicates
+
+    :param format_analyzer: Module Format_Analyzer
+    :type format_analyzer: types.ModuleType
+    """
+    format_analyzer.Format_Analyzer.looks_numeric('1,234.5')
+    format_analyzer.Format_Analyzer.looks_year('2019')
+
+    format_analyzer.Format_Analyzer.clear_caches()
+
+    assert all(func.cache_info().currsize == 0 for func in format_analyzer.cached_predicates)
@@ -0,0 +1,49 @@
+import types
+import pytest
+
+
+@pytest.fixture(scope='module')
+def rb_globals(rule_based_pipeline) -> types.ModuleType:
+    """Fixture for the module globals of the rule-based pipeline
+
+    :return: Module globals
+    :rtype: types.ModuleType
+    """
+    return rule_based_pipeline('globals')
+
+
+@pytest.mark.parametrize('num_workers, expected_max_workers', [
+    (0, 4),
+    (-1, 4),
+    (1, None),
+    (2, 2),
+    (8, 5),
+])
+def test_run_in_process_pool(rb_globals: types.ModuleType, monkeypatch: pytest.MonkeyPatch, num_workers: int,
+                             expected_max_workers: int):
+    """Tests if run_in_process_pool uses all cores for num_workers <= 0 (like config.global_page_workers = 0, if
+    resolve_page_workers has not been called), runs sequentially for num_workers = 1 and keeps the order of the results
+
+    :param rb_globals: Module globals
+    :type rb_globals: types.ModuleType
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: pytest.MonkeyPatch
+    :param num_workers: Number of worker processes passed to run_in_process_pool
+    :type num_workers: int
+    :param expected_max_workers: Expected number of processes of the pool, or None, if no pool should be used
+    :type expected_max_workers: int
+    """
+    used_max_workers = []
+
+    class RecordingProcessPoolExecutor(rb_globals.ProcessPoolExecutor):
+        def __init__(self, max_workers, **kwargs):
+            used_max_workers.append(max_workers)
+            super().__init__(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(rb_globals, 'ProcessPoolExecutor', RecordingProcessPoolExecutor)
+    monkeypatch.setattr(rb_globals.os, 'cpu_count', lambda: 4)
+
+    res = rb_globals.run_in_process_pool(abs, [(-1,), (2,), (-3,), (4,), (-5,)], num_workers)
+
+    assert res == [1, 2, 3, 4, 5]
+    assert used_max_workers == ([] if expected_max_workers is None else [expected_max_workers])
@@ -0,0 +1,120 @@
+import itertools
+import random
+import types
+import pytest
+
+
+@pytest.fixture(scope='module')
+def html_table(rule_based_pipeline) -> types.ModuleType:
+    """Fixture for the module HTMLTable of the rule-based pipeline
+
+    :return: Module HTMLTable
+    :rtype: types.ModuleType
+    """
+    return rule_based_pipeline('HTMLTable')
+
+
+def generate_table(html_table: types.ModuleType, seed: int) -> object:
+    """Generates a small random table, whose columns often overlap
+
+    :param html_table: Module HTMLTable
+    :type html_table: types.ModuleType
+    :param seed: Seed for the random generator
+    :type seed: int
+    :return: HTMLTable
+    :rtype: object
+    """
+    rnd = random.Random(seed)
+    table = html_table.HTMLTable()
+    table.num_rows = rnd.randint(1, 4)
+    table.num_cols = rnd.randint(1, 4)
+    for i in range(table.num_rows):
+        for j in range(table.num_cols):
+            if rnd.random() < 0.25:
+                table.idx.append(-1)
+                continue
+            item = html_table.HTMLItem()
+            item.this_id = len(table.items)
+            item.pos_x = rnd.choice([rnd.randint(0, 100), j * 20 + rnd.randint(-5, 5)])
+            item.pos_y = i * 20
+            item.width = rnd.choice([rnd.randint(1, 60), rnd.randint(5, 15)])
+            item.height = 10
+            item.txt = rnd.choice(['abc', '123', 'x', 'word'])
+            table.idx.append(item.this_id)
+            table.items.append(item)
+    table.marks = [0] * len(table.idx)
+    return table
+
+
+def has_overlapping_cols(html_table: types.ModuleType, table: object, removed_ix: set) -> bool:
+    """Checks if any non-empty column overlaps with the next non-empty one, after the given cells have been removed
+
+    :param html_table: Module HTMLTable
+    :type html_table: types.ModuleType
+    :param table: HTMLTable
+    :type table: object
+    :param removed_ix: Indices of removed cells
+    :type removed_ix: set
+    :return: True, if columns are overlapping
+    :rtype: bool
+    """
+    boundaries = []
+    for j in range(table.num_cols):
+        items = [table.items[table.idx[table.get_ix(i, j)]] for i in range(table.num_rows)
+                 if table.idx[table.get_ix(i, j)] != -1 and table.get_ix(i, j) not in removed_ix]
+        if len(items) > 0:
+            boundaries.append((min(it.pos_x for it in items), max(it.pos_x + it.width for it in items)))
+    return any(b0[0] + (b0[1] - b0[0]) * 0.99 > b1[0] for b0, b1 in zip(boundaries, boundaries[1:]))
+
+
+def calc_min_num_special_items(html_table: types.ModuleType, table: object) -> int:
+    """Calculates the minimal number of non-numeric items, that must be removed from the table, so that no columns
+    are overlapping, by trying all subsets of such items
+
+    :param html_table: Module HTMLTable
+    :type html_table: types.ModuleType
+    :param table: HTMLTable
+    :type table: object
+    :return: Minimal number of items, or None, if the columns are overlapping even after removing all such items
+    :rtype: int
+    """
+    candidates = [ix for ix in range(len(table.idx)) if table.idx[ix] != -1 and
+                  not html_table.Format_Analyzer.looks_numeric(table.items[table.idx[ix]].txt)]
+    for num in range(len(candidates) + 1):
+        for removed_ix in itertools.combinations(candidates, num):
+            if not has_overlapping_cols(html_table, table, set(removed_ix)):
+                return num
+    return None
+
+
+@pytest.mark.parametrize('budget', [1, 1000000000])
+def test_identify_overlapping_special_items(html_table: types.ModuleType, monkeypatch: pytest.MonkeyPatch,
+                                            budget: int):
+    """Tests if identify_overlapping_special_items turns a minimal number of items into special items, so that no
+    columns are overlapping, both if the Backtracking finds a minimal solution itself and if it is stopped early
+
+    :param html_table: Module HTMLTable
+    :type html_table: types.ModuleType
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: pytest.MonkeyPatch
+    :param budget: Maximal number of Backtracking steps (see config.global_max_identify_complex_items_recursions)
+    :type budget: int
+    """
+    monkeypatch.setattr(html_table.config, 'global_max_identify_complex_items_recursions', budget)
+    html_table.reset_metrics()
+    num_overlapping = 0
+    for seed in range(500):
+        table = generate_table(html_table, seed)
+        if len(table.items) == 0:
+            continue
+        min_num = calc_min_num_special_items(html_table, table)
+        num_overlapping += min_num != 0
+
+        table.identify_overlapping_special_items()
+
+        assert len(table.special_idx) == (min_num or 0), seed
+        if min_num is not None:
+            assert not has_overlapping_cols(html_table, table, set()), seed
+
+    assert num_overlapping > 0
+    assert (html_table.get_metrics().get('identify_overlapping_special_items.budget_exhausted', 0) > 0) == (budget == 1)
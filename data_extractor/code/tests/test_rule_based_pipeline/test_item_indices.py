@@ -0,0 +1,168 @@
+import types
+import pytest
+
+
+@pytest.fixture(scope='module')
+def html_page(rule_based_pipeline) -> types.ModuleType:
+    """Fixture for the module HTMLPage of the rule-based pipeline
+
+    :return: Module HTMLPage
+    :rtype: types.ModuleType
+    """
+    return rule_based_pipeline('HTMLPage')
+
+
+@pytest.fixture
+def page(html_page: types.ModuleType) -> object:
+    """Fixture for a page with a grid of 10 x 10 items, each line consisting of two items connected via left/right_id
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :return: HTMLPage
+    :rtype: object
+    """
+    page = html_page.HTMLPage()
+    page.page_width = 1000
+    page.page_height = 1000
+    for i in range(100):
+        item = html_page.HTMLItem()
+        item.this_id = i
+        item.pos_x = (i % 10) * 100
+        item.pos_y = (i // 10) * 100
+        item.width = 50
+        item.height = 20
+        item.txt = 'item ' + str(i)
+        if i % 2 == 0:
+            item.right_id = i + 1
+        else:
+            item.left_id = i - 1
+        page.items.append(item)
+    return page
+
+
+def test_item_grid_follows_items_changed(html_page: types.ModuleType, page: object):
+    """Tests if the item grid is rebuilt after an item has been moved and items_changed has been called
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :param page: HTMLPage
+    :type page: object
+    """
+    rect = html_page.Rect(900, 900, 960, 930)
+    assert page.find_items_within_rect_all_categories(rect) == [99]
+
+    page.items[0].pos_x = 905
+    page.items[0].pos_y = 905
+    page.items_changed()
+
+    assert page.find_items_within_rect_all_categories(rect) == [0, 99]
+    assert page.get_item_grid().is_equal_to(html_page.ItemGrid(page.items))
+
+
+def test_item_grid_follows_replaced_items(html_page: types.ModuleType, page: object):
+    """Tests if the item grid is rebuilt after an item has been replaced and items_changed has been called
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :param page: HTMLPage
+    :type page: object
+    """
+    rect = html_page.Rect(900, 900, 960, 930)
+    page.get_item_grid()
+    moved_item = page.items[0].__deepcopy__({})
+    moved_item.pos_x = 905
+    moved_item.pos_y = 905
+
+    page.items[0] = moved_item
+    page.items_changed()
+
+    assert page.find_items_within_rect_all_categories(rect) == [0, 99]
+
+
+def test_item_grid_follows_appended_items(html_page: types.ModuleType, page: object):
+    """Tests if the item grid is rebuilt after an item has been appended, without calling items_changed
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :param page: HTMLPage
+    :type page: object
+    """
+    rect = html_page.Rect(900, 900, 960, 930)
+    page.get_item_grid()
+    new_item = page.items[99].__deepcopy__({})
+    new_item.this_id = 100
+    page.items.append(new_item)
+
+    assert page.find_items_within_rect_all_categories(rect) == [99, 100]
+
+
+@pytest.mark.parametrize('attribute, value', [('txt', 'changed'), ('left_id', -1), ('right_id', -1)])
+def test_line_index_follows_items_changed(html_page: types.ModuleType, page: object, attribute: str, value: object):
+    """Tests if the line index is rebuilt after the text or the neighbours of an item have been changed and
+    items_changed has been called
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :param page: HTMLPage
+    :type page: object
+    :param attribute: Attribute of the item to change
+    :type attribute: str
+    :param value: New value of the attribute
+    :type value: object
+    """
+    item = page.items[42] if attribute != 'left_id' else page.items[43]
+    page.get_line_index()
+
+    setattr(item, attribute, value)
+    page.items_changed()
+
+    assert page.get_line_index().is_equal_to(html_page.LineIndex(page))
+
+
+def test_items_changed_only_affects_its_page(html_page: types.ModuleType, page: object):
+    """Tests if items_changed and writes to items keep the indices of other pages
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :param page: HTMLPage
+    :type page: object
+    """
+    other_page = html_page.HTMLPage()
+    other_page.items = [it.__deepcopy__({}) for it in page.items]
+    item_grid = other_page.get_item_grid()
+    line_index = other_page.get_line_index()
+
+    page.items[0].pos_x = 905
+    page.items[0].txt = 'changed'
+    page.items_changed()
+
+    assert other_page.get_item_grid() is item_grid
+    assert other_page.get_line_index() is line_index
+
+
+def test_verify_indices(html_page: types.ModuleType, page: object, monkeypatch: pytest.MonkeyPatch):
+    """Tests if config.global_verify_indices detects an index that is stale, because items_changed has not been called
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :param page: HTMLPage
+    :type page: object
+    :param monkeypatch: Pytest monkeypatch fixture
+    :type monkeypatch: pytest.MonkeyPatch
+    """
+    monkeypatch.setattr(html_page.config, 'global_verify_indices', True)
+    page.get_item_grid()
+    page.get_line_index()
+
+    page.items[0].pos_x = 905
+    page.items[0].txt = 'changed'
+
+    with pytest.raises(AssertionError, match='Stale ItemGrid'):
+        page.get_item_grid()
+    with pytest.raises(AssertionError, match='Stale LineIndex'):
+        page.get_line_index()
+
+    page.items_changed()
+
+    page.get_item_grid()
+    page.get_line_index()
@@ -0,0 +1,153 @@
+import copy
+import random
+import pytest
+
+
+@pytest.fixture(scope='module')
+def kpi_measure(rule_based_pipeline) -> type:
+    """Fixture for the class KPIMeasure of the rule-based pipeline
+
+    :return: Class KPIMeasure
+    :rtype: type
+    """
+    return rule_based_pipeline('KPIMeasure').KPIMeasure
+
+
+def remove_duplicates_reference(lst: list) -> list:
+    """Former O(n^2) implementation of kpi_measure.remove_duplicates
+
+    :param lst: List of KPIMeasure
+    :type lst: list
+    :return: List of KPIMeasure without duplicates
+    :rtype: list
+    """
+    keep = [False] * len(lst)
+    for i in range(len(lst)):
+        better_kpi_exists = False
+        for j in range(len(lst)):
+            if i == j:
+                continue
+            if lst[j].kpi_name == lst[i].kpi_name and lst[j].year == lst[i].year and \
+                    (lst[j].score > lst[i].score or (lst[j].score == lst[i].score and j > i)):
+                better_kpi_exists = True
+                break
+        keep[i] = not better_kpi_exists
+    return [lst[i] for i in range(len(lst)) if keep[i]]
+
+
+def remove_bad_scores_reference(lst: list, minimum_score: float) -> list:
+    """Former implementation of kpi_measure.remove_bad_scores
+
+    :param lst: List of KPIMeasure
+    :type lst: list
+    :param minimum_score: Minimum score of a KPIMeasure
+    :type minimum_score: float
+    :return: List of KPIMeasure with good scores
+    :rtype: list
+    """
+    max_score = {}
+    for k in lst:
+        max_score[k.kpi_name] = k.score if k.kpi_name not in max_score else max(k.score, max_score[k.kpi_name])
+    return [k for k in lst if k.score >= minimum_score and k.score >= max_score[k.kpi_name] * 0.75]
+
+
+def remove_bad_years_reference(lst: list, default_year: int) -> list:
+    """Former implementation of kpi_measure.remove_bad_years
+
+    :param lst: List of KPIMeasure
+    :type lst: list
+    :param default_year: Year for KPIMeasure without year
+    :type default_year: int
+    :return: List of KPIMeasure with good years
+    :rtype: list
+    """
+    year_exist = []
+    for k in lst:
+        if k.year != -1:
+            year_exist.append(k.kpi_name)
+            break
+    res = []
+    for k in lst:
+        if k.year == -1:
+            if k.kpi_name not in year_exist:
+                k.year = default_year
+                res.append(k)
+        else:
+            res.append(k)
+    return res
+
+
+def generate_kpi_measures(kpi_measure: type, seed: int) -> list:
+    """Generates a random list of KPIMeasure with many duplicates and equal scores
+
+    :param kpi_measure: Class KPIMeasure
+    :type kpi_measure: type
+    :param seed: Seed for the random generator
+    :type seed: int
+    :return: List of KPIMeasure
+    :rtype: list
+    """
+    rnd = random.Random(seed)
+    num_names = rnd.randint(1, 4)
+    res = []
+    for i in range(rnd.randint(0, 60)):
+        measure = kpi_measure()
+        measure.kpi_id = i
+        measure.kpi_name = f'kpi_{rnd.randrange(num_names)}'
+        measure.year = rnd.choice([-1, 2018, 2019, 2020])
+        measure.score = rnd.choice([0, 100, 100.0, 150.5, 200, 1000.25, rnd.uniform(0, 1000)])
+        if rnd.random() < 0.05:
+            measure.score = float('nan')
+        res.append(measure)
+    return res
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_remove_duplicates(kpi_measure: type, seed: int):
+    """Tests if remove_duplicates keeps the same KPIMeasures in the same order as the former implementation
+
+    :param kpi_measure: Class KPIMeasure
+    :type kpi_measure: type
+    :param seed: Seed for the random generator
+    :type seed: int
+    """
+    lst = generate_kpi_measures(kpi_measure, seed)
+
+    res = kpi_measure.remove_duplicates(lst)
+
+    assert [id(k) for k in res] == [id(k) for k in remove_duplicates_reference(lst)]
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_remove_bad_scores(kpi_measure: type, seed: int):
+    """Tests if remove_bad_scores keeps the same KPIMeasures in the same order as the former implementation
+
+    :param kpi_measure: Class KPIMeasure
+    :type kpi_measure: type
+    :param seed: Seed for the random generator
+    :type seed: int
+    """
+    lst = generate_kpi_measures(kpi_measure, seed)
+    minimum_score = random.Random(seed).choice([0, 100, 500])
+
+    res = kpi_measure.remove_bad_scores(lst, minimum_score)
+
+    assert [id(k) for k in res] == [id(k) for k in remove_bad_scores_reference(lst, minimum_score)]
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_remove_bad_years(kpi_measure: type, seed: int):
+    """Tests if remove_bad_years returns the same KPIMeasures with the same years as the former implementation
+
+    :param kpi_measure: Class KPIMeasure
+    :type kpi_measure: type
+    :param seed: Seed for the random generator
+    :type seed: int
+    """
+    lst = generate_kpi_measures(kpi_measure, seed)
+    lst_reference = copy.deepcopy(lst)
+
+    res = kpi_measure.remove_bad_years(lst, 2021)
+    res_reference = remove_bad_years_reference(lst_reference, 2021)
+
+    assert [(k.kpi_id, k.year) for k in res] == [(k.kpi_id, k.year) for k in res_reference]
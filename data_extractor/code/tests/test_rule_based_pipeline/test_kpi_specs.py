@@ -0,0 +1,253 @@
+import random
+import re
+import types
+import pytest
+
+
+@pytest.fixture(scope='module')
+def kpi_specs(rule_based_pipeline) -> types.ModuleType:
+    """Fixture for the module KPISpecs of the rule-based pipeline
+
+    :return: Module KPISpecs
+    :rtype: types.ModuleType
+    """
+    return rule_based_pipeline('KPISpecs')
+
+
+@pytest.fixture(scope='module')
+def shipped_kpispecs(rule_based_pipeline) -> list:
+    """Fixture for the KPI specifications shipped with the rule-based pipeline (see test.test_prepare_kpispecs)
+
+    :return: List of KPISpecs
+    :rtype: list
+    """
+    return rule_based_pipeline('test').test_prepare_kpispecs()
+
+
+@pytest.mark.parametrize('pattern, expected', [
+    ('abc', ['abc']),
+    ('.*prov.*reserv.*', ['prov', 'reserv']),
+    ('.*scope 1.*', ['scope 1']),
+    ('ab(cd)ef', ['ab', 'cd', 'ef']),
+    ('ab(cd)?ef', ['ab', 'ef']),
+    ('ab(?:cd)?ef', ['ab', 'ef']),
+    ('ab(cd|ef)gh', ['ab', 'gh']),
+    ('ab(cd|ce)ef', ['ab', 'c', 'ef']),  # common prefix of the alternatives is factored out by the regex parser
+    ('abc|def', []),
+    ('abc|abd', ['ab']),
+    ('ab(c(d|e)f)g', ['ab', 'c', 'f', 'g']),
+    ('abc+d', ['ab', 'c', 'd']),
+    ('ab(cd)+ef', ['ab', 'cd', 'ef']),
+    ('ab(cd)+?ef', ['ab', 'cd', 'ef']),
+    ('ab(cd)*ef', ['ab', 'ef']),
+    ('ab(cd)*?ef', ['ab', 'ef']),
+    ('ab(cd){0,3}ef', ['ab', 'ef']),
+    ('ab(cd){2,3}ef', ['ab', 'cd', 'ef']),
+    ('emissions?', ['emission']),
+    (r'\(c0\.4\) select', ['(c0.4) select']),
+    (r'scope\s1', ['scope', '1']),
+    (r'scope\d', ['scope']),
+    ('scope[^a-z]?1', ['scope', '1']),
+    ('scope[12]', ['scope']),
+    ('scope[1]', ['scope1']),
+    ('(?=.*direct)scope', ['scope']),
+    ('(?!direct)scope', ['scope']),
+    ('(?i)scope 1', []),
+    ('(?i:scope) 1', [' 1']),
+    ('^scope$', ['scope']),
+])
+def test_find_required_literals(kpi_specs: types.ModuleType, pattern: str, expected: list):
+    """Tests if the literals, that must be contained in any text matched by a pattern, are found
+
+    :param kpi_specs: Module KPISpecs
+    :type kpi_specs: types.ModuleType
+    :param pattern: Regular expression
+    :type pattern: str
+    :param expected: Expected literals
+    :type expected: list
+    """
+    assert kpi_specs.KPISpecs.DescRegExMatcher.find_required_literals(re.compile(pattern)) == expected
+
+
+def test_find_required_literals_ignorecase(kpi_specs: types.ModuleType):
+    """Tests if no literals are required for patterns compiled with re.IGNORECASE, since they match any case
+
+    :param kpi_specs: Module KPISpecs
+    :type kpi_specs: types.ModuleType
+    """
+    pattern_regex = re.compile('.*scope 1.*', re.IGNORECASE)
+
+    assert kpi_specs.KPISpecs.DescRegExMatcher.find_required_literals(pattern_regex) == []
+
+
+def make_texts(vocabulary: list, num_texts: int, seed: int) -> list:
+    """Generates random texts from the given words in random cases
+
+    :param vocabulary: Words
+    :type vocabulary: list
+    :param num_texts: Number of texts
+    :type num_texts: int
+    :param seed: Seed for the random generator
+    :type seed: int
+    :return: Texts
+    :rtype: list
+    """
+    rnd = random.Random(seed)
+    texts = []
+    for i in range(num_texts):
+        words = [rnd.choice(vocabulary) for j in range(rnd.randint(1, 6))]
+        words = [rnd.choice([w, w.lower(), w.upper(), w.capitalize()]) for w in words]
+        texts.append(rnd.choice([' ', '', '-']).join(words))
+    return texts
+
+
+vocabulary = ['greenhouse', 'gas', 'GHG', '(GHG)', 'atmospheric', 'CO2', 'tCO2e', 'co2-eq', 'equivalent', 'scope',
+              'Scope 1', 'scope1', 'scope-2', 'scope 3', '1', '2', '3', '1,2', 'direct', 'indirect', 'emission',
+              'emissions', 'total', 'combined', 'million tonnes', 'metric', 'tons', 'relative', 'combustion', 'fuels',
+              'operated', 'gross global scope 1 emissions', '(c0.4)', 'select the currency used', '(c4.1)',
+              'did you have an emissions target', 'year target was set', 'base year', 'proved', 'reserves', '2019',
+              '12.3', 'in', 'of', 'and']
+
+
+def test_find_required_literals_shipped_kpispecs(kpi_specs: types.ModuleType, shipped_kpispecs: list):
+    """Tests if any text matched by a description pattern of the shipped KPI specifications contains the required
+    literals of the pattern
+
+    :param kpi_specs: Module KPISpecs
+    :type kpi_specs: types.ModuleType
+    :param shipped_kpispecs: List of KPISpecs
+    :type shipped_kpispecs: list
+    """
+    texts = make_texts(vocabulary, 2000, 0)
+    num_matched = 0
+    for kpi in shipped_kpispecs:
+        for d in kpi.desc_regex_match_list:
+            literals = kpi_specs.KPISpecs.DescRegExMatcher.find_required_literals(d.pattern_regex)
+            for txt in texts:
+                if d.match_single_node(txt):
+                    num_matched += 1
+                    txt = txt if d.case_sensitive else txt.lower()
+                    assert all(lit in txt for lit in literals), (d.pattern_raw, txt)
+
+    assert num_matched > 0
+
+
+def match_nodes_per_pattern(kpi_specs: types.ModuleType, kpi: object, desc_nodes: list) -> tuple:
+    """Matches the nodes against each description pattern separately, like KPISpecs.match_nodes did before the
+    patterns were matched at once by a DescRegExMatcher
+
+    :param kpi_specs: Module KPISpecs
+    :type kpi_specs: types.ModuleType
+    :param kpi: KPISpecs
+    :type kpi: object
+    :param desc_nodes: Texts of the nodes
+    :type desc_nodes: list
+    :return: Tuple of match and score
+    :rtype: tuple
+    """
+    final_score = 0
+    at_least_one_match = False
+    bad_match = False
+    min_score = 0
+    for d in kpi.desc_regex_match_list:
+        match, score = d.match_nodes(desc_nodes)
+        if not match:
+            bad_match = True
+            min_score = min(min_score, score)
+        if d.matching_mode in (kpi_specs.MATCHING_MAY_INCLUDE, kpi_specs.MATCHING_MUST_INCLUDE,
+                               kpi_specs.MATCHING_MUST_INCLUDE_EACH_NODE) and d.count_if_matched and match and score > 0:
+            at_least_one_match = True
+        final_score += score
+    if bad_match:
+        return False, min_score
+    if not at_least_one_match:
+        return False, 0
+    return final_score >= kpi.minimum_score_desc_regex and final_score > 0, final_score
+
+
+@pytest.mark.parametrize('shared_matcher', [False, True])
+def test_match_nodes_shipped_kpispecs(kpi_specs: types.ModuleType, shipped_kpispecs: list, shared_matcher: bool):
+    """Tests if KPISpecs.match_nodes returns the same results as matching each description pattern separately
+
+    :param kpi_specs: Module KPISpecs
+    :type kpi_specs: types.ModuleType
+    :param shipped_kpispecs: List of KPISpecs
+    :type shipped_kpispecs: list
+    :param shared_matcher: Whether all KPISpecs share one DescRegExMatcher (like in AnalyzerDirectory.find_multiple_kpis)
+    :type shared_matcher: bool
+    """
+    matcher = kpi_specs.KPISpecs.DescRegExMatcher(shipped_kpispecs) if shared_matcher else None
+    for kpi in shipped_kpispecs:
+        kpi.desc_matcher = matcher
+
+    texts = make_texts(vocabulary, 300, 1)
+    rnd = random.Random(2)
+    num_matched = 0
+    for i in range(1000):
+        desc_nodes = [rnd.choice(texts) for j in range(rnd.randint(1, 5))]
+        for kpi in shipped_kpispecs:
+            expected = match_nodes_per_pattern(kpi_specs, kpi, desc_nodes)
+            assert kpi.match_nodes(desc_nodes) == expected, (kpi.kpi_id, desc_nodes)
+            num_matched += expected[0]
+
+    assert num_matched > 0
+
+
+@pytest.mark.parametrize('pattern', ['.*scope 1.*', '.*Scope 1.*', '.*(?i:scope) 1.*'])
+def test_match_nodes_case_sensitivity(kpi_specs: types.ModuleType, pattern: str):
+    """Tests if KPISpecs.match_nodes returns the same results as matching each description pattern separately, if the
+    same pattern is used case-sensitively by one KPI and case-insensitively by another one sharing the same matcher
+
+    :param kpi_specs: Module KPISpecs
+    :type kpi_specs: types.ModuleType
+    :param pattern: Regular expression
+    :type pattern: str
+    """
+    kpis = []
+    for case_sensitive in (True, False):
+        kpi = kpi_specs.KPISpecs()
+        kpi.desc_regex_match_list.append(kpi_specs.KPISpecs.DescRegExMatch(pattern, 100, kpi_specs.MATCHING_MUST_INCLUDE,
+                                                                           0.1, case_sensitive, 0.1, 50))
+        kpis.append(kpi)
+    matcher = kpi_specs.KPISpecs.DescRegExMatcher(kpis)
+
+    for txt in ['scope 1', 'Scope 1', 'SCOPE 1', 'sCoPe 1 emissions', 'scope 2']:
+        for kpi in kpis:
+            kpi.desc_matcher = matcher
+            assert kpi.match_nodes([txt]) == match_nodes_per_pattern(kpi_specs, kpi, [txt]), txt
+
+
+def test_find_multiple_kpis_restores_desc_matcher(rule_based_pipeline, shipped_kpispecs: list):
+    """Tests if AnalyzerDirectory.find_multiple_kpis lets all KPIs share one DescRegExMatcher only while it is running,
+    so that the matcher does not persist in the KPIs, that are used again for the next PDF or with other KPIs
+
+    :param rule_based_pipeline: Requesting the rule_based_pipeline fixture
+    :type rule_based_pipeline: Callable
+    :param shipped_kpispecs: List of KPISpecs
+    :type shipped_kpispecs: list
+    """
+    analyzer_directory = rule_based_pipeline('AnalyzerDirectory')
+    kpis = shipped_kpispecs[:3]
+    own_matcher = kpis[0].get_desc_matcher()
+    for kpi in kpis[1:]:
+        kpi.desc_matcher = None
+
+    used_matchers = []
+
+    class MockedAnalyzerPage:
+        def find_multiple_kpis(self, kpispecs_lst):
+            used_matchers.append([kpi.desc_matcher for kpi in kpispecs_lst])
+            return [[] for kpi in kpispecs_lst]
+
+    htmldirectory = analyzer_directory.HTMLDirectory()
+    htmldirectory.src_pdf_filename = 'test.pdf'
+    ana = analyzer_directory.AnalyzerDirectory(htmldirectory, 2019)
+    ana.analyzer_page = [MockedAnalyzerPage()]
+
+    assert ana.find_multiple_kpis(kpis) == []
+
+    assert len(used_matchers) == 1
+    assert len(set(map(id, used_matchers[0]))) == 1 and used_matchers[0][0] is not None
+    assert used_matchers[0][0] is not own_matcher
+    assert kpis[0].desc_matcher is own_matcher
+    assert all(kpi.desc_matcher is None for kpi in kpis[1:])
@@ -0,0 +1,66 @@
+import types
+from pathlib import Path
+import pytest
+
+
+@pytest.fixture(scope='module')
+def html_page(rule_based_pipeline) -> types.ModuleType:
+    """Fixture for the module HTMLPage of the rule-based pipeline
+
+    :return: Module HTMLPage
+    :rtype: types.ModuleType
+    """
+    return rule_based_pipeline('HTMLPage')
+
+
+@pytest.fixture
+def page(html_page: types.ModuleType) -> object:
+    """Fixture for a page with a few items at integer and non-integer positions
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :return: HTMLPage
+    :rtype: object
+    """
+    page = html_page.HTMLPage()
+    page.page_num = 7
+    page.page_width = 1000
+    page.page_height = 1000
+    for i, pos_x in enumerate([60, 60, 120.5, -3, 60]):
+        item = html_page.HTMLItem()
+        item.this_id = i
+        item.pos_x = pos_x
+        item.pos_y = i * 20
+        item.width = 50
+        item.height = 10
+        item.txt = 'item ' + str(i)
+        page.items.append(item)
+    page.find_left_distributions()
+    page.clusters = None
+    page.clusters_text = None
+    return page
+
+
+@pytest.mark.parametrize('legacy', [False, True])
+def test_load_from_file(html_page: types.ModuleType, page: object, tmp_path: Path, legacy: bool):
+    """Tests if a page is restored with the same (numeric) left_distrib keys from both file formats
+
+    :param html_page: Module HTMLPage
+    :type html_page: types.ModuleType
+    :param page: HTMLPage
+    :type page: object
+    :param tmp_path: Path to a temporary folder of this test
+    :type tmp_path: Path
+    :param legacy: Whether to store the page in the legacy jsonpickle format
+    :type legacy: bool
+    """
+    json_file = tmp_path / ('jpage_legacy.json' if legacy else 'jpage.json')
+    json_file.write_text(page.to_json() if legacy else html_page.PageSerializer.dumps(page))
+
+    assert html_page.PageSerializer.is_page_data(json_file.read_text()) != legacy
+
+    loaded_page = html_page.HTMLPage.load_from_file(str(json_file))
+
+    assert loaded_page.left_distrib == {60: 3, 120.5: 1, -3: 1}
+    assert {k: type(k) for k in loaded_page.left_distrib} == {k: type(k) for k in page.left_distrib}
+    assert [it.txt for it in loaded_page.items] == [it.txt for it in page.items]
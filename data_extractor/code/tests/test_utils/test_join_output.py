@@ -0,0 +1,113 @@
+from pathlib import Path
+import threading
+import time
+import shutil
+import pytest
+from unittest.mock import patch
+import pandas as pd
+from infer_on_pdf import join_output
+
+
+@pytest.fixture
+def prerequisites_join_output(path_folder_temporary: Path) -> dict:
+    """Defines a fixture creating the pdf, RB output and ML output folders for three pdfs
+
+    :param path_folder_temporary: Requesting the path_folder_temporary fixture
+    :type path_folder_temporary: Path
+    :return: Dictionary with the keyword arguments for join_output
+    :rtype: dict
+    """
+    path_pdfs = path_folder_temporary / 'pdfs'
+    path_rb = path_folder_temporary / 'rb'
+    path_ml = path_folder_temporary / 'ml'
+    path_output = path_folder_temporary / 'joined_ml_rb'
+    for path in (path_pdfs, path_rb, path_ml, path_output):
+        path.mkdir(parents = True, exist_ok = True)
+    
+    for i in range(3):
+        pdf_name = f'test_{i}'
+        (path_pdfs / f'{pdf_name}.pdf').touch()
+        pd.DataFrame({'KPI_ID': [i], 'KPI_NAME': ['kpi'], 'SRC_FILE': [f'{pdf_name}.pdf'], 'PAGE_NUM': [1],
+                      'ITEM_IDS': [''], 'POS_X': [0.5], 'POS_Y': [0.5], 'RAW_TXT': ['1,000'], 'YEAR': [2020],
+                      'VALUE': [1000], 'SCORE': [1.0], 'UNIT': ['t'], 'MATCH_TYPE': ['TABLE']
+                      }).to_csv(path_rb / f'{pdf_name}.pdf.csv', index=False)
+        pd.DataFrame({'pdf_name': [pdf_name], 'kpi': ['kpi'], 'kpi_id': [i], 'answer': ['2,000'], 'page': [0],
+                      'paragraph': ['paragraph'], 'paragraph_relevance_score': [0.9], 'source': ['Text'],
+                      'score': [0.8], 'no_ans_score': [0.1], 'no_answer_score_plus_boost': [0.2]
+                      }).to_csv(path_ml / f'{pdf_name}_predictions_kpi.csv')
+    
+    yield {'project_name': 'TEST', 'pdf_folder': str(path_pdfs), 'rb_output_folder': str(path_rb),
+           'ml_output_folder': str(path_ml), 'output_folder': str(path_output), 'use_docker': True,
+           'work_dir_rb': str(path_folder_temporary / 'work'), 'verbosity': 0, 'port': 8000, 'ip': '0.0.0.0',
+           'run_id': 1234, 's3_usage': False, 's3_settings': None}
+    
+    # cleanup
+    for path in path_folder_temporary.glob("*"):
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+
+
+def test_join_output_writes_joined_csv(prerequisites_join_output: dict):
+    """Tests that a joined csv containing the RB and the ML answers is written for every pdf
+
+    :param prerequisites_join_output: Requesting the prerequisites_join_output fixture
+    :type prerequisites_join_output: dict
+    """
+    with patch('infer_on_pdf.set_xy_ml', return_value=True) as mocked_set_xy_ml:
+        assert join_output(**prerequisites_join_output)
+    
+    assert mocked_set_xy_ml.call_count == 3
+    path_output = Path(prerequisites_join_output['output_folder'])
+    for i in range(3):
+        df_joined = pd.read_csv(path_output / f'1234_test_{i}.pdf.csv')
+        assert list(df_joined['METHOD']) == ['RB', 'ML']
+        assert list(df_joined['PDF_NAME']) == [f'test_{i}.pdf'] * 2
+        assert list(df_joined['PAGE']) == [1, 1]
+
+
+def test_join_output_bounded_xy_requests(prerequisites_join_output: dict):
+    """Tests that the number of in-flight set_xy_ml requests never exceeds max_xy_requests
+
+    :param prerequisites_join_output: Requesting the prerequisites_join_output fixture
+    :type prerequisites_join_output: dict
+    """
+    lock = threading.Lock()
+    in_flight = [0]
+    max_in_flight = [0]
+    
+    def mocked_set_xy_ml(**kwargs):
+        with lock:
+            in_flight[0] += 1
+            max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return True
+    
+    with patch('infer_on_pdf.set_xy_ml', side_effect=mocked_set_xy_ml):
+        assert join_output(**prerequisites_join_output, max_workers=3, max_xy_requests=1)
+    
+    assert max_in_flight[0] == 1
+
+
+def test_join_output_failure_of_single_pdf(prerequisites_join_output: dict, capsys: pytest.CaptureFixture):
+    """Tests that a failing pdf does not prevent the other pdfs from being joined and that the failed pdf is reported
+
+    :param prerequisites_join_output: Requesting the prerequisites_join_output fixture
+    :type prerequisites_join_output: dict
+    :param capsys: Pytest capsys fixture
+    :type capsys: pytest.CaptureFixture
+    """
+    def mocked_set_xy_ml(**kwargs):
+        if kwargs['pdf_name'] == 'test_0.pdf':
+            raise ConnectionError('RB server not reachable')
+        return True
+    
+    with patch('infer_on_pdf.set_xy_ml', side_effect=mocked_set_xy_ml):
+        assert not join_output(**prerequisites_join_output)
+    
+    path_output = Path(prerequisites_join_output['output_folder'])
+    assert len(list(path_output.glob('1234_*.csv'))) == 3
+    assert 'Joining output failed for 1 pdf(s): test_0.pdf' in capsys.readouterr().out
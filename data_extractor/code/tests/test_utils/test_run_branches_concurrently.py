@@ -0,0 +1,70 @@
+import threading
+import pytest
+from infer_on_pdf import run_branches_concurrently
+
+# types
+import typing
+from _pytest.capture import CaptureFixture
+
+
+def test_run_branches_concurrently_overlap():
+    """Tests that the branches are running at the same time. Each branch waits
+    on a barrier which can only be passed if the other branch is running as well
+    """
+    barrier = threading.Barrier(2, timeout=5)
+
+    def branch():
+        barrier.wait()
+        return True
+
+    assert run_branches_concurrently({'RB': branch, 'ML': branch})
+
+
+@pytest.mark.parametrize('rb_response, ml_response, return_value_expected',
+                         [
+                             (True, True, True),
+                             (True, False, False),
+                             (False, True, False),
+                             (False, False, False)
+                         ])
+def test_run_branches_concurrently_combined_status(rb_response: bool,
+                                                   ml_response: bool,
+                                                   return_value_expected: bool):
+    """Tests that the combined status is only True if all branches succeeded
+
+    :param rb_response: Return value of the RB branch
+    :type rb_response: bool
+    :param ml_response: Return value of the ML branch
+    :type ml_response: bool
+    :param return_value_expected: Expected return value
+    :type return_value_expected: bool
+    """
+    branches = {'RB': lambda: rb_response, 'ML': lambda: ml_response}
+    assert run_branches_concurrently(branches) == return_value_expected
+
+
+def test_run_branches_concurrently_exception(capsys: typing.Generator[CaptureFixture[str], None, None]):
+    """Tests that an exception of one branch is re-raised after the other branch finished
+
+    :param capsys: Requesting the default fixture capsys for capturing cmd outputs
+    :type capsys: typing.Generator[CaptureFixture[str], None, None]
+    """
+    ml_finished = threading.Event()
+
+    def rb_branch():
+        raise ValueError('RB failed')
+
+    def ml_branch():
+        ml_finished.set()
+        return True
+
+    with pytest.raises(ValueError, match='RB failed'):
+        run_branches_concurrently({'RB': rb_branch, 'ML': ml_branch})
+    assert ml_finished.is_set()
+    cmd_output = capsys.readouterr()
+    assert 'RB solution failed' in cmd_output.out
+
+
+def test_run_branches_concurrently_no_branches():
+    """Tests that mode none (no branches at all) is treated as success"""
+    assert run_branches_concurrently({})